@@ -0,0 +1,224 @@
+"""
+Admission control for DB-bound routes.
+
+Each worker admits at most as many requests as its DB pool can serve
+(pool_size + max_overflow). Beyond that, requests wait in a short bounded
+queue and are otherwise shed at once with 503 + Retry-After, instead of piling
+up inside the pool until its 30s timeout and failing as opaque 500s.
+
+Requests are sorted into lanes:
+  - write: non-GET routes (CORS preflights excluded); may use every slot and are dequeued first
+  - read:  point reads; keep ADMISSION_WRITE_RESERVE slots free for writes
+  - bulk:  large list reads (BULK_ROUTES); capped at ADMISSION_BULK_LIMIT
+Reads and bulk reads are dequeued in arrival order, so neither starves the other.
+Per-lane in-flight / queue depth / shed counters are served at /metrics/admission.
+"""
+
+from collections import deque
+from typing import Dict, Optional
+import asyncio
+import math
+import os
+
+from app.db_budget import pool_settings
+
+# Slots per worker; defaults to the DB pool capacity
+ADMISSION_CAPACITY = int(os.getenv("ADMISSION_CAPACITY", "0"))
+ADMISSION_WRITE_RESERVE = int(os.getenv("ADMISSION_WRITE_RESERVE", "0"))
+ADMISSION_BULK_LIMIT = int(os.getenv("ADMISSION_BULK_LIMIT", "0"))
+# Waiters allowed per lane, as a multiple of the lane limit
+ADMISSION_QUEUE_FACTOR = float(os.getenv("ADMISSION_QUEUE_FACTOR", "2"))
+# Longest a request waits for a slot before it is shed
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2"))
+
+# (method, path) pairs served by the bulk lane
+BULK_ROUTES = {
+    ("GET", "/api/bol/initial-data"),
+    ("GET", "/api/bol/orders"),
+    ("GET", "/api/invoices/aging"),
+    ("GET", "/api/analytics/shipments"),
+    ("GET", "/api/analytics/shipping-fees"),
+    ("POST", "/api/bol/existing"),
+}
+# Not DB-bound or long-lived (SSE); never limited
+EXEMPT_PATHS = {
+    "/health", "/metrics/admission", "/metrics/coalescing", "/metrics/cache",
+    "/api/bol/stream", "/docs", "/openapi.json",
+    # Streams the CSV to disk (minutes on a slow link) before one INSERT; JOB_MAX_PENDING caps it
+    "/api/jobs/import",
+}
+
+class Overloaded(Exception):
+    """Request shed; `retry_after` is the suggested wait in seconds."""
+
+    def __init__(self, lane: str, retry_after: int):
+        super().__init__(f"{lane} lane overloaded")
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+class Lane:
+
+    def __init__(self, name: str, limit: int, queue_size: int):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.in_flight = 0
+        self.waiters: deque = deque()
+        self.admitted = 0
+        self.queued = 0
+        self.shed = 0
+        self.timed_out = 0
+        self.max_queue_depth = 0
+        # EWMA of time a request holds its slot, for Retry-After
+        self.service_seconds = 0.05
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": self.limit,
+            "inFlight": self.in_flight,
+            "queueDepth": len(self.waiters),
+            "queueSize": self.queue_size,
+            "maxQueueDepth": self.max_queue_depth,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed": self.shed,
+            "timedOut": self.timed_out,
+            "avgServiceMs": round(self.service_seconds * 1000, 1)
+        }
+
+
+class AdmissionController:
+    """Priority lanes sharing one pool of `capacity` slots."""
+
+    def __init__(self, capacity: int, write_reserve: int, bulk_limit: int,
+                 queue_factor: float = ADMISSION_QUEUE_FACTOR, queue_timeout: float = ADMISSION_QUEUE_TIMEOUT):
+        self.capacity = capacity
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._seq = 0
+        read_limit = max(1, capacity - write_reserve)
+        # Shared by the read and bulk lanes, so bulk reads cannot eat into the write reserve either
+        self.read_limit = read_limit
+        self.lanes: Dict[str, Lane] = {
+            name: Lane(name, limit, max(1, math.ceil(limit * queue_factor)))
+            for name, limit in (
+                ("write", capacity),
+                ("read", read_limit),
+                ("bulk", max(1, min(bulk_limit, read_limit)))
+            )
+        }
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        pool = pool_settings()
+        capacity = ADMISSION_CAPACITY or pool["pool_size"] + pool["max_overflow"]
+        return cls(
+            capacity,
+            write_reserve=ADMISSION_WRITE_RESERVE or max(1, capacity // 5),
+            bulk_limit=ADMISSION_BULK_LIMIT or max(1, capacity // 4)
+        )
+
+    @staticmethod
+    def classify(method: str, path: str) -> Optional[str]:
+        """Lane for a request, or None when it is not limited (CORS preflights never reach the DB)."""
+        if method == "OPTIONS" or path in EXEMPT_PATHS:
+            return None
+        if (method, path) in BULK_ROUTES:
+            return "bulk"
+        return "read" if method in ("GET", "HEAD") else "write"
+
+    def _has_room(self, lane: Lane) -> bool:
+        if lane.name != "write" and self.in_flight - self.lanes["write"].in_flight >= self.read_limit:
+            return False
+        return self.in_flight < self.capacity and lane.in_flight < lane.limit
+
+    def _admit(self, lane: Lane):
+        self.in_flight += 1
+        lane.in_flight += 1
+        lane.admitted += 1
+
+    def _retry_after(self, lane: Lane) -> int:
+        backlog = len(lane.waiters) + lane.in_flight
+        return max(1, math.ceil(backlog * lane.service_seconds / lane.limit))
+
+    def _next_lane(self) -> Optional[Lane]:
+        """Lane whose head waiter goes next: writes first, then the oldest read/bulk waiter."""
+        best = None
+        for lane in self.lanes.values():
+            if lane.waiters and self._has_room(lane):
+                rank = (lane.name != "write", lane.waiters[0][0])
+                if best is None or rank < best[0]:
+                    best = (rank, lane)
+        return best[1] if best else None
+
+    def _dispatch(self):
+        """Hand free slots to waiters."""
+        while self.in_flight < self.capacity:
+            lane = self._next_lane()
+            if lane is None:
+                return
+            _, waiter = lane.waiters.popleft()
+            if waiter.done():
+                continue
+            self._admit(lane)
+            waiter.set_result(None)
+
+    def _queue_ahead(self, lane: Lane) -> bool:
+        """Whether writes, or earlier requests of this lane, are already waiting."""
+        return bool(self.lanes["write"].waiters or lane.waiters)
+
+    async def acquire(self, lane_name: str):
+        lane = self.lanes[lane_name]
+        if self._has_room(lane) and not self._queue_ahead(lane):
+            self._admit(lane)
+            return
+        if len(lane.waiters) >= lane.queue_size:
+            lane.shed += 1
+            raise Overloaded(lane.name, self._retry_after(lane))
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._seq += 1
+        entry = (self._seq, waiter)
+        lane.waiters.append(entry)
+        lane.queued += 1
+        lane.max_queue_depth = max(lane.max_queue_depth, len(lane.waiters))
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # Admitted at the deadline
+                return
+            waiter.cancel()
+            lane.waiters.remove(entry)
+            lane.timed_out += 1
+            lane.shed += 1
+            raise Overloaded(lane.name, self._retry_after(lane))
+        except asyncio.CancelledError:
+            # Client went away: give back a slot we were handed, or leave the queue
+            if waiter.done() and not waiter.cancelled():
+                self.release(lane_name)
+            else:
+                waiter.cancel()
+                if entry in lane.waiters:
+                    lane.waiters.remove(entry)
+            raise
+
+    def release(self, lane_name: str, held_seconds: Optional[float] = None):
+        lane = self.lanes[lane_name]
+        self.in_flight -= 1
+        lane.in_flight -= 1
+        if held_seconds is not None:
+            lane.service_seconds += 0.1 * (held_seconds - lane.service_seconds)
+        self._dispatch()
+
+    def snapshot(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "inFlight": self.in_flight,
+            "queueDepth": sum(len(lane.waiters) for lane in self.lanes.values()),
+            "shed": sum(lane.shed for lane in self.lanes.values()),
+            "queueTimeoutSeconds": self.queue_timeout,
+            "lanes": {name: lane.snapshot() for name, lane in self.lanes.items()}
+        }
+
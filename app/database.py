@@ -1,52 +1,247 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy import text
+from typing import Optional
+import asyncio
 import ssl
+import time
 import os
+import logging
 from dotenv import load_dotenv
+from app.db_budget import job_connections, pool_settings
 
 load_dotenv()
 
-# Build connection string
-# Force asyncpg driver
-DATABASE_URL = os.getenv("DATABASE_URL", "")
-if DATABASE_URL and not DATABASE_URL.startswith("postgresql+asyncpg://"):
-    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
-
-if not DATABASE_URL:
-    # Fallback construction
-    user = os.getenv("DB_USER")
-    password = os.getenv("DB_PASSWORD")
-    host = os.getenv("DB_HOST")
-    port = os.getenv("DB_PORT", "5432")
-    db_name = os.getenv("DB_NAME", "postgres")
-    DATABASE_URL = f"postgresql+asyncpg://{user}:{password}@{host}:{port}/{db_name}"
-
-# Critical: SSL Context for Supabase
-# "ssl": {"rejectUnauthorized": false} equivalent in Python/AsyncPG
-ssl_context = ssl.create_default_context()
-ssl_context.check_hostname = False
-ssl_context.verify_mode = ssl.CERT_NONE
-
-print(f"Connecting to DB at: {os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}")
-
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=False,
-    pool_size=20,
-    max_overflow=10,
-    pool_pre_ping=True,
-    connect_args={"ssl": ssl_context}
-)
-
-AsyncSessionLocal = sessionmaker(
-    bind=engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autoflush=False
-)
+logger = logging.getLogger(__name__)
+
+# Engine and session factory are created lazily (first use or app lifespan),
+# so importing this module stays cheap on Cloud Run cold starts.
+engine: Optional[AsyncEngine] = None
+AsyncSessionLocal: Optional[sessionmaker] = None
+
+# Read replica (DATABASE_REPLICA_URL). Unset -> reads share the primary engine.
+replica_engine: Optional[AsyncEngine] = None
+ReplicaSessionLocal: Optional[sessionmaker] = None
+
+# Background jobs (app/services/job_service.py): a small engine of their own, so imports
+# never take connections from the pool admission control sizes API requests against.
+job_engine: Optional[AsyncEngine] = None
+JobSessionLocal: Optional[sessionmaker] = None
+
+# Replica lag above this (seconds) routes reads back to the primary
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "10"))
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", "5"))
+_replica_lag_checked_at = 0.0
+_replica_lag_ok = True
+
+# Connections opened in the background after startup (0 = disabled)
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "0"))
+
+# Set when DATABASE_URL points at a transaction-mode pooler (PgBouncer / Supabase port 6543):
+# server-side prepared statements cannot survive across pooled transactions there.
+DB_TRANSACTION_POOLER = os.getenv("DB_TRANSACTION_POOLER", "").lower() in ("1", "true", "yes")
+
+
+def _database_url() -> str:
+    # Build connection string
+    # Force asyncpg driver
+    database_url = os.getenv("DATABASE_URL", "")
+    if database_url and not database_url.startswith("postgresql+asyncpg://"):
+        database_url = database_url.replace("postgresql://", "postgresql+asyncpg://")
+
+    if not database_url:
+        # Fallback construction
+        user = os.getenv("DB_USER")
+        password = os.getenv("DB_PASSWORD")
+        host = os.getenv("DB_HOST")
+        port = os.getenv("DB_PORT", "5432")
+        db_name = os.getenv("DB_NAME", "postgres")
+        database_url = f"postgresql+asyncpg://{user}:{password}@{host}:{port}/{db_name}"
+    return database_url
+
+
+def _ssl_context() -> ssl.SSLContext:
+    # Critical: SSL Context for Supabase
+    # "ssl": {"rejectUnauthorized": false} equivalent in Python/AsyncPG
+    ssl_context = ssl.create_default_context()
+    ssl_context.check_hostname = False
+    ssl_context.verify_mode = ssl.CERT_NONE
+    return ssl_context
+
+
+def _connect_args() -> dict:
+    args = {"ssl": _ssl_context()}
+    if DB_TRANSACTION_POOLER:
+        args["statement_cache_size"] = 0
+        args["prepared_statement_cache_size"] = 0
+    return args
+
+
+def _create_engine(database_url: str, pool: Optional[dict] = None) -> AsyncEngine:
+    # Sized per worker process from the global connection budget (app/db_budget.py)
+    pool = pool or pool_settings()
+    logger.info(
+        f"Creating DB engine for: {database_url.split('@')[-1]} "
+        f"(pool_size={pool['pool_size']}, max_overflow={pool['max_overflow']})"
+    )
+    if pool.get("budget") and not pool["budget"]["fits"]:
+        logger.warning(f"⚠️ DB connection budget exceeded: {pool['budget']}")
+    return create_async_engine(
+        database_url,
+        echo=False,
+        pool_size=pool["pool_size"],
+        max_overflow=pool["max_overflow"],
+        pool_pre_ping=True,
+        connect_args=_connect_args()
+    )
+
+
+def _create_sessionmaker(bind: AsyncEngine, route: str) -> sessionmaker:
+    return sessionmaker(
+        bind=bind,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=False,
+        info={"db_route": route}
+    )
+
+
+def session_route(session) -> str:
+    """
+    'primary' or 'replica': the database a session actually reads from
+    ('primary' when DATABASE_REPLICA_URL is unset and reads share the primary engine).
+    """
+    info = getattr(session, "info", None) or {}
+    return info.get("db_route", "primary")
+
+
+def get_engine() -> AsyncEngine:
+    """Return the shared (primary) engine, creating it and the session factory on first call."""
+    global engine, AsyncSessionLocal
+    if engine is None:
+        engine = _create_engine(_database_url())
+        AsyncSessionLocal = _create_sessionmaker(engine, "primary")
+    return engine
+
+
+def get_replica_engine() -> AsyncEngine:
+    """
+    Return the read-replica engine.
+    Falls back to the primary engine when DATABASE_REPLICA_URL is not set.
+    """
+    global replica_engine, ReplicaSessionLocal
+    if replica_engine is None:
+        replica_url = os.getenv("DATABASE_REPLICA_URL", "")
+        if not replica_url:
+            replica_engine = get_engine()
+            ReplicaSessionLocal = AsyncSessionLocal
+        else:
+            if not replica_url.startswith("postgresql+asyncpg://"):
+                replica_url = replica_url.replace("postgresql://", "postgresql+asyncpg://")
+            replica_engine = _create_engine(replica_url)
+            ReplicaSessionLocal = _create_sessionmaker(replica_engine, "replica")
+    return replica_engine
+
+
+def get_sessionmaker() -> sessionmaker:
+    get_engine()
+    return AsyncSessionLocal
+
+
+def get_job_sessionmaker() -> sessionmaker:
+    """Session factory on the primary for background jobs (db_budget.job_connections() connections)."""
+    global job_engine, JobSessionLocal
+    if job_engine is None:
+        job_engine = _create_engine(_database_url(), {"pool_size": job_connections(), "max_overflow": 0})
+        JobSessionLocal = _create_sessionmaker(job_engine, "primary")
+    return JobSessionLocal
+
+
+def get_replica_sessionmaker() -> sessionmaker:
+    get_replica_engine()
+    return ReplicaSessionLocal
+
+
+async def replica_lag_ok() -> bool:
+    """
+    True if the replica is within REPLICA_MAX_LAG_SECONDS of the primary.
+    Checked at most every REPLICA_LAG_CHECK_INTERVAL seconds; a failed check counts as lagging.
+    A server that is not in recovery (e.g. the primary posing as replica) reports zero lag.
+    """
+    global _replica_lag_checked_at, _replica_lag_ok
+    db_engine = get_replica_engine()
+    if db_engine is engine:
+        return True
+
+    now = time.monotonic()
+    if now - _replica_lag_checked_at < REPLICA_LAG_CHECK_INTERVAL:
+        return _replica_lag_ok
+    _replica_lag_checked_at = now
+
+    try:
+        async with db_engine.connect() as conn:
+            lag = (await conn.execute(text("""
+                SELECT CASE
+                    WHEN NOT pg_is_in_recovery() THEN 0
+                    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                END
+            """))).scalar()
+        _replica_lag_ok = float(lag) <= REPLICA_MAX_LAG_SECONDS
+        if not _replica_lag_ok:
+            logger.warning(f"Replica lag {float(lag):.1f}s exceeds {REPLICA_MAX_LAG_SECONDS}s, reading from primary")
+    except Exception as e:
+        logger.warning(f"Replica lag check failed, reading from primary: {e}")
+        _replica_lag_ok = False
+    return _replica_lag_ok
+
+
+async def prewarm_pool(min_size: int = DB_POOL_MIN_SIZE):
+    """
+    Open `min_size` connections concurrently and return them to the pool,
+    so the first requests don't pay TCP/TLS/auth setup.
+    """
+    if min_size <= 0:
+        return
+    db_engine = get_engine()
+
+    opened = []
+
+    async def _open():
+        conn = await db_engine.connect()
+        opened.append(conn)
+        await conn.execute(text("SELECT 1"))
+
+    try:
+        results = await asyncio.gather(*(_open() for _ in range(min_size)), return_exceptions=True)
+        failed = [r for r in results if isinstance(r, Exception)]
+        if failed:
+            logger.warning(f"DB pool pre-warm: {len(failed)}/{min_size} connections failed ({failed[0]})")
+        else:
+            logger.info(f"✅ DB pool pre-warmed with {min_size} connections")
+    finally:
+        for conn in opened:
+            await conn.close()
+
+
+async def dispose_engine():
+    global engine, AsyncSessionLocal, replica_engine, ReplicaSessionLocal, job_engine, JobSessionLocal
+    if job_engine is not None:
+        await job_engine.dispose()
+    if replica_engine is not None and replica_engine is not engine:
+        await replica_engine.dispose()
+    if engine is not None:
+        await engine.dispose()
+    engine = None
+    AsyncSessionLocal = None
+    replica_engine = None
+    ReplicaSessionLocal = None
+    job_engine = None
+    JobSessionLocal = None
+
 
 async def get_db():
-    async with AsyncSessionLocal() as session:
+    async with get_sessionmaker()() as session:
         try:
             yield session
         finally:
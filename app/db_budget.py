@@ -0,0 +1,141 @@
+"""
+Database connection budget.
+
+Every uvicorn worker process has its own SQLAlchemy pool, and Cloud Run may run
+several instances, so the per-process pool must be sized from a global limit:
+
+    per_worker = (DB_MAX_CONNECTIONS - DB_RESERVED_CONNECTIONS) // (MAX_INSTANCES * WEB_CONCURRENCY)
+
+minus the connections a worker holds outside the pool (the LISTEN connection when
+BOL_EVENTS_SOURCE=postgres, and the background-job engine). Without DB_MAX_CONNECTIONS
+the historical 20 + 10 pool is used.
+
+Print a budget table: python -m app.db_budget --max-connections 60 --instances 4 --workers 2
+"""
+
+from typing import Optional
+import argparse
+import math
+import os
+
+# Legacy fixed pool (used when no global budget is configured)
+DEFAULT_POOL_SIZE = 20
+DEFAULT_MAX_OVERFLOW = 10
+# Share of a worker's connections kept open in the pool; the rest is burst overflow
+POOL_SIZE_RATIO = 2 / 3
+
+
+def cpu_count() -> int:
+    """CPUs this process may use: affinity mask, capped by a cgroup v2 CPU quota (Cloud Run / Docker)."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
+def worker_count() -> int:
+    """WEB_CONCURRENCY if set, else one worker per usable CPU (async workers, not 2n+1)."""
+    configured = os.getenv("WEB_CONCURRENCY")
+    return max(1, int(configured)) if configured else cpu_count()
+
+
+def job_connections() -> int:
+    """
+    Size of the background-job engine (app/database.get_job_sessionmaker): per running job
+    the import's connection plus one for progress updates, and one for heartbeats.
+    """
+    return 2 * max(1, int(os.getenv("JOB_MAX_CONCURRENCY", "2"))) + 1
+
+
+def dedicated_connections() -> int:
+    """Connections a worker holds outside its pool."""
+    listen = 1 if os.getenv("BOL_EVENTS_SOURCE", "local").lower() == "postgres" else 0
+    return listen + job_connections()
+
+
+def connection_budget(
+    max_connections: int,
+    instances: int = 1,
+    workers: int = 1,
+    reserved: int = 0,
+    dedicated: int = 0,
+    per_worker_cap: int = DEFAULT_POOL_SIZE + DEFAULT_MAX_OVERFLOW
+) -> dict:
+    """
+    Split a global connection limit across instances x workers.
+    Returns poolSize / maxOverflow per worker, the worst-case total, and whether it fits.
+    """
+    processes = max(1, instances) * max(1, workers)
+    share = (max_connections - reserved) // processes - dedicated
+    per_worker = min(share, per_worker_cap)
+    fits = per_worker >= 1
+    # Never size a pool below one connection; `fits` reports the overcommit
+    per_worker = max(1, per_worker)
+    pool_size = max(1, round(per_worker * POOL_SIZE_RATIO))
+    return {
+        "processes": processes,
+        "perWorker": per_worker,
+        "poolSize": pool_size,
+        "maxOverflow": per_worker - pool_size,
+        "dedicatedPerWorker": dedicated,
+        "total": processes * (per_worker + dedicated) + reserved,
+        "maxConnections": max_connections,
+        "fits": fits
+    }
+
+
+def pool_settings() -> dict:
+    """
+    pool_size / max_overflow for this process.
+    DB_POOL_SIZE / DB_MAX_OVERFLOW override; DB_MAX_CONNECTIONS enables the budget.
+    """
+    budget: Optional[dict] = None
+    max_connections = os.getenv("DB_MAX_CONNECTIONS")
+    if max_connections:
+        budget = connection_budget(
+            int(max_connections),
+            instances=int(os.getenv("MAX_INSTANCES", "1")),
+            workers=worker_count(),
+            reserved=int(os.getenv("DB_RESERVED_CONNECTIONS", "5")),
+            dedicated=dedicated_connections()
+        )
+    pool_size = os.getenv("DB_POOL_SIZE")
+    max_overflow = os.getenv("DB_MAX_OVERFLOW")
+    return {
+        "pool_size": int(pool_size) if pool_size else (budget["poolSize"] if budget else DEFAULT_POOL_SIZE),
+        "max_overflow": int(max_overflow) if max_overflow else (budget["maxOverflow"] if budget else DEFAULT_MAX_OVERFLOW),
+        "budget": budget
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-worker DB pool sizes for a global connection limit")
+    parser.add_argument("--max-connections", type=int, default=int(os.getenv("DB_MAX_CONNECTIONS", "60")))
+    parser.add_argument("--instances", type=int, default=int(os.getenv("MAX_INSTANCES", "1")))
+    parser.add_argument("--workers", type=int, default=worker_count())
+    parser.add_argument("--reserved", type=int, default=int(os.getenv("DB_RESERVED_CONNECTIONS", "5")))
+    parser.add_argument("--dedicated", type=int, default=dedicated_connections())
+    args = parser.parse_args()
+
+    print(f"\n🔢 Connection budget: {args.max_connections} max, {args.reserved} reserved, "
+          f"{args.dedicated} dedicated/worker")
+    print("-" * 72)
+    print(f"   {'instances':>9} {'workers':>8} {'pool':>6} {'overflow':>9} {'total':>7}")
+    for instances in sorted({1, args.instances, args.instances * 2}):
+        for workers in sorted({1, args.workers, args.workers * 2}):
+            b = connection_budget(args.max_connections, instances, workers, args.reserved, args.dedicated)
+            flag = "" if b["fits"] else "  ❌ over budget"
+            print(f"   {instances:>9} {workers:>8} {b['poolSize']:>6} {b['maxOverflow']:>9} {b['total']:>7}{flag}")
+    print("-" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,85 @@
-from app.database import get_db
+from fastapi import Request, Response
+from app.database import get_sessionmaker, get_replica_sessionmaker, replica_lag_ok
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import os
+import time
+
+# Read-your-writes: after a write, reads stay on the primary for this many seconds.
+# Tracked per client: a cookie, or the `X-User` header for clients that drop cookies (e.g. GAS UrlFetch).
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+STICKY_COOKIE = "db_primary_until"
+STICKY_USER_HEADER = "X-User"
+
+# X-User -> monotonic time of that user's last write on this instance, oldest first
+_recent_writers: "OrderedDict[str, float]" = OrderedDict()
+
+
+def _note_write(request: Request):
+    user = request.headers.get(STICKY_USER_HEADER)
+    now = time.monotonic()
+    if user:
+        _recent_writers[user] = now
+        _recent_writers.move_to_end(user)
+    while _recent_writers and now - next(iter(_recent_writers.values())) >= REPLICA_STICKY_SECONDS:
+        _recent_writers.popitem(last=False)
+
+
+def _read_from_primary(request: Request) -> bool:
+    user = request.headers.get(STICKY_USER_HEADER)
+    if user and time.monotonic() - _recent_writers.get(user, float("-inf")) < REPLICA_STICKY_SECONDS:
+        return True
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, "0")) > time.time()
+    except ValueError:
+        return False
+
+
+@asynccontextmanager
+async def _routed_session(request: Request, response: Response, read: bool):
+    use_replica = (
+        read
+        and not _read_from_primary(request)
+        and await replica_lag_ok()
+    )
+
+    if use_replica:
+        session_factory = get_replica_sessionmaker()
+    else:
+        session_factory = get_sessionmaker()
+        if not read:
+            _note_write(request)
+            response.set_cookie(
+                STICKY_COOKIE,
+                str(time.time() + REPLICA_STICKY_SECONDS),
+                max_age=int(REPLICA_STICKY_SECONDS) + 1,
+                httponly=True
+            )
+    response.headers["X-DB-Route"] = "replica" if use_replica else "primary"
+
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+            if not read:
+                _note_write(request)
+
+
+async def get_db(request: Request, response: Response):
+    """
+    Session dependency with read/write routing.
+    GET requests use the read replica unless the client wrote recently or the replica lags;
+    everything else uses the primary. The chosen route is reported in `X-DB-Route`.
+    """
+    async with _routed_session(request, response, read=request.method == "GET") as session:
+        yield session
+
+
+async def get_read_db(request: Request, response: Response):
+    """
+    get_db for read-only routes whatever their HTTP method (batch reads sent as POST,
+    e.g. POST /api/bol/existing): routed like a GET and never marks the client as a writer.
+    """
+    async with _routed_session(request, response, read=True) as session:
+        yield session
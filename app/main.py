@@ -1,17 +1,55 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import bol
+from app.middleware import AdmissionMiddleware, CompressionMiddleware
+from app.admission import AdmissionController
+from app.routers import bol, invoice, order, jobs, analytics
+from app.database import get_engine, prewarm_pool, dispose_engine
+from app.services.order_events import order_events
+from app.services.audit_service import audit_writer
+from app.services.job_service import job_runner
+from app.services.single_flight import bol_reads
+from app.services.bol_cache import existing_bol_cache
+import asyncio
 import logging
+import os
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the engine without blocking on a DB round-trip, so the instance can
+    accept traffic immediately. Pool pre-warming (DB_POOL_MIN_SIZE) runs in the background.
+    """
+    logger.info("Application Startup: Creating Database engine...")
+    get_engine()
+    prewarm_task = asyncio.create_task(prewarm_pool())
+    order_events.start()
+    audit_writer.start()
+    job_runner.start()
+    try:
+        yield
+    finally:
+        prewarm_task.cancel()
+        await job_runner.stop()
+        await order_events.stop()
+        await audit_writer.stop()
+        await dispose_engine()
+
 app = FastAPI(
+    lifespan=lifespan,
     title="HSUS Order Status API",
     version="0.2.0 (FastAPI)",
     description="Migrated backend for HSUS Order System"
 )
 
+# Admission control: per-lane slots sized to the DB pool, 503 + Retry-After on overflow.
+# Added first so it runs inside CORS: shed responses still carry the CORS headers.
+admission = AdmissionController.from_env()
+app.add_middleware(AdmissionMiddleware, controller=admission)
+
 # CORS Setup
 app.add_middleware(
     CORSMiddleware,
@@ -21,22 +59,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Response Compression (skipped for the SSE stream)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=COMPRESSION_MIN_SIZE,
+    exclude_paths=["/api/bol/stream"]
+)
+
 # Include Routers
 app.include_router(bol.router)
+app.include_router(invoice.router)
+app.include_router(order.router)
+app.include_router(jobs.router)
+app.include_router(analytics.router)
 
 @app.get("/health")
 async def health_check():
     return {"status": "ok", "runtime": "python-fastapi"}
 
-@app.on_event("startup")
-async def startup_event():
-    logger.info("Application Startup: Connecting to Database...")
-    # Optional: Test DB connection here
-    try:
-        from app.database import engine
-        from sqlalchemy import text
-        async with engine.connect() as conn:
-            await conn.execute(text("SELECT 1"))
-        logger.info("✅ Database connected successfully (AsyncPG)")
-    except Exception as e:
-        logger.error(f"❌ Database connection failed: {e}")
+@app.get("/metrics/admission")
+async def admission_metrics():
+    """Per-lane in-flight requests, queue depth and shed counts for this worker."""
+    return admission.snapshot()
+
+@app.get("/metrics/coalescing")
+async def coalescing_metrics():
+    """Share of BOL reads served by joining an identical in-flight call, per endpoint."""
+    return bol_reads.snapshot()
+
+@app.get("/metrics/cache")
+async def cache_metrics():
+    """Hit rate, size and evictions of the per-order BOL cache on this worker."""
+    return existing_bol_cache.snapshot()
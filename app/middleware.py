@@ -0,0 +1,73 @@
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+from typing import Iterable
+import json
+import time
+
+from app.admission import AdmissionController, Overloaded
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
+
+
+class CompressionMiddleware:
+    """
+    Brotli (br) when brotli-asgi is installed, falling back to gzip for other clients.
+    Responses smaller than `minimum_size` are sent uncompressed.
+    `exclude_paths` bypass compression entirely (e.g. SSE streams, which must not be buffered).
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, exclude_paths: Iterable[str] = ()):
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
+        if BrotliMiddleware is not None:
+            self.compressed_app = BrotliMiddleware(app, minimum_size=minimum_size, gzip_fallback=True)
+        else:
+            self.compressed_app = GZipMiddleware(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and scope["path"] not in self.exclude_paths:
+            await self.compressed_app(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
+class AdmissionMiddleware:
+    """
+    Holds an admission slot (app/admission.py) for the whole request.
+    Shed requests get 503 with Retry-After and the usual `success: False` body.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        lane = self.controller.classify(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if lane is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.controller.acquire(lane)
+        except Overloaded as e:
+            body = json.dumps({"success": False, "message": f"Server busy ({e.lane}), retry later"}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(e.retry_after).encode())
+                ]
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(lane, time.monotonic() - started)
@@ -0,0 +1,13 @@
+"""
+Data access for orders, shipments and invoices.
+
+Statements are built once at import time. Repository methods take the caller's
+AsyncSession (or AsyncConnection) and never commit: transaction boundaries
+stay with the service.
+"""
+
+from app.repositories.order_repository import OrderRepository
+from app.repositories.shipment_repository import ShipmentRepository
+from app.repositories.invoice_repository import InvoiceRepository
+
+__all__ = ["OrderRepository", "ShipmentRepository", "InvoiceRepository"]
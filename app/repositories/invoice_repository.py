@@ -0,0 +1,114 @@
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy import text
+from typing import Dict, Sequence, Tuple, Union
+
+Executor = Union[AsyncSession, AsyncConnection]
+
+INVOICE_COLUMNS = "id, qbo_invoice_id, qbo_doc_number, estimate_id, amount, balance, due_date, status, content_hash, last_synced_at"
+
+FIND_BY_QBO_ID_SQL = text(f"SELECT {INVOICE_COLUMNS} FROM invoices WHERE qbo_invoice_id = :qbo_invoice_id")
+
+FIND_MANY_BY_QBO_ID_SQL = text(f"SELECT {INVOICE_COLUMNS} FROM invoices WHERE qbo_invoice_id = ANY(:ids)")
+
+# Newest accounting-side LastUpdatedTime already applied (the sync watermark)
+SOURCE_WATERMARK_SQL = text("SELECT MAX(source_updated_at) FROM invoices")
+
+MARK_OVERDUE_SQL = text("""
+    UPDATE invoices
+    SET status = 'OVERDUE'
+    WHERE status = 'OPEN' AND due_date < CURRENT_DATE AND balance > 0
+""")
+
+# One round-trip per batch: parallel arrays -> unnest -> upsert.
+# Rows whose content_hash is unchanged hit the WHERE and are not rewritten (no RETURNING row).
+UPSERT_MANY_SQL = text("""
+    INSERT INTO invoices (
+        qbo_invoice_id, qbo_doc_number, estimate_id, amount, balance,
+        due_date, status, content_hash, source_updated_at, last_synced_at
+    )
+    SELECT t.qbo_invoice_id,
+           t.qbo_doc_number,
+           COALESCE(
+               (SELECT id FROM orders WHERE external_id = t.estimate_ref),
+               (SELECT id FROM orders WHERE order_number = t.order_number)
+           ),
+           t.amount,
+           t.balance,
+           t.due_date,
+           t.status::invoice_status_enum,
+           t.content_hash,
+           t.source_updated_at,
+           NOW()
+    FROM unnest(
+        CAST(:qbo_invoice_id AS text[]),
+        CAST(:qbo_doc_number AS text[]),
+        CAST(:estimate_ref AS text[]),
+        CAST(:order_number AS text[]),
+        CAST(:amount AS numeric[]),
+        CAST(:balance AS numeric[]),
+        CAST(:due_date AS date[]),
+        CAST(:status AS text[]),
+        CAST(:content_hash AS text[]),
+        CAST(:source_updated_at AS timestamptz[])
+    ) AS t(qbo_invoice_id, qbo_doc_number, estimate_ref, order_number,
+           amount, balance, due_date, status, content_hash, source_updated_at)
+    ON CONFLICT (qbo_invoice_id) DO UPDATE SET
+        qbo_doc_number = EXCLUDED.qbo_doc_number,
+        estimate_id = EXCLUDED.estimate_id,
+        amount = EXCLUDED.amount,
+        balance = EXCLUDED.balance,
+        due_date = EXCLUDED.due_date,
+        status = EXCLUDED.status,
+        content_hash = EXCLUDED.content_hash,
+        source_updated_at = EXCLUDED.source_updated_at,
+        last_synced_at = EXCLUDED.last_synced_at
+    WHERE invoices.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+    RETURNING (xmax = 0) AS inserted
+""")
+
+# Fields hashed into content_hash (invoice_sync_service.normalize)
+CONTENT_FIELDS = [
+    "qbo_invoice_id", "qbo_doc_number", "estimate_ref", "order_number",
+    "amount", "balance", "due_date", "status"
+]
+
+UPSERT_FIELDS = CONTENT_FIELDS + ["content_hash", "source_updated_at"]
+
+
+class InvoiceRepository:
+
+    @staticmethod
+    async def find_by_qbo_id(db: Executor, qbo_invoice_id: str):
+        return (await db.execute(FIND_BY_QBO_ID_SQL, {"qbo_invoice_id": qbo_invoice_id})).fetchone()
+
+    @staticmethod
+    async def find_many_by_qbo_id(db: Executor, qbo_invoice_ids: Sequence[str]) -> Dict[str, object]:
+        if not qbo_invoice_ids:
+            return {}
+        result = await db.execute(FIND_MANY_BY_QBO_ID_SQL, {"ids": list(qbo_invoice_ids)})
+        return {row.qbo_invoice_id: row for row in result}
+
+    @staticmethod
+    async def source_watermark(db: Executor):
+        return (await db.execute(SOURCE_WATERMARK_SQL)).scalar()
+
+    @staticmethod
+    async def mark_overdue(db: Executor) -> int:
+        return (await db.execute(MARK_OVERDUE_SQL)).rowcount
+
+    @staticmethod
+    async def upsert_many(db: Executor, invoices: Sequence[dict]) -> Tuple[int, int]:
+        """
+        Upsert normalized invoice rows (see invoice_sync_service.normalize).
+        Returns (inserted, updated); rows with an unchanged content_hash count as neither.
+        """
+        if not invoices:
+            return 0, 0
+        result = await db.execute(UPSERT_MANY_SQL, {f: [row[f] for row in invoices] for f in UPSERT_FIELDS})
+        inserted = updated = 0
+        for row in result:
+            if row.inserted:
+                inserted += 1
+            else:
+                updated += 1
+        return inserted, updated
@@ -0,0 +1,90 @@
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy import text
+from typing import Dict, List, Sequence, Union
+
+Executor = Union[AsyncSession, AsyncConnection]
+
+ORDER_COLUMNS = "id, order_number, status, created_at, updated_at"
+
+FIND_BY_ORDER_NUMBER_SQL = text(f"SELECT {ORDER_COLUMNS} FROM orders WHERE order_number = :key")
+
+FIND_MANY_BY_ORDER_NUMBER_SQL = text(f"SELECT {ORDER_COLUMNS} FROM orders WHERE order_number = ANY(:keys)")
+
+LIST_SUMMARY_SQL = text("SELECT order_number, status, created_at FROM orders")
+
+# Full rows for the OrderRead endpoints (/api/bol/orders, /api/bol/detail/{key})
+DETAIL_COLUMNS = (
+    "id, order_number, source::text AS source, status::text AS status, "
+    "customer_info, items, created_at, updated_at"
+)
+
+LIST_DETAILS_SQL = text(f"SELECT {DETAIL_COLUMNS} FROM orders ORDER BY created_at DESC LIMIT :limit")
+
+FIND_DETAIL_BY_ORDER_NUMBER_SQL = text(f"SELECT {DETAIL_COLUMNS} FROM orders WHERE order_number = :key")
+
+TOUCH_SQL = text("UPDATE orders SET updated_at = NOW() WHERE id = :id")
+
+# New orders only; existing ones are left untouched (no updated_at churn)
+INSERT_MANY_SQL = text("""
+    INSERT INTO orders (order_number, source, status, items)
+    SELECT t.order_number, CAST(t.source AS order_source_enum), CAST(t.status AS order_status_enum), CAST(t.items AS jsonb)
+    FROM unnest(
+        CAST(:order_number AS text[]),
+        CAST(:source AS text[]),
+        CAST(:status AS text[]),
+        CAST(:items AS text[])
+    ) AS t(order_number, source, status, items)
+    ON CONFLICT (order_number) DO NOTHING
+    RETURNING id, order_number
+""")
+
+
+class OrderRepository:
+
+    @staticmethod
+    async def find_by_order_number(db: Executor, order_number: str):
+        """Row (id, order_number, status, created_at, updated_at) or None."""
+        return (await db.execute(FIND_BY_ORDER_NUMBER_SQL, {"key": order_number})).fetchone()
+
+    @staticmethod
+    async def find_many_by_order_number(db: Executor, order_numbers: Sequence[str]) -> Dict[str, object]:
+        """One round-trip for a batch of keys; missing keys are absent from the result."""
+        if not order_numbers:
+            return {}
+        result = await db.execute(FIND_MANY_BY_ORDER_NUMBER_SQL, {"keys": list(order_numbers)})
+        return {row.order_number: row for row in result}
+
+    @staticmethod
+    async def list_summary(db: Executor) -> List:
+        """(order_number, status, created_at) for every order."""
+        return (await db.execute(LIST_SUMMARY_SQL)).fetchall()
+
+    @staticmethod
+    async def list_details(db: Executor, limit: int) -> List:
+        """Newest `limit` orders, all columns (see DETAIL_COLUMNS)."""
+        return (await db.execute(LIST_DETAILS_SQL, {"limit": limit})).fetchall()
+
+    @staticmethod
+    async def find_detail_by_order_number(db: Executor, order_number: str):
+        """All columns (see DETAIL_COLUMNS) of one order, or None."""
+        return (await db.execute(FIND_DETAIL_BY_ORDER_NUMBER_SQL, {"key": order_number})).fetchone()
+
+    @staticmethod
+    async def touch(db: Executor, order_id) -> None:
+        await db.execute(TOUCH_SQL, {"id": order_id})
+
+    @staticmethod
+    async def insert_many(db: Executor, orders: Sequence[dict]) -> Dict[str, object]:
+        """
+        Insert orders ({order_number, source, status, items: JSON str}) that do not exist yet.
+        Returns {order_number: id} for the rows actually inserted.
+        """
+        if not orders:
+            return {}
+        result = await db.execute(INSERT_MANY_SQL, {
+            "order_number": [o["order_number"] for o in orders],
+            "source": [o.get("source", "DEALER") for o in orders],
+            "status": [o.get("status", "DRAFT") for o in orders],
+            "items": [o.get("items") for o in orders]
+        })
+        return {row.order_number: row.id for row in result}
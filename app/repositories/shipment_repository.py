@@ -0,0 +1,151 @@
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy import text
+from collections import defaultdict
+from typing import Dict, List, Sequence, Union
+
+Executor = Union[AsyncSession, AsyncConnection]
+
+# Quantity and shipping fee per shipment from shipment_items (012/013 migrations). Correlating on
+# shipped_at as well lets each lookup prune to one partition.
+ITEM_TOTALS_JOIN = """
+    LEFT JOIN LATERAL (
+        SELECT SUM(i.qty) AS qty, SUM(i.fee) AS fee
+        FROM shipment_items i
+        WHERE i.shipment_id = s.id AND i.shipped_at = s.shipped_at
+    ) li ON TRUE
+"""
+
+FIND_BY_ORDER_ID_SQL = text(f"""
+    SELECT s.tracking_number, s.shipped_at, COALESCE(li.qty, 0) AS qty,
+           COALESCE(li.fee, 0) AS fee, s.signed
+    FROM shipments s
+    {ITEM_TOTALS_JOIN}
+    WHERE s.order_id = :order_id
+""")
+
+FIND_MANY_BY_ORDER_ID_SQL = text(f"""
+    SELECT s.order_id, s.tracking_number, s.shipped_at, COALESCE(li.qty, 0) AS qty,
+           COALESCE(li.fee, 0) AS fee, s.signed
+    FROM shipments s
+    {ITEM_TOTALS_JOIN}
+    WHERE s.order_id = ANY(:order_ids)
+""")
+
+# Full shipment rows (raw items JSONB) for the OrderRead endpoints
+FIND_DETAILS_BY_ORDER_IDS_SQL = text("""
+    SELECT id, order_id, tracking_number, carrier, shipped_at, items, created_at
+    FROM shipments
+    WHERE order_id = ANY(:order_ids)
+    ORDER BY shipped_at, created_at, id
+""")
+
+# Reverse lookup, uses idx_shipments_tracking_number
+FIND_BY_TRACKING_SQL = text(f"""
+    SELECT s.tracking_number, s.shipped_at, s.carrier, COALESCE(li.qty, 0) AS qty,
+           COALESCE(li.fee, 0) AS fee, s.signed, o.order_number, o.status
+    FROM shipments s
+    JOIN orders o ON o.id = s.order_id
+    {ITEM_TOTALS_JOIN}
+    WHERE s.tracking_number = ANY(:bols)
+    ORDER BY s.tracking_number, o.order_number
+""")
+
+# The outer SELECT still sees the lines; the delete trigger removes them at statement end
+DELETE_BY_ORDER_ID_SQL = text(f"""
+    WITH s AS (
+        DELETE FROM shipments
+        WHERE order_id = :order_id
+        RETURNING id, tracking_number, shipped_at, signed
+    )
+    SELECT s.tracking_number, s.shipped_at, COALESCE(li.qty, 0) AS qty,
+           COALESCE(li.fee, 0) AS fee, s.signed
+    FROM s
+    {ITEM_TOTALS_JOIN}
+""")
+
+# One statement for shipments and their lines: ids are generated up front so both inserts agree.
+# shipments.items is still written for readers of the JSONB column (legacy TS / backend_python).
+INSERT_MANY_SQL = text("""
+    WITH input AS MATERIALIZED (
+        SELECT uuid_generate_v4() AS id, t.order_id, t.tracking_number,
+               CAST(t.shipped_at AS timestamptz) AS shipped_at, t.sku, t.qty, t.fee, t.signed
+        FROM unnest(
+            CAST(:order_id AS uuid[]),
+            CAST(:tracking_number AS text[]),
+            CAST(:shipped_at AS timestamp[]),
+            CAST(:sku AS text[]),
+            CAST(:qty AS integer[]),
+            CAST(:fee AS numeric[]),
+            CAST(:signed AS boolean[])
+        ) AS t(order_id, tracking_number, shipped_at, sku, qty, fee, signed)
+    ),
+    inserted AS (
+        INSERT INTO shipments (id, order_id, tracking_number, shipped_at, signed, items)
+        SELECT id, order_id, tracking_number, shipped_at, signed, jsonb_build_array(jsonb_build_object('qty', qty))
+        FROM input
+    )
+    INSERT INTO shipment_items (shipment_id, shipped_at, line_no, sku, qty, fee)
+    SELECT id, shipped_at, 1, sku, qty, fee
+    FROM input
+""")
+
+
+def sku_from_key(po_sku_key: str):
+    """SKU part of a PO|SKU order key (None when absent), as stored in shipment_items.sku."""
+    _, _, sku = po_sku_key.partition("|")
+    return sku or None
+
+
+class ShipmentRepository:
+
+    @staticmethod
+    async def find_by_order_id(db: Executor, order_id) -> List:
+        return (await db.execute(FIND_BY_ORDER_ID_SQL, {"order_id": order_id})).fetchall()
+
+    @staticmethod
+    async def find_many_by_order_id(db: Executor, order_ids: Sequence) -> Dict[object, List]:
+        """Shipments for a batch of orders in one round-trip, grouped by order_id."""
+        grouped = defaultdict(list)
+        if order_ids:
+            result = await db.execute(FIND_MANY_BY_ORDER_ID_SQL, {"order_ids": list(order_ids)})
+            for row in result:
+                grouped[row.order_id].append(row)
+        return grouped
+
+    @staticmethod
+    async def find_details_by_order_ids(db: Executor, order_ids: Sequence) -> Dict[object, List]:
+        """Full shipment rows for a batch of orders in one round-trip, grouped by order_id."""
+        grouped = defaultdict(list)
+        if order_ids:
+            result = await db.execute(FIND_DETAILS_BY_ORDER_IDS_SQL, {"order_ids": list(order_ids)})
+            for row in result:
+                grouped[row.order_id].append(row)
+        return grouped
+
+    @staticmethod
+    async def find_by_tracking(db: Executor, bol_numbers: Sequence[str]) -> List:
+        return (await db.execute(FIND_BY_TRACKING_SQL, {"bols": list(bol_numbers)})).fetchall()
+
+    @staticmethod
+    async def delete_by_order_id(db: Executor, order_id) -> List:
+        """Delete an order's shipments; returns the deleted rows."""
+        return (await db.execute(DELETE_BY_ORDER_ID_SQL, {"order_id": order_id})).fetchall()
+
+    @staticmethod
+    async def insert_many(db: Executor, shipments: Sequence[dict]) -> int:
+        """
+        Insert single-line shipments ({order_id, tracking_number, shipped_at, sku, qty, fee?, signed?})
+        and their shipment_items rows in one statement.
+        """
+        if not shipments:
+            return 0
+        result = await db.execute(INSERT_MANY_SQL, {
+            "order_id": [str(s["order_id"]) for s in shipments],
+            "tracking_number": [s["tracking_number"] for s in shipments],
+            "shipped_at": [s["shipped_at"] for s in shipments],
+            "sku": [s.get("sku") for s in shipments],
+            "qty": [int(s["qty"]) for s in shipments],
+            "fee": [s.get("fee") for s in shipments],
+            "signed": [bool(s.get("signed", False)) for s in shipments]
+        })
+        return result.rowcount
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from typing import List, Optional
+from app.dependencies import get_db
+from app.services.analytics_service import AnalyticsService, parse_group_by
+from app.schemas.analytics import ShipmentAnalyticsResponse, ShipmentRollupRefreshResponse, ShippingFeeTotalsResponse
+
+router = APIRouter(prefix="/api/analytics", tags=["Analytics"])
+
+@router.get("/shipments", response_model=ShipmentAnalyticsResponse)
+async def get_shipment_analytics(
+    groupBy: str = Query("day", description="Comma-separated: one of day/week/month, plus any of sku, carrier, status"),
+    date_from: Optional[date] = Query(None, alias="from", description="First shipped date (UTC), default: `to` - 365 days"),
+    date_to: Optional[date] = Query(None, alias="to", description="Last shipped date (UTC), default: today"),
+    live: bool = False,
+    limit: int = Query(5000, ge=1, le=50000),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Shipments (BOLs) and units shipped, aggregated in SQL.
+    e.g. ?groupBy=week,sku or ?groupBy=carrier&from=2024-01-01.
+    Served from the daily rollup unless ?live=true.
+    """
+    try:
+        dims = parse_group_by(groupBy)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="`from` must not be after `to`")
+    return await AnalyticsService.get_shipment_analytics(db, dims, date_from, date_to, live=live, limit=limit)
+
+@router.get("/shipping-fees", response_model=ShippingFeeTotalsResponse)
+async def get_shipping_fee_totals(
+    date_from: Optional[date] = Query(None, alias="from", description="First shipped date (UTC), default: `to` - 365 days"),
+    date_to: Optional[date] = Query(None, alias="to", description="Last shipped date (UTC), default: today"),
+    key: Optional[List[str]] = Query(None, description="PO|SKU keys to include (repeatable), default: all orders"),
+    limit: int = Query(5000, ge=1, le=50000),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Shipping fee totals per order from the typed fee column, e.g. ?from=2025-01-01&to=2025-03-31.
+    """
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="`from` must not be after `to`")
+    return await AnalyticsService.get_shipping_fee_totals(db, date_from, date_to, keys=key, limit=limit)
+
+@router.post("/shipments/refresh", response_model=ShipmentRollupRefreshResponse)
+async def refresh_shipment_rollup(db: AsyncSession = Depends(get_db)):
+    """
+    Recompute the rollup for days changed since the last refresh (full rebuild on first run).
+    """
+    result = await AnalyticsService.refresh_shipment_rollup(db)
+    if not result.get("success"):
+        raise HTTPException(status_code=500, detail=result.get("message"))
+    return result
@@ -1,36 +1,144 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.dependencies import get_db
+from app.dependencies import get_db, get_read_db
 from app.services.bol_service import BolService
+from app.services.order_events import order_events
+from app.services.audit_service import AuditService
+from app import serializers
+from app.serializers import json_response
+from typing import List, Optional, Union
 from app.schemas.bol import (
     BolInitialDataResponse, 
+    BolInitialDataColumnarResponse,
     BolExistingDataResponse, 
+    BolExistingBatchRequest,
+    BolExistingBatchResponse,
     BolSaveRequest, 
-    BolSaveResponse
+    BolSaveResponse,
+    BolTrackingLookupResponse,
+    BolHistoryResponse
 )
+from app.schemas.order import OrderRead
 
 router = APIRouter(prefix="/api/bol", tags=["BOL"])
 
-@router.get("/initial-data", response_model=BolInitialDataResponse)
-async def get_initial_data(db: AsyncSession = Depends(get_db)):
+# Read routes return pre-rendered JSON (app/serializers.py); response_model only documents the shape.
+# They pass the injected `response` along so headers set by get_db (X-DB-Route) are kept.
+
+@router.get(
+    "/initial-data",
+    response_model=Union[BolInitialDataResponse, BolInitialDataColumnarResponse]
+)
+async def get_initial_data(
+    response: Response,
+    format: str = Query("objects", pattern="^(objects|columnar)$"),
+    db: AsyncSession = Depends(get_db)
+):
     """
     Fetch list of pending/fulfilled orders.
+    ?format=columnar returns parallel arrays with a status dictionary instead of per-order objects.
+    """
+    columnar = format == "columnar"
+    result = await BolService.get_initial_bol_data(db, columnar=columnar)
+    adapter = serializers.INITIAL_DATA_COLUMNAR if columnar else serializers.INITIAL_DATA
+    return json_response(adapter, result, response=response)
+
+@router.get("/stream")
+async def stream_status_updates():
+    """
+    Server-sent events of order status changes: `event: status` with `{key, status, timestamp}`.
+    Load /initial-data once, then apply deltas instead of polling.
+    """
+    queue = order_events.subscribe()
+    return StreamingResponse(
+        order_events.stream(queue),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/by-tracking/{bol}", response_model=BolTrackingLookupResponse)
+async def get_by_tracking(bol: str, response: Response, db: AsyncSession = Depends(get_db)):
+    """
+    Reverse lookup of PO|SKU keys by BOL number.
+    Accepts a comma-separated list for batch lookup (e.g. /by-tracking/31305239,31304232).
+    """
+    bol_numbers = list(dict.fromkeys(b.strip() for b in bol.split(",") if b.strip()))
+    if not bol_numbers:
+        raise HTTPException(status_code=400, detail="At least one BOL number is required")
+    result = await BolService.get_bol_data_by_tracking(db, bol_numbers)
+    return json_response(serializers.TRACKING_LOOKUP, result, response=response)
+
+@router.post("/existing", response_model=BolExistingBatchResponse)
+async def get_existing_data_batch(
+    payload: BolExistingBatchRequest,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Batch form of GET /{po_sku_key}: details for up to 500 keys in one request, in request order.
+    A read despite the POST: routed to the replica like the GET routes.
     """
-    return await BolService.get_initial_bol_data(db)
+    keys = list(dict.fromkeys(k.strip() for k in payload.keys if k.strip()))
+    if not keys:
+        raise HTTPException(status_code=400, detail="At least one PO|SKU key is required")
+    result = await BolService.get_existing_bol_data_many(db, keys)
+    return json_response(serializers.EXISTING_BATCH, result, response=response)
+
+@router.get("/orders", response_model=List[OrderRead])
+async def get_orders(response: Response, limit: int = Query(100, ge=1, le=1000), db: AsyncSession = Depends(get_db)):
+    """
+    Newest orders with their shipments (full rows).
+    """
+    result = await BolService.get_orders(db, limit=limit)
+    if not result.get("success"):
+        raise HTTPException(status_code=500, detail=result.get("message"))
+    return json_response(serializers.ORDER_LIST, result["orders"], response=response)
+
+@router.get("/detail/{po_sku_key}", response_model=OrderRead)
+async def get_order_detail(po_sku_key: str, response: Response, db: AsyncSession = Depends(get_db)):
+    """
+    One order with its shipments (full rows). 404 if the order does not exist.
+    """
+    result = await BolService.get_order_detail(db, po_sku_key)
+    if not result.get("success"):
+        raise HTTPException(status_code=500, detail=result.get("message"))
+    if result["order"] is None:
+        raise HTTPException(status_code=404, detail=f"Order '{po_sku_key}' not found")
+    return json_response(serializers.ORDER, result["order"], response=response)
 
 @router.get("/{po_sku_key}", response_model=BolExistingDataResponse)
-async def get_existing_data(po_sku_key: str, db: AsyncSession = Depends(get_db)):
+async def get_existing_data(po_sku_key: str, response: Response, db: AsyncSession = Depends(get_db)):
     """
     Fetch specific order/shipment details.
     """
-    return await BolService.get_existing_bol_data(db, po_sku_key)
+    result = await BolService.get_existing_bol_data(db, po_sku_key)
+    return json_response(serializers.EXISTING_DATA, result, response=response)
+
+@router.get("/{po_sku_key}/history", response_model=BolHistoryResponse)
+async def get_history(
+    po_sku_key: str,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Audit trail of BOL edits for an order (newest first).
+    """
+    result = await AuditService.get_history(db, po_sku_key, limit)
+    return json_response(serializers.HISTORY, result, response=response)
 
 @router.post("/save", response_model=BolSaveResponse, status_code=status.HTTP_201_CREATED)
-async def save_data(payload: BolSaveRequest, db: AsyncSession = Depends(get_db)):
+async def save_data(
+    payload: BolSaveRequest,
+    x_user: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
     """
     Save BOL data (Shipments & Status).
+    The optional `X-User` header is recorded as the actor in the audit trail.
     """
-    result = await BolService.save_bol_data(db, payload)
+    result = await BolService.save_bol_data(db, payload, actor=x_user)
     
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("message"))
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_db
+from app.services.invoice_service import InvoiceService
+from app.schemas.invoice import InvoiceAgingResponse, InvoiceMaintenanceResponse
+
+router = APIRouter(prefix="/api/invoices", tags=["Invoices"])
+
+@router.get("/aging", response_model=InvoiceAgingResponse)
+async def get_aging(live: bool = False, db: AsyncSession = Depends(get_db)):
+    """
+    Aging buckets (current/1-30/31-60/61-90/90+) and open balance per customer.
+    Served from the summary table unless ?live=true.
+    """
+    return await InvoiceService.get_aging_report(db, live=live)
+
+@router.post("/aging/refresh", response_model=InvoiceMaintenanceResponse)
+async def refresh_aging(db: AsyncSession = Depends(get_db)):
+    """
+    Incrementally refresh the aging summary (full rebuild on a new day).
+    """
+    result = await InvoiceService.refresh_aging_summary(db)
+    if not result.get("success"):
+        raise HTTPException(status_code=500, detail=result.get("message"))
+    return result
+
+@router.post("/mark-overdue", response_model=InvoiceMaintenanceResponse)
+async def mark_overdue(db: AsyncSession = Depends(get_db)):
+    """
+    Mark OPEN invoices past their due date as OVERDUE.
+    """
+    result = await InvoiceService.mark_overdue(db)
+    if not result.get("success"):
+        raise HTTPException(status_code=500, detail=result.get("message"))
+    return result
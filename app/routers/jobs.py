@@ -0,0 +1,89 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import HTMLResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal, Optional
+from app.dependencies import get_db
+from app.services.job_service import JobService
+from app.services.import_validation import render_report_html
+from app.schemas.job import JobResponse, JobSubmitResponse
+import os
+import tempfile
+
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+
+JOB_MAX_UPLOAD_BYTES = int(os.getenv("JOB_MAX_UPLOAD_BYTES", str(100 * 1024 * 1024)))
+JOB_UPLOAD_DIR = os.getenv("JOB_UPLOAD_DIR") or None # default: system temp dir
+
+async def _spool_upload(request: Request) -> str:
+    """Stream the request body to a temp file (never held in memory); returns its path."""
+    fd, path = tempfile.mkstemp(prefix="bol_import_", suffix=".csv", dir=JOB_UPLOAD_DIR)
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > JOB_MAX_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail=f"Upload exceeds {JOB_MAX_UPLOAD_BYTES} bytes")
+                f.write(chunk)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Empty upload")
+        return path
+    except BaseException:
+        os.unlink(path)
+        raise
+
+@router.post("/import", response_model=JobSubmitResponse, status_code=202)
+async def submit_import(
+    request: Request,
+    filename: Optional[str] = None,
+    keepRaw: bool = False,
+    full: bool = False,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Start a BOL_DB import. The request body is the CSV export itself (Content-Type: text/csv).
+    Only rows changed since the last import are applied (?full=true re-applies all);
+    ?keepRaw=true also refreshes the raw `bol_db` copy. Returns the job id; poll GET /api/jobs/{id} for progress.
+    """
+    length = request.headers.get("content-length")
+    if length and int(length) > JOB_MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"Upload exceeds {JOB_MAX_UPLOAD_BYTES} bytes")
+    upload_path = await _spool_upload(request)
+
+    result = await JobService.create_import_job(db, upload_path, filename=filename, keep_raw=keepRaw, full=full)
+    if not result.get("success"):
+        raise HTTPException(status_code=429 if result.get("busy") else 500, detail=result.get("message"))
+    return result
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    """
+    Job status, progress and (when finished) result or error.
+    """
+    result = await JobService.get_job(db, job_id)
+    if not result.get("success"):
+        raise HTTPException(status_code=404, detail=result.get("message"))
+    return result
+
+@router.get("/{job_id}/report")
+async def get_job_report(job_id: str, format: Literal["json", "html"] = "json", db: AsyncSession = Depends(get_db)):
+    """
+    Data-quality report of a finished import (per-rule counts, sample rows, column profile).
+    ?format=html renders it as a standalone page.
+    """
+    result = await JobService.get_report(db, job_id)
+    if not result.get("success"):
+        raise HTTPException(status_code=404, detail=result.get("message"))
+    if format == "html":
+        return HTMLResponse(render_report_html(result["report"], title=f"BOL import {job_id}"))
+    return result["report"]
+
+@router.post("/{job_id}/cancel", response_model=JobSubmitResponse)
+async def cancel_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    """
+    Cancel a queued or running job. A running import rolls back at its next batch.
+    """
+    result = await JobService.cancel_job(db, job_id)
+    if not result.get("success"):
+        raise HTTPException(status_code=404, detail=result.get("message"))
+    return result
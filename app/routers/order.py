@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_db
+from app.services.order_status_service import OrderStatusService
+from app.schemas.order import OrderTransitionRequest, OrderTransitionResponse
+
+router = APIRouter(prefix="/api/orders", tags=["Orders"])
+
+@router.post("/transition", response_model=OrderTransitionResponse)
+async def transition_orders(payload: OrderTransitionRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Bulk status transition. Orders whose current status does not allow the move are skipped.
+    """
+    result = await OrderStatusService.transition(db, payload.keys, payload.toStatus, source="api")
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("message"))
+    return result
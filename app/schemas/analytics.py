@@ -0,0 +1,54 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Literal, Optional
+
+# --- Shared Models ---
+class ShipmentTotals(BaseModel):
+    shipments: int # shipment (BOL) rows
+    units: float # sum of item qty
+
+class ShipmentAnalyticsRow(ShipmentTotals):
+    period: Optional[str] = None # YYYY-MM-DD start of the day / week (Monday) / month
+    sku: Optional[str] = None
+    carrier: Optional[str] = None
+    status: Optional[str] = None
+
+class ShippingFeeTotals(BaseModel):
+    shipments: int
+    signedShipments: int # shipments with Signed BOL
+    shippingFee: float
+
+class ShippingFeeRow(ShippingFeeTotals):
+    key: str # PO|SKU
+
+# --- Response Models ---
+class ShipmentAnalyticsResponse(BaseModel):
+    success: bool
+    source: Literal["live", "rollup"]
+    groupBy: List[str] = []
+    # Inclusive UTC date range (`from` is a Python keyword)
+    from_: Optional[str] = Field(None, alias="from")
+    to: Optional[str] = None
+    total: Optional[ShipmentTotals] = None
+    rows: List[ShipmentAnalyticsRow] = []
+    truncated: bool = False
+    refreshedAt: Optional[str] = None # rollup only
+    pendingDays: Optional[int] = None # rollup only: changed days not yet refreshed
+    message: Optional[str] = None
+
+    model_config = ConfigDict(populate_by_name=True)
+
+class ShippingFeeTotalsResponse(BaseModel):
+    success: bool
+    from_: Optional[str] = Field(None, alias="from")
+    to: Optional[str] = None
+    total: Optional[ShippingFeeTotals] = None
+    rows: List[ShippingFeeRow] = []
+    truncated: bool = False
+    message: Optional[str] = None
+
+    model_config = ConfigDict(populate_by_name=True)
+
+class ShipmentRollupRefreshResponse(BaseModel):
+    success: bool
+    updated: int = 0 # days recomputed
+    message: Optional[str] = None
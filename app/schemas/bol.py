@@ -1,12 +1,15 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
 from datetime import datetime
 
+# shipment_items.fee is NUMERIC(12, 2)
+MAX_SHIPPING_FEE = 9999999999.99
+
 # --- Shared Models ---
 class BolItem(BaseModel):
     bolNumber: str
     shippedQty: int
-    shippingFee: float = 0
+    shippingFee: float = Field(0, ge=-MAX_SHIPPING_FEE, le=MAX_SHIPPING_FEE, allow_inf_nan=False)
     signed: bool = False
 
 class PendingOrder(BaseModel):
@@ -18,6 +21,17 @@ class FulfilledOrder(BaseModel):
     display: str
     timestamp: Optional[str] = None # ISO format string
 
+class TrackingMatch(BaseModel):
+    bolNumber: str
+    key: str
+    status: str
+    isFulfilled: bool
+    actShipDate: Optional[str] = None
+    shippedQty: int
+    shippingFee: float = 0
+    signed: bool = False
+    carrier: Optional[str] = None
+
 # --- Response Models ---
 class BolInitialDataResponse(BaseModel):
     success: bool
@@ -25,6 +39,23 @@ class BolInitialDataResponse(BaseModel):
     fulfilledList: List[FulfilledOrder]
     message: Optional[str] = None
 
+class PendingColumns(BaseModel):
+    keys: List[str]
+    status: List[int] # index into BolInitialDataColumnarResponse.statuses
+
+class FulfilledColumns(BaseModel):
+    keys: List[str]
+    status: List[int]
+    timestamps: List[str]
+
+class BolInitialDataColumnarResponse(BaseModel):
+    success: bool
+    format: Literal["columnar"] = "columnar"
+    statuses: List[str]
+    pending: PendingColumns
+    fulfilled: FulfilledColumns
+    message: Optional[str] = None
+
 class BolExistingDataResponse(BaseModel):
     success: bool
     bols: List[BolItem]
@@ -32,6 +63,33 @@ class BolExistingDataResponse(BaseModel):
     isFulfilled: bool
     message: Optional[str] = None
 
+class BolExistingBatchItem(BolExistingDataResponse):
+    key: str
+
+class BolExistingBatchResponse(BaseModel):
+    success: bool # False if any key failed (see the per-key `success`)
+    results: List[BolExistingBatchItem] # in request order
+    message: Optional[str] = None
+
+class BolTrackingLookupResponse(BaseModel):
+    success: bool
+    results: List[TrackingMatch]
+    notFound: List[str] = []
+    message: Optional[str] = None
+
+class BolHistoryEntry(BaseModel):
+    action: str
+    actor: Optional[str] = None
+    before: Optional[Dict[str, Any]] = None
+    after: Optional[Dict[str, Any]] = None
+    timestamp: str
+
+class BolHistoryResponse(BaseModel):
+    success: bool
+    key: str
+    entries: List[BolHistoryEntry]
+    message: Optional[str] = None
+
 # --- Request Models ---
 class BolSaveRequest(BaseModel):
     poSkuKey: str
@@ -39,6 +97,9 @@ class BolSaveRequest(BaseModel):
     isFulfilled: bool
     bols: List[BolItem]
 
+class BolExistingBatchRequest(BaseModel):
+    keys: List[str] = Field(..., min_length=1, max_length=500) # PO|SKU keys
+
 class BolSaveResponse(BaseModel):
     success: bool
     message: str
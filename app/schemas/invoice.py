@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+
+# --- Shared Models ---
+class AgingRow(BaseModel):
+    customer: str
+    invoiceCount: int
+    balance: float
+    current: float
+    days1to30: float
+    days31to60: float
+    days61to90: float
+    days90Plus: float
+    overdueCount: int
+
+# --- Response Models ---
+class InvoiceAgingResponse(BaseModel):
+    success: bool
+    source: Literal["live", "summary"]
+    asOf: Optional[str] = None # YYYY-MM-DD the buckets were computed for
+    total: Optional[AgingRow] = None
+    customers: List[AgingRow] = []
+    message: Optional[str] = None
+
+class InvoiceMaintenanceResponse(BaseModel):
+    success: bool
+    updated: int = 0
+    message: Optional[str] = None
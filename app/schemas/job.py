@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from typing import Any, Dict, Literal, Optional
+
+JobStatus = Literal['QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED', 'CANCELLED']
+
+# --- Shared Models ---
+class Job(BaseModel):
+    id: str
+    kind: str
+    status: JobStatus
+    params: Dict[str, Any] = {}
+    progress: Dict[str, Any] = {} # e.g. {"stage": "loading", "done": 3000, "total": 12000}
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    cancelRequested: bool = False
+    createdAt: str
+    startedAt: Optional[str] = None
+    finishedAt: Optional[str] = None
+
+# --- Response Models ---
+class JobSubmitResponse(BaseModel):
+    success: bool
+    jobId: str
+    status: JobStatus
+
+class JobResponse(BaseModel):
+    success: bool
+    job: Job
@@ -0,0 +1,44 @@
+from pydantic import BaseModel
+from typing import Any, List, Literal, Optional
+from datetime import datetime
+
+OrderStatus = Literal['DRAFT', 'CONFIRMED', 'ALLOCATING', 'PARTIALLY_SHIPPED', 'SHIPPED', 'COMPLETED', 'CANCELLED']
+
+# --- Shared Models ---
+class StatusChange(BaseModel):
+    key: str
+    fromStatus: str
+    toStatus: str
+
+# Full order / shipment rows (GET /api/bol/orders, /api/bol/detail/{key}).
+# Field names follow the table columns, as served by the former backend_python service.
+class ShipmentRead(BaseModel):
+    id: str
+    tracking_number: Optional[str] = None
+    carrier: Optional[str] = None
+    shipped_at: Optional[datetime] = None
+    items: Optional[Any] = None # raw shipments.items JSONB
+    created_at: Optional[datetime] = None
+
+class OrderRead(BaseModel):
+    id: str
+    order_number: str
+    source: str
+    status: str
+    customer_info: Optional[Any] = None
+    items: Optional[Any] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    shipments: List[ShipmentRead] = []
+
+# --- Request Models ---
+class OrderTransitionRequest(BaseModel):
+    keys: List[str]
+    toStatus: OrderStatus
+
+# --- Response Models ---
+class OrderTransitionResponse(BaseModel):
+    success: bool
+    changed: List[StatusChange]
+    skipped: List[str] # not found, or current status does not allow the move
+    message: Optional[str] = None
@@ -0,0 +1,162 @@
+"""
+Precompiled JSON serializers for the hot BOL responses.
+
+Services return plain dicts; routes render them here straight to JSON bytes
+with TypeAdapters built once at import, instead of FastAPI validating each
+response against the pydantic model and serializing it again. The TypedDicts
+mirror the response models in app/schemas/bol.py and app/schemas/order.py
+(which still document the API). Adapters emit only the keys present, so services
+return every field, defaults included (e.g. "message": None), to keep the JSON the
+response models produced; backend_python/scripts/test_serializers.py compares both.
+"""
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+from typing_extensions import TypedDict
+
+
+class _BolItem(TypedDict):
+    bolNumber: str
+    shippedQty: int
+    shippingFee: float
+    signed: bool
+
+
+class _PendingOrder(TypedDict):
+    key: str
+    display: str
+
+
+class _FulfilledOrder(TypedDict):
+    key: str
+    display: str
+    timestamp: Optional[str]
+
+
+class _InitialData(TypedDict):
+    success: bool
+    pendingList: List[_PendingOrder]
+    fulfilledList: List[_FulfilledOrder]
+    message: Optional[str]
+
+
+class _PendingColumns(TypedDict):
+    keys: List[str]
+    status: List[int]
+
+
+class _FulfilledColumns(TypedDict):
+    keys: List[str]
+    status: List[int]
+    timestamps: List[str]
+
+
+class _InitialDataColumnar(TypedDict):
+    success: bool
+    format: Literal["columnar"]
+    statuses: List[str]
+    pending: _PendingColumns
+    fulfilled: _FulfilledColumns
+    message: Optional[str]
+
+
+class _ExistingData(TypedDict):
+    success: bool
+    bols: List[_BolItem]
+    actShipDate: Optional[str]
+    isFulfilled: bool
+    message: Optional[str]
+
+
+class _ExistingBatchItem(_ExistingData):
+    key: str
+
+
+class _ExistingBatch(TypedDict):
+    success: bool
+    results: List[_ExistingBatchItem]
+    message: Optional[str]
+
+
+class _TrackingMatch(TypedDict):
+    bolNumber: str
+    key: str
+    status: str
+    isFulfilled: bool
+    actShipDate: Optional[str]
+    shippedQty: int
+    shippingFee: float
+    signed: bool
+    carrier: Optional[str]
+
+
+class _TrackingLookup(TypedDict):
+    success: bool
+    results: List[_TrackingMatch]
+    notFound: List[str]
+    message: Optional[str]
+
+
+class _HistoryEntry(TypedDict):
+    action: str
+    actor: Optional[str]
+    before: Optional[Dict[str, Any]]
+    after: Optional[Dict[str, Any]]
+    timestamp: str
+
+
+class _History(TypedDict):
+    success: bool
+    key: str
+    entries: List[_HistoryEntry]
+    message: Optional[str]
+
+
+class _ShipmentRead(TypedDict):
+    id: str
+    tracking_number: Optional[str]
+    carrier: Optional[str]
+    shipped_at: Optional[datetime]
+    items: Any
+    created_at: Optional[datetime]
+
+
+class _OrderRead(TypedDict):
+    id: str
+    order_number: str
+    source: str
+    status: str
+    customer_info: Any
+    items: Any
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    shipments: List[_ShipmentRead]
+
+
+INITIAL_DATA = TypeAdapter(_InitialData)
+INITIAL_DATA_COLUMNAR = TypeAdapter(_InitialDataColumnar)
+EXISTING_DATA = TypeAdapter(_ExistingData)
+EXISTING_BATCH = TypeAdapter(_ExistingBatch)
+TRACKING_LOOKUP = TypeAdapter(_TrackingLookup)
+HISTORY = TypeAdapter(_History)
+ORDER = TypeAdapter(_OrderRead)
+ORDER_LIST = TypeAdapter(List[_OrderRead])
+
+
+def json_response(
+    adapter: TypeAdapter, data: dict, status_code: int = 200, response: Optional[Response] = None
+) -> Response:
+    """
+    Serialize a service result with a precompiled adapter (no validation) into a JSON response.
+    Pass the route's injected `response`: FastAPI drops the headers dependencies set on it
+    (X-DB-Route, the sticky cookie) when a route returns its own Response, so they are copied here.
+    """
+    rendered = Response(content=adapter.dump_json(data), status_code=status_code, media_type="application/json")
+    if response is not None:
+        rendered.raw_headers.extend(
+            (name, value) for name, value in response.raw_headers
+            if name not in (b"content-length", b"content-type")
+        )
+    return rendered
@@ -0,0 +1,56 @@
+"""
+Production entrypoint: N uvicorn worker processes sized from the CPU count.
+
+    python -m app.server
+
+WEB_CONCURRENCY overrides the worker count (default: usable CPUs, cgroup-aware).
+Workers use uvloop + httptools when installed (uvicorn[standard]). The worker
+count is exported to the workers so each sizes its DB pool from the global
+budget (app/db_budget.py).
+"""
+
+import importlib.util
+import logging
+import os
+
+import uvicorn
+
+from app.db_budget import pool_settings, worker_count
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def main():
+    workers = worker_count()
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    loop = "uvloop" if _available("uvloop") else "asyncio"
+    http = "httptools" if _available("httptools") else "h11"
+
+    pool = pool_settings()
+    logger.info(
+        f"🚀 Starting {workers} worker(s) (loop={loop}, http={http}); "
+        f"DB pool per worker: {pool['pool_size']} + {pool['max_overflow']} overflow"
+    )
+    if pool["budget"]:
+        logger.info(f"   DB budget: {pool['budget']}")
+
+    uvicorn.run(
+        "app.main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8080")),
+        workers=workers,
+        loop=loop,
+        http=http,
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+        timeout_keep_alive=int(os.getenv("KEEP_ALIVE_SECONDS", "5"))
+    )
+
+
+if __name__ == "__main__":
+    main()
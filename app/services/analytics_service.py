@@ -0,0 +1,284 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+PERIODS = ("day", "week", "month")
+DIMENSIONS = ("sku", "carrier", "status")
+# Default window when no `from` is given
+DEFAULT_RANGE_DAYS = 365
+MAX_ROWS = 50000
+
+# One row per shipment line (shipment_items, 012_shipment_items.sql); a shipment counts once, on its
+# first line, and still counts when it has no lines. The SKU falls back to the second part of the PO|SKU key.
+# shipped_at is filtered as a plain range on both tables so their indexes and partition pruning apply.
+LIVE_BASE_SQL = """
+    SELECT (s.shipped_at AT TIME ZONE 'UTC')::date AS day,
+           COALESCE(NULLIF(i.sku, ''), NULLIF(split_part(o.order_number, '|', 2), ''), 'UNKNOWN') AS sku,
+           COALESCE(NULLIF(s.carrier, ''), 'UNKNOWN') AS carrier,
+           o.status::text AS status,
+           (COALESCE(i.line_no, 1) = 1)::int AS shipments,
+           COALESCE(i.qty, 0) AS units
+    FROM shipments s
+    JOIN orders o ON o.id = s.order_id
+    LEFT JOIN shipment_items i
+        ON i.shipment_id = s.id AND i.shipped_at = s.shipped_at
+       AND i.shipped_at >= :start AND i.shipped_at < :end
+    WHERE s.shipped_at >= :start AND s.shipped_at < :end
+"""
+
+ROLLUP_BASE_SQL = """
+    SELECT day, sku, carrier, status, shipments, units
+    FROM shipment_daily_rollup
+    WHERE day >= :start_day AND day < :end_day
+"""
+
+DIMENSION_EXPR = {
+    "day": "b.day",
+    "week": "date_trunc('week', b.day::timestamp)::date",
+    "month": "date_trunc('month', b.day::timestamp)::date",
+    "sku": "b.sku",
+    "carrier": "b.carrier",
+    "status": "b.status",
+}
+
+ROLLUP_STATE_SQL = text("""
+    SELECT refreshed_at, (SELECT COUNT(*) FROM shipment_rollup_dirty) AS pending_days
+    FROM shipment_rollup_refresh
+    WHERE id = 1
+""")
+
+LOCK_ROLLUP_SQL = text("SELECT refreshed_at, now() AS started_at FROM shipment_rollup_refresh WHERE id = 1 FOR UPDATE")
+
+ROLLUP_INSERT_SQL = f"""
+    INSERT INTO shipment_daily_rollup (day, sku, carrier, status, shipments, units)
+    SELECT b.day, b.sku, b.carrier, b.status, SUM(b.shipments), SUM(b.units)
+    FROM ({LIVE_BASE_SQL}) b
+    {{where}}
+    GROUP BY b.day, b.sku, b.carrier, b.status
+"""
+
+TAKE_DIRTY_DAYS_SQL = text("DELETE FROM shipment_rollup_dirty RETURNING day")
+
+# Shipping fees per order (PO|SKU) plus the grand total, one pass over the shipped_at range.
+# Fees sit on shipment_items (013_shipment_fee_signed.sql); a shipment counts on its first line.
+FEE_TOTALS_SQL = text("""
+    SELECT o.order_number AS key, GROUPING(o.order_number) <> 0 AS is_total,
+           COUNT(*) FILTER (WHERE COALESCE(i.line_no, 1) = 1) AS shipments,
+           COUNT(*) FILTER (WHERE COALESCE(i.line_no, 1) = 1 AND s.signed) AS signed_shipments,
+           COALESCE(SUM(i.fee), 0) AS shipping_fee
+    FROM shipments s
+    JOIN orders o ON o.id = s.order_id
+    LEFT JOIN shipment_items i
+        ON i.shipment_id = s.id AND i.shipped_at = s.shipped_at
+       AND i.shipped_at >= :start AND i.shipped_at < :end
+    WHERE s.shipped_at >= :start AND s.shipped_at < :end
+      AND (CAST(:keys AS text[]) IS NULL OR o.order_number = ANY(CAST(:keys AS text[])))
+    GROUP BY GROUPING SETS ((o.order_number), ())
+    ORDER BY is_total DESC, shipping_fee DESC, key
+    LIMIT :limit
+""")
+
+
+def parse_group_by(group_by: str) -> List[str]:
+    """'week,sku' -> ['week', 'sku']; at most one period, known dimensions only."""
+    dims = list(dict.fromkeys(d.strip().lower() for d in group_by.split(",") if d.strip()))
+    unknown = [d for d in dims if d not in PERIODS and d not in DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown groupBy: {', '.join(unknown)} (allowed: {', '.join(PERIODS + DIMENSIONS)})")
+    if sum(d in PERIODS for d in dims) > 1:
+        raise ValueError("groupBy accepts at most one of day, week, month")
+    if not dims:
+        raise ValueError("groupBy is required")
+    return dims
+
+
+def _utc_midnight(d: date) -> datetime:
+    return datetime.combine(d, time.min, tzinfo=timezone.utc)
+
+
+def _aggregate_sql(base_sql: str, dims: List[str], limit: int) -> str:
+    """Grouped rows plus the grand total (GROUPING SETS), total first."""
+    select = ", ".join(f"{DIMENSION_EXPR[d]} AS {d}" for d in dims)
+    group = ", ".join(DIMENSION_EXPR[d] for d in dims)
+    order = ", ".join(
+        [f"{DIMENSION_EXPR[d]}" for d in dims if d in PERIODS] + ["units DESC"]
+        + [DIMENSION_EXPR[d] for d in dims if d not in PERIODS]
+    )
+    return f"""
+        SELECT {select}, GROUPING({group}) <> 0 AS is_total,
+               SUM(b.shipments) AS shipments, COALESCE(SUM(b.units), 0) AS units
+        FROM ({base_sql}) b
+        GROUP BY GROUPING SETS (({group}), ())
+        ORDER BY is_total DESC, {order}
+        LIMIT {limit + 2}
+    """
+
+
+def _analytics_row(row, dims: List[str]) -> dict:
+    item = {}
+    for d in dims:
+        value = getattr(row, d)
+        item["period" if d in PERIODS else d] = value.isoformat() if isinstance(value, date) else value
+    item["shipments"] = int(row.shipments or 0)
+    item["units"] = float(row.units or 0)
+    return item
+
+
+class AnalyticsService:
+
+    @staticmethod
+    async def get_shipment_analytics(
+        db: AsyncSession,
+        dims: List[str],
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        live: bool = False,
+        limit: int = 5000
+    ):
+        """
+        Shipments (BOLs) and units grouped by `dims` (one of day/week/month plus any of sku/carrier/status)
+        for shipped_at (UTC dates) in [date_from, date_to].
+        live=False reads shipment_daily_rollup (see refresh_shipment_rollup); live=True aggregates shipment_items directly.
+        """
+        source = "live" if live else "rollup"
+        date_to = date_to or datetime.now(timezone.utc).date()
+        date_from = date_from or date_to - timedelta(days=DEFAULT_RANGE_DAYS)
+        limit = max(1, min(limit, MAX_ROWS))
+        try:
+            params = {
+                "start": _utc_midnight(date_from),
+                "end": _utc_midnight(date_to + timedelta(days=1)),
+                "start_day": date_from,
+                "end_day": date_to + timedelta(days=1)
+            }
+            sql = _aggregate_sql(LIVE_BASE_SQL if live else ROLLUP_BASE_SQL, dims, limit)
+            rows = (await db.execute(text(sql), params)).fetchall()
+
+            total = {"shipments": 0, "units": 0.0}
+            items = []
+            for row in rows:
+                if row.is_total:
+                    total = {"shipments": int(row.shipments or 0), "units": float(row.units or 0)}
+                else:
+                    items.append(_analytics_row(row, dims))
+
+            result = {
+                "success": True,
+                "source": source,
+                "groupBy": dims,
+                "from": date_from.isoformat(),
+                "to": date_to.isoformat(),
+                "total": total,
+                "rows": items[:limit],
+                "truncated": len(items) > limit
+            }
+            if not live:
+                state = (await db.execute(ROLLUP_STATE_SQL)).fetchone()
+                result["refreshedAt"] = state.refreshed_at.isoformat() if state and state.refreshed_at else None
+                result["pendingDays"] = int(state.pending_days) if state else 0
+            return result
+
+        except Exception as e:
+            logger.error(f"Error in get_shipment_analytics: {e}")
+            return {"success": False, "source": source, "groupBy": dims, "rows": [], "message": str(e)}
+
+    @staticmethod
+    async def get_shipping_fee_totals(
+        db: AsyncSession,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        keys: Optional[List[str]] = None,
+        limit: int = 5000
+    ):
+        """
+        Shipping fee, shipment and signed-BOL counts per order for shipped_at (UTC dates) in
+        [date_from, date_to], largest fee first, plus the total. `keys` limits it to those PO|SKU keys.
+        """
+        date_to = date_to or datetime.now(timezone.utc).date()
+        date_from = date_from or date_to - timedelta(days=DEFAULT_RANGE_DAYS)
+        limit = max(1, min(limit, MAX_ROWS))
+        try:
+            rows = (await db.execute(FEE_TOTALS_SQL, {
+                "start": _utc_midnight(date_from),
+                "end": _utc_midnight(date_to + timedelta(days=1)),
+                "keys": keys or None,
+                "limit": limit + 2
+            })).fetchall()
+
+            total = {"shipments": 0, "signedShipments": 0, "shippingFee": 0.0}
+            items = []
+            for row in rows:
+                item = {
+                    "shipments": int(row.shipments),
+                    "signedShipments": int(row.signed_shipments),
+                    "shippingFee": float(row.shipping_fee)
+                }
+                if row.is_total:
+                    total = item
+                else:
+                    items.append({"key": row.key, **item})
+
+            return {
+                "success": True,
+                "from": date_from.isoformat(),
+                "to": date_to.isoformat(),
+                "total": total,
+                "rows": items[:limit],
+                "truncated": len(items) > limit
+            }
+
+        except Exception as e:
+            logger.error(f"Error in get_shipping_fee_totals: {e}")
+            return {"success": False, "rows": [], "message": str(e)}
+
+    @staticmethod
+    async def refresh_shipment_rollup(db: AsyncSession):
+        """
+        Bring shipment_daily_rollup up to date.
+        Only days marked dirty by the shipment/order triggers are recomputed; first run: full rebuild.
+        """
+        try:
+            state = (await db.execute(LOCK_ROLLUP_SQL)).fetchone()
+            # Unbounded range for the live base query
+            everything = {"start": datetime(1970, 1, 1, tzinfo=timezone.utc), "end": datetime(9999, 1, 1, tzinfo=timezone.utc)}
+
+            if state is None or state.refreshed_at is None:
+                mode = "full"
+                await db.execute(TAKE_DIRTY_DAYS_SQL)
+                await db.execute(text("DELETE FROM shipment_daily_rollup"))
+                await db.execute(text(ROLLUP_INSERT_SQL.format(where="")), everything)
+                refreshed = (await db.execute(text("SELECT COUNT(DISTINCT day) FROM shipment_daily_rollup"))).scalar()
+            else:
+                mode = "incremental"
+                days = sorted((await db.execute(TAKE_DIRTY_DAYS_SQL)).scalars().all())
+                refreshed = len(days)
+                if days:
+                    await db.execute(
+                        text("DELETE FROM shipment_daily_rollup WHERE day = ANY(:days)"),
+                        {"days": days}
+                    )
+                    # Range on shipped_at first (index / partition pruning), then the exact days
+                    await db.execute(
+                        text(ROLLUP_INSERT_SQL.format(where="WHERE b.day = ANY(:days)")),
+                        {
+                            "days": days,
+                            "start": _utc_midnight(days[0]),
+                            "end": _utc_midnight(days[-1] + timedelta(days=1))
+                        }
+                    )
+
+            await db.execute(
+                text("UPDATE shipment_rollup_refresh SET refreshed_at = COALESCE(:started_at, now()) WHERE id = 1"),
+                {"started_at": state.started_at if state else None}
+            )
+            await db.commit()
+            return {"success": True, "updated": refreshed, "message": f"{mode} refresh"}
+
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error in refresh_shipment_rollup: {e}")
+            return {"success": False, "updated": 0, "message": str(e)}
@@ -0,0 +1,168 @@
+"""
+audit_service.py
+================
+Append-only audit trail of BOL edits.
+
+save_bol_data hands a before/after snapshot to `audit_writer.record()` after
+commit. Entries are buffered in a bounded in-process queue and written by a
+background task in multi-row batches, so auditing adds no DB round-trip to
+the save request. record() never waits: when the queue is full the entry is
+dropped and counted.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from datetime import datetime, timezone
+from typing import List, Optional
+import asyncio
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0"))
+
+INSERT_SQL = text("""
+    INSERT INTO bol_audit_log (order_id, po_sku_key, action, actor, before, after, created_at)
+    SELECT * FROM unnest(
+        CAST(:order_id AS uuid[]),
+        CAST(:po_sku_key AS text[]),
+        CAST(:action AS text[]),
+        CAST(:actor AS text[]),
+        CAST(:before AS jsonb[]),
+        CAST(:after AS jsonb[]),
+        CAST(:created_at AS timestamptz[])
+    )
+""")
+
+_STOP = object()
+
+HISTORY_SQL = text("""
+    SELECT action, actor, before, after, created_at
+    FROM bol_audit_log
+    WHERE po_sku_key = :key
+    ORDER BY created_at DESC
+    LIMIT :limit
+""")
+
+
+class AuditWriter:
+    """Bounded queue + background batch writer for bol_audit_log."""
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    def record(self, order_id, po_sku_key: str, action: str, before, after, actor: Optional[str] = None):
+        """Queue one audit entry without waiting; dropped (and counted in `dropped`) when the queue is full."""
+        if self._queue is None:
+            logger.warning(f"Audit writer not running, entry for '{po_sku_key}' not recorded")
+            return
+        entry = (
+            str(order_id) if order_id else None,
+            po_sku_key,
+            action,
+            actor,
+            json.dumps(before, default=str) if before is not None else None,
+            json.dumps(after, default=str) if after is not None else None,
+            datetime.now(timezone.utc)
+        )
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.error(f"❌ Audit queue full, dropped entry for '{po_sku_key}' (total dropped: {self.dropped})")
+
+    async def _write(self, batch: List[tuple]):
+        from app.database import get_sessionmaker
+
+        columns = list(zip(*batch))
+        params = dict(zip(
+            ["order_id", "po_sku_key", "action", "actor", "before", "after", "created_at"],
+            (list(c) for c in columns)
+        ))
+        async with get_sessionmaker()() as db:
+            await db.execute(INSERT_SQL, params)
+            await db.commit()
+        self.written += len(batch)
+
+    async def _run(self):
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = []
+            entry = await queue.get()
+            # Collect more until the batch is full or the flush interval passes
+            deadline = loop.time() + AUDIT_FLUSH_INTERVAL
+            while entry is not _STOP:
+                batch.append(entry)
+                timeout = deadline - loop.time()
+                if len(batch) >= AUDIT_BATCH_SIZE or timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+            if batch:
+                await self._flush(batch)
+            if entry is _STOP:
+                return
+
+    async def _flush(self, batch: List[tuple]):
+        for attempt in range(3):
+            try:
+                await self._write(batch)
+                return
+            except Exception as e:
+                logger.error(f"❌ Audit batch write failed (attempt {attempt + 1}/3): {e}")
+                await asyncio.sleep(0.5 * (attempt + 1))
+        self.dropped += len(batch)
+
+    def start(self):
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=AUDIT_QUEUE_SIZE)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush whatever is still queued, then stop the writer."""
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+        self._queue = None
+
+
+audit_writer = AuditWriter()
+
+
+class AuditService:
+
+    @staticmethod
+    async def get_history(db: AsyncSession, po_sku_key: str, limit: int = 100):
+        """Audit entries for one PO|SKU key, newest first."""
+        try:
+            result = await db.execute(HISTORY_SQL, {"key": po_sku_key, "limit": limit})
+            entries = []
+            for row in result:
+                entries.append({
+                    "action": row.action,
+                    "actor": row.actor,
+                    "before": json.loads(row.before) if isinstance(row.before, str) else row.before,
+                    "after": json.loads(row.after) if isinstance(row.after, str) else row.after,
+                    "timestamp": row.created_at.isoformat()
+                })
+            return {"success": True, "key": po_sku_key, "entries": entries, "message": None}
+
+        except Exception as e:
+            logger.error(f"Error in get_history: {e}")
+            return {"success": False, "key": po_sku_key, "entries": [], "message": str(e)}
@@ -0,0 +1,160 @@
+"""
+bol_cache.py
+============
+Per-order hot cache for GET /api/bol/{po_sku_key} (existing BOL data).
+
+Bounded LRU with a TTL, limited both by entry count and by the approximate
+size of the cached responses (their JSON length). Entries are invalidated
+precisely on writes:
+- save_bol_data / status transitions call order_changed(key) after commit
+- a BOL import calls orders_changed() (clears everything)
+With BOL_EVENTS_SOURCE=postgres, order_events also invalidates on every
+`order_status` notification (the trigger fires on every save and transition,
+from any instance) and on `bol_cache` notifications sent by imports, so the
+cache stays coherent across instances. The TTL bounds staleness for writes
+made outside the app (e.g. scripts with NOTIFY disabled).
+With the default "local" source an invalidation only reaches the worker that
+made the write, so the cache is off when several workers or instances serve
+requests (WEB_CONCURRENCY / one worker per CPU, MAX_INSTANCES).
+
+A read that started before an invalidation never populates the cache: callers
+reserve() before querying and the reservation is dropped by invalidate().
+Only reads from the primary populate it (bol_service._cacheable): a lagging
+replica could return pre-write data after the invalidation.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+import json
+import os
+import time
+
+from app.db_budget import worker_count
+from app.services.single_flight import forget_order, bol_reads
+
+BOL_CACHE_MAX_ENTRIES = int(os.getenv("BOL_CACHE_MAX_ENTRIES", "2048"))
+BOL_CACHE_MAX_BYTES = int(os.getenv("BOL_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+BOL_CACHE_TTL_SECONDS = float(os.getenv("BOL_CACHE_TTL_SECONDS", "30"))
+# NOTIFY channel for bulk invalidations (payload "*")
+CACHE_CHANNEL = "bol_cache"
+
+
+def shared_invalidation() -> bool:
+    """Whether writes on other workers/instances reach this worker's cache (Postgres NOTIFY)."""
+    if os.getenv("BOL_EVENTS_SOURCE", "local").lower() == "postgres":
+        return True
+    return worker_count() == 1 and int(os.getenv("MAX_INSTANCES", "1")) <= 1
+
+
+class LruTtlCache:
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl_seconds
+        # key -> (expires_at, size, value), least recently used first
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._pending: Dict[Hashable, object] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.rejected = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    def _drop(self, key: Hashable):
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+    def get(self, key: Hashable):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] <= time.monotonic():
+            self._drop(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def reserve(self, key: Hashable) -> object:
+        """Token for a read about to query; put() only stores with a still-valid token."""
+        token = object()
+        self._pending[key] = token
+        return token
+
+    def put(self, key: Hashable, value, token: object, size: Optional[int] = None):
+        """Store `value` unless the key was invalidated since reserve(). Pass value=None to just release."""
+        if self._pending.get(key) is not token:
+            return
+        del self._pending[key]
+        if value is None or not self.enabled:
+            return
+        size = size if size is not None else len(json.dumps(value))
+        if size > self.max_bytes:
+            self.rejected += 1
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (time.monotonic() + self.ttl, size, value)
+        self.bytes += size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        self._pending.pop(key, None)
+        if key in self._entries:
+            self._drop(key)
+            self.invalidations += 1
+
+    def clear(self):
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._pending.clear()
+        self.bytes = 0
+
+    def snapshot(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "enabled": self.enabled,
+            "maxEntries": self.max_entries,
+            "maxBytes": self.max_bytes,
+            "ttlSeconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "rejectedTooLarge": self.rejected
+        }
+
+
+existing_bol_cache = LruTtlCache(
+    BOL_CACHE_MAX_ENTRIES if shared_invalidation() else 0,
+    BOL_CACHE_MAX_BYTES,
+    BOL_CACHE_TTL_SECONDS
+)
+
+
+def order_changed(po_sku_key: str):
+    """After a committed write to one order (shipments and/or status)."""
+    existing_bol_cache.invalidate(po_sku_key)
+    forget_order(po_sku_key)
+
+
+def orders_changed():
+    """After a bulk write that may touch any order (BOL import)."""
+    existing_bol_cache.clear()
+    bol_reads.forget_all()
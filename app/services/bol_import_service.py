@@ -0,0 +1,463 @@
+"""
+bol_import_service.py
+=====================
+Single-pass streaming import of the BOL_DB sheet export (CSV) into the
+normalized `orders` + `shipments` tables, replacing the two-step
+init_bol_db.py -> bol_db -> migrate_to_normalized.py path.
+
+The file is read incrementally in chunks; each chunk is cleaned, typed and
+hashed (clean_rows, CPU-only and picklable so the job runner can push it to a
+process pool), COPYed into a temp staging table and merged with set-based
+statements. The raw TEXT copy in `bol_db` is optional.
+
+Re-imports are incremental: every sheet row, identified by (PO_SKU_Key, BOL #),
+has its content hash stored in `bol_sheet_rows`. Only rows that are new or
+whose hash changed are written, and rows missing from the file have their
+shipments removed, so re-importing an unchanged sheet writes nothing.
+
+The same pass feeds an ImportValidator; its data-quality report is returned
+with the import metrics.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from app.services.import_validation import ColumnProfile, ImportValidator, inspect_row
+from app.services.bol_cache import CACHE_CHANNEL, orders_changed
+from app.schemas.bol import MAX_SHIPPING_FEE
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+from typing import Awaitable, Callable, Iterator, List, Optional
+import asyncio
+import csv
+import hashlib
+import logging
+import math
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+# CSV headers (as they appear in file) -> bol_db column names
+COLUMN_MAPPING = {
+    "BOL #": "bol_number",
+    "PO_SKU_Key": "po_sku_key",
+    "Shipped Qty": "shipped_qty",
+    "Shipping Fee": "shipping_fee",
+    "Act. Ship Date": "act_ship_date",
+    "Signed BOL": "signed_bol",
+    "Status( Fulfilled )": "status",
+    "TimeStamp": "timestamp",
+}
+RAW_COLUMNS = list(COLUMN_MAPPING.values())
+
+DATE_FORMATS = [
+    "%Y-%m-%d", "%Y/%m/%d", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d %H:%M:%S",
+    "%m/%d/%Y", "%m-%d-%Y", "%m/%d/%Y %H:%M:%S", "%m/%d/%Y %I:%M:%S %p", "%m/%d/%Y %I:%M %p",
+    "%d/%m/%Y", "%d-%m-%Y",
+    "%Y%m%d", "%B %d, %Y",
+]
+
+CHUNK_SIZE = 5000
+
+ProgressCallback = Callable[[dict], Awaitable[None]]
+CpuRunner = Callable[..., Awaitable]
+
+# Staging row: line number, raw columns, typed columns, content hash
+STAGE_COLUMNS = ["row_no"] + RAW_COLUMNS + ["qty", "shipped_at", "fee", "signed", "row_hash"]
+
+# Signed BOL is a sheet checkbox (TRUE/FALSE); older exports used yes/x
+SIGNED_VALUES = {"true", "yes", "y", "1", "x"}
+# shipment_items.fee is NUMERIC(12, 2); same bound as BolItem.shippingFee
+MAX_FEE = Decimal(str(MAX_SHIPPING_FEE))
+
+
+def clean_money_int(value) -> int:
+    """'$1,200' / '1,500.00' -> int, 0 if unparsable."""
+    if value is None:
+        return 0
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        return int(float(str(value).replace('$', '').replace(',', '').strip()))
+    except (ValueError, TypeError):
+        return 0
+
+
+def clean_fee(fee: Optional[float]) -> Optional[Decimal]:
+    """
+    Parsed or payload Shipping Fee -> Decimal with cents (binary float noise never reaches the column);
+    None if missing, NaN/infinite or out of column range.
+    """
+    if fee is None or not math.isfinite(fee):
+        return None
+    value = Decimal(str(fee)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return value if abs(value) <= MAX_FEE else None
+
+
+def parse_signed(value) -> bool:
+    """'TRUE' / 'yes' / 'x' -> True, anything else (blank, 'FALSE') -> False."""
+    return str(value or "").strip().lower() in SIGNED_VALUES
+
+
+def parse_flexible_date(value) -> Optional[datetime]:
+    """Same formats as migrate_to_normalized.parse_flexible_date; None if unparsable."""
+    if value is None:
+        return None
+    date_str = str(value).strip()
+    if not date_str:
+        return None
+
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+
+    iso_pattern = re.search(r'(\d{4}[-/]\d{1,2}[-/]\d{1,2})', date_str)
+    if iso_pattern:
+        try:
+            return datetime.strptime(iso_pattern.group(1).replace('/', '-'), "%Y-%m-%d")
+        except ValueError:
+            pass
+
+    us_pattern = re.search(r'(\d{1,2}[-/]\d{1,2}[-/]\d{4})', date_str)
+    if us_pattern:
+        try:
+            return datetime.strptime(us_pattern.group(1).replace('-', '/'), "%m/%d/%Y")
+        except ValueError:
+            pass
+    return None
+
+
+def iter_raw_chunks(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple]:
+    """
+    Stream the CSV in chunks of (first_row_no, header, rows) without loading the file.
+    Rows are raw lists of strings; row numbers are 1-based data lines.
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        header = [h.strip() for h in header]
+        chunk = []
+        first_row_no = 1
+        for row in reader:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield first_row_no, header, chunk
+                first_row_no += len(chunk)
+                chunk = []
+        if chunk:
+            yield first_row_no, header, chunk
+
+
+def clean_rows(first_row_no: int, header: List[str], rows: List[List[str]]) -> dict:
+    """
+    Clean, type and hash one chunk into staging tuples (see STAGE_COLUMNS), and run the
+    row-local validation rules and column profiling for ImportValidator.
+    Rows without a PO_SKU_Key are counted in `skipped` and dropped.
+    """
+    positions = [header.index(csv_col) if csv_col in header else None for csv_col in COLUMN_MAPPING]
+    profile = ColumnProfile(len(RAW_COLUMNS))
+    records = []
+    fees = []
+    issues = []
+    skipped = 0
+    for offset, row in enumerate(rows):
+        row_no = first_row_no + offset
+        raw = [
+            row[pos].strip() if pos is not None and pos < len(row) else ""
+            for pos in positions
+        ]
+        profile.observe(raw)
+        if not raw[1]:
+            skipped += 1
+            issues.append(("missing_key", row_no, raw))
+            continue
+        qty = clean_money_int(raw[2])
+        shipped_at = parse_flexible_date(raw[4])
+        rules, fee = inspect_row(raw[2], raw[4], raw[3], qty, shipped_at)
+        for rule in rules:
+            issues.append((rule, row_no, raw))
+        records.append((
+            row_no,
+            *raw,
+            qty,
+            shipped_at,
+            clean_fee(fee),
+            parse_signed(raw[5]),
+            hashlib.sha1("\x1f".join(raw).encode()).hexdigest()
+        ))
+        fees.append(fee)
+    return {"records": records, "skipped": skipped, "fees": fees, "issues": issues, "profile": profile.to_dict()}
+
+
+CREATE_BOL_DB_SQL = text(f"""
+    CREATE TABLE IF NOT EXISTS bol_db (
+        id SERIAL PRIMARY KEY,
+        {", ".join(f"{col} TEXT" for col in RAW_COLUMNS)},
+        created_at TIMESTAMPTZ DEFAULT NOW()
+    )
+""")
+
+CREATE_STAGE_SQL = text(f"""
+    CREATE TEMP TABLE IF NOT EXISTS bol_import_stage (
+        row_no INT,
+        {", ".join(f"{col} TEXT" for col in RAW_COLUMNS)},
+        qty INT,
+        shipped_at TIMESTAMP,
+        fee NUMERIC(12, 2),
+        signed BOOLEAN,
+        row_hash TEXT
+    ) ON COMMIT DROP
+""")
+
+# Keys already handled in this run (first occurrence of a duplicate wins), for deletions at the end
+CREATE_SEEN_SQL = text("""
+    CREATE TEMP TABLE IF NOT EXISTS bol_import_seen (
+        po_sku_key TEXT,
+        bol_number TEXT,
+        PRIMARY KEY (po_sku_key, bol_number)
+    ) ON COMMIT DROP
+""")
+
+CREATE_DELTA_SQL = text("""
+    CREATE TEMP TABLE IF NOT EXISTS bol_import_delta (
+        LIKE bol_import_stage,
+        existed BOOLEAN
+    ) ON COMMIT DROP
+""")
+
+# Stage rows that are new or whose hash changed (full=True: all of them).
+# The first row per (key, BOL #) is picked before comparing hashes, so a later duplicate
+# in the same chunk can never stand in for an unchanged first row.
+DELTA_SQL = text("""
+    WITH delta AS (
+        INSERT INTO bol_import_delta
+        SELECT s.*, h.row_hash IS NOT NULL
+        FROM (
+            SELECT DISTINCT ON (po_sku_key, bol_number) *
+            FROM bol_import_stage
+            ORDER BY po_sku_key, bol_number, row_no
+        ) s
+        LEFT JOIN bol_sheet_rows h ON h.po_sku_key = s.po_sku_key AND h.bol_number = s.bol_number
+        WHERE (CAST(:full AS boolean) OR h.row_hash IS DISTINCT FROM s.row_hash)
+          AND NOT EXISTS (
+              SELECT 1 FROM bol_import_seen x WHERE x.po_sku_key = s.po_sku_key AND x.bol_number = s.bol_number
+          )
+        RETURNING existed
+    )
+    SELECT COUNT(*) FILTER (WHERE NOT existed) AS inserted, COUNT(*) FILTER (WHERE existed) AS changed
+    FROM delta
+""")
+
+MARK_SEEN_SQL = text("""
+    INSERT INTO bol_import_seen
+    SELECT DISTINCT po_sku_key, bol_number FROM bol_import_stage
+    ON CONFLICT DO NOTHING
+""")
+
+# Changed rows: drop the shipment written for the old content before re-inserting
+DELETE_CHANGED_SHIPMENTS_SQL = text("""
+    DELETE FROM shipments x
+    USING bol_import_delta d
+    JOIN orders o ON o.order_number = d.po_sku_key
+    WHERE d.existed AND x.order_id = o.id AND x.tracking_number = d.bol_number
+""")
+
+SAVE_HASHES_SQL = text("""
+    INSERT INTO bol_sheet_rows (po_sku_key, bol_number, row_hash)
+    SELECT po_sku_key, bol_number, row_hash FROM bol_import_delta
+    ON CONFLICT (po_sku_key, bol_number) DO UPDATE SET
+        row_hash = EXCLUDED.row_hash,
+        updated_at = NOW()
+""")
+
+# Rows gone from the sheet: forget their hashes and remove their shipments
+PRUNE_SQL = text("""
+    WITH removed AS (
+        DELETE FROM bol_sheet_rows h
+        WHERE NOT EXISTS (
+            SELECT 1 FROM bol_import_seen x WHERE x.po_sku_key = h.po_sku_key AND x.bol_number = h.bol_number
+        )
+        RETURNING h.po_sku_key, h.bol_number
+    ),
+    gone AS (
+        DELETE FROM shipments x
+        USING removed r
+        JOIN orders o ON o.order_number = r.po_sku_key
+        WHERE x.order_id = o.id AND x.tracking_number = r.bol_number
+        RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM removed) AS rows_deleted, (SELECT COUNT(*) FROM gone) AS shipments_deleted
+""")
+
+COPY_RAW_SQL = text(f"""
+    INSERT INTO bol_db ({", ".join(RAW_COLUMNS)})
+    SELECT {", ".join(RAW_COLUMNS)} FROM bol_import_stage ORDER BY row_no
+""")
+
+# First row per key decides the initial status; existing orders are left as they are
+MERGE_ORDERS_SQL = text("""
+    INSERT INTO orders (order_number, source, status, items)
+    SELECT DISTINCT ON (d.po_sku_key)
+           d.po_sku_key,
+           'DEALER',
+           (CASE WHEN lower(d.status) = 'fulfilled' THEN 'SHIPPED' ELSE 'CONFIRMED' END)::order_status_enum,
+           jsonb_build_array(jsonb_build_object('sku', d.po_sku_key, 'original_qty', d.qty))
+    FROM bol_import_delta d
+    ORDER BY d.po_sku_key, d.row_no
+    ON CONFLICT (order_number) DO NOTHING
+""")
+
+# Rows without a ship date or with qty <= 0 are not shipments. The NOT EXISTS guard covers
+# shipments loaded before hashes were tracked (first incremental run sees every row as new).
+# New shipments plus their shipment_items line (012_shipment_items.sql) in one statement;
+# rowcount = lines inserted = shipments created (one line per imported BOL)
+MERGE_SHIPMENTS_SQL = text("""
+    WITH input AS MATERIALIZED (
+        SELECT uuid_generate_v4() AS id, o.id AS order_id, d.bol_number, d.shipped_at, d.qty, d.fee, d.signed,
+               NULLIF(split_part(d.po_sku_key, '|', 2), '') AS sku
+        FROM bol_import_delta d
+        JOIN orders o ON o.order_number = d.po_sku_key
+        WHERE d.shipped_at IS NOT NULL
+          AND d.qty > 0
+          AND NOT EXISTS (
+              SELECT 1 FROM shipments x WHERE x.order_id = o.id AND x.tracking_number = d.bol_number
+          )
+    ),
+    inserted AS (
+        INSERT INTO shipments (id, order_id, tracking_number, shipped_at, signed, items)
+        SELECT id, order_id, bol_number, shipped_at, COALESCE(signed, FALSE),
+               jsonb_build_array(jsonb_build_object('qty', qty))
+        FROM input
+    )
+    INSERT INTO shipment_items (shipment_id, shipped_at, line_no, sku, qty, fee)
+    SELECT id, shipped_at, 1, sku, qty, fee
+    FROM input
+""")
+
+# Delivered on commit; payload "*" = every order may have changed
+NOTIFY_CACHE_SQL = text("SELECT pg_notify(:channel, '*')")
+
+
+async def _run_inline(fn, *args):
+    return fn(*args)
+
+
+class BolImportService:
+
+    @staticmethod
+    async def _stage(db: AsyncSession, records: List[tuple]):
+        """COPY a cleaned chunk into the (emptied) staging table."""
+        await db.execute(text("TRUNCATE bol_import_stage"))
+        conn = await db.connection()
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            "bol_import_stage", records=records, columns=STAGE_COLUMNS
+        )
+
+    @staticmethod
+    async def import_csv(
+        db: AsyncSession,
+        path: Path,
+        keep_raw: bool = False,
+        full: bool = False,
+        prune: bool = True,
+        chunk_size: int = CHUNK_SIZE,
+        run_cpu: Optional[CpuRunner] = None,
+        on_progress: Optional[ProgressCallback] = None
+    ):
+        """
+        Sync a BOL_DB CSV into orders/shipments in one transaction.
+        Only new or changed rows are applied (full=True re-applies every row); with prune=True,
+        rows no longer in the file have their shipments deleted. keep_raw=True also replaces
+        the contents of `bol_db` with the raw rows. `run_cpu` offloads clean_rows (e.g. to a
+        process pool); the next chunk is cleaned while the current one is written.
+        The data-quality report (import_validation.ImportValidator) is returned as `report`.
+        """
+        run_cpu = run_cpu or _run_inline
+        started = time.perf_counter()
+        metrics = {
+            "rowsRead": 0, "rowsSkipped": 0, "rowsUnchanged": 0, "rowsInserted": 0,
+            "rowsChanged": 0, "rowsDeleted": 0, "ordersCreated": 0,
+            "shipmentsCreated": 0, "shipmentsDeleted": 0, "rawRowsCopied": 0
+        }
+        validator = ImportValidator(RAW_COLUMNS)
+        upcoming = None
+        try:
+            for ddl in (CREATE_STAGE_SQL, CREATE_SEEN_SQL, CREATE_DELTA_SQL):
+                await db.execute(ddl)
+            if keep_raw:
+                await db.execute(CREATE_BOL_DB_SQL)
+                await db.execute(text("TRUNCATE bol_db"))
+
+            pending = None
+            for chunk in iter_raw_chunks(Path(path), chunk_size):
+                metrics["rowsRead"] += len(chunk[2])
+                upcoming = asyncio.ensure_future(run_cpu(clean_rows, *chunk))
+                if pending is not None:
+                    await BolImportService._merge_chunk(db, await pending, keep_raw, full, metrics, validator, on_progress)
+                pending, upcoming = upcoming, None
+            if pending is not None:
+                await BolImportService._merge_chunk(db, await pending, keep_raw, full, metrics, validator, on_progress)
+
+            # An empty or header-only file never prunes the whole history
+            if prune and metrics["rowsRead"] > metrics["rowsSkipped"]:
+                pruned = (await db.execute(PRUNE_SQL)).fetchone()
+                metrics["rowsDeleted"] = pruned.rows_deleted
+                metrics["shipmentsDeleted"] += pruned.shipments_deleted
+
+            # Other instances drop their BOL caches when this commits (BOL_EVENTS_SOURCE=postgres)
+            await db.execute(NOTIFY_CACHE_SQL, {"channel": CACHE_CHANNEL})
+            await db.commit()
+            # Touches arbitrary orders: drop cached reads, no read may join a pre-import query
+            orders_changed()
+            elapsed = time.perf_counter() - started
+            metrics["seconds"] = round(elapsed, 3)
+            metrics["rowsPerSec"] = round(metrics["rowsRead"] / elapsed, 1) if elapsed > 0 else 0.0
+            return {"success": True, "metrics": metrics, "report": validator.report()}
+
+        except Exception as e:
+            if upcoming is not None:
+                upcoming.cancel()
+            await db.rollback()
+            logger.error(f"Error in import_csv: {e}")
+            return {"success": False, "metrics": metrics, "report": validator.report(), "message": str(e)}
+
+    @staticmethod
+    async def _merge_chunk(
+        db: AsyncSession,
+        cleaned: dict,
+        keep_raw: bool,
+        full: bool,
+        metrics: dict,
+        validator: ImportValidator,
+        on_progress: Optional[ProgressCallback]
+    ):
+        validator.observe(cleaned)
+        metrics["rowsSkipped"] += cleaned["skipped"]
+        records = cleaned["records"]
+        if records:
+            await BolImportService._stage(db, records)
+            if keep_raw:
+                metrics["rawRowsCopied"] += (await db.execute(COPY_RAW_SQL)).rowcount
+
+            await db.execute(text("TRUNCATE bol_import_delta"))
+            counts = (await db.execute(DELTA_SQL, {"full": full})).fetchone()
+            await db.execute(MARK_SEEN_SQL)
+            metrics["rowsInserted"] += counts.inserted
+            metrics["rowsChanged"] += counts.changed
+            metrics["rowsUnchanged"] += len(records) - counts.inserted - counts.changed
+
+            # Unchanged chunk: nothing to write
+            if counts.inserted or counts.changed:
+                metrics["ordersCreated"] += (await db.execute(MERGE_ORDERS_SQL)).rowcount
+                if counts.changed:
+                    metrics["shipmentsDeleted"] += (await db.execute(DELETE_CHANGED_SHIPMENTS_SQL)).rowcount
+                metrics["shipmentsCreated"] += (await db.execute(MERGE_SHIPMENTS_SQL)).rowcount
+                await db.execute(SAVE_HASHES_SQL)
+        if on_progress:
+            await on_progress(dict(metrics))
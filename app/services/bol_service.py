@@ -1,180 +1,449 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from app.database import session_route
+from app.repositories import OrderRepository, ShipmentRepository
+from app.repositories.shipment_repository import sku_from_key
 from app.schemas.bol import BolSaveRequest
+from app.services.order_events import order_events
+from app.services.order_status_service import OrderStatusService, can_transition
+from app.services.audit_service import audit_writer
+from app.services.single_flight import bol_reads, existing_data_key, initial_data_key
+from app.services.bol_cache import existing_bol_cache, order_changed
+from app.services.bol_import_service import clean_fee
 from datetime import datetime
+from typing import List, Optional
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+FULFILLED_STATUSES = ['SHIPPED', 'COMPLETED']
+
+
+def _split_orders(rows):
+    """
+    Split (order_number, status, created_at) rows into sorted pending/fulfilled
+    lists of (key, status, timestamp) tuples.
+    Pending is ordered by display text, fulfilled by timestamp (newest first).
+    """
+    pending = []
+    fulfilled = []
+    
+    for row in rows:
+        created_at = row.created_at # datetime object
+        timestamp = created_at.isoformat() if created_at else ""
+        
+        if row.status in FULFILLED_STATUSES:
+            fulfilled.append((row.order_number, row.status, timestamp))
+        else:
+            pending.append((row.order_number, row.status, timestamp))
+    
+    fulfilled.sort(key=lambda o: o[2], reverse=True)
+    pending.sort(key=lambda o: f"{o[0]} ({o[1]})")
+    return pending, fulfilled
+
+
+def build_initial_data(rows) -> dict:
+    """Legacy GAS shape: one {key, display[, timestamp]} object per order."""
+    pending, fulfilled = _split_orders(rows)
+    return {
+        "success": True,
+        "pendingList": [
+            {"key": key, "display": f"{key} ({status})"} for key, status, _ in pending
+        ],
+        "fulfilledList": [
+            {"key": key, "display": f"{key} ({status})", "timestamp": timestamp}
+            for key, status, timestamp in fulfilled
+        ],
+        "message": None
+    }
+
+
+def build_initial_data_columnar(rows) -> dict:
+    """
+    Compact shape for ?format=columnar.
+    Parallel arrays per list; `status` holds indexes into the shared `statuses`
+    dictionary and `display` is left to the client (`f"{key} ({status})"`).
+    """
+    pending, fulfilled = _split_orders(rows)
+    statuses = []
+    status_index = {}
+    
+    def encode(status):
+        idx = status_index.get(status)
+        if idx is None:
+            idx = status_index[status] = len(statuses)
+            statuses.append(status)
+        return idx
+    
+    return {
+        "success": True,
+        "format": "columnar",
+        "statuses": statuses,
+        "pending": {
+            "keys": [o[0] for o in pending],
+            "status": [encode(o[1]) for o in pending]
+        },
+        "fulfilled": {
+            "keys": [o[0] for o in fulfilled],
+            "status": [encode(o[1]) for o in fulfilled],
+            "timestamps": [o[2] for o in fulfilled]
+        },
+        "message": None
+    }
+
+
+def _audit_snapshot(status: str, shipment_rows) -> dict:
+    """Order state in the same shape as the save payload, for audit diffs."""
+    return {
+        "status": status,
+        "actShipDate": next(
+            (r.shipped_at.date().isoformat() for r in shipment_rows if r.shipped_at), None
+        ),
+        "bols": [
+            {
+                "bolNumber": r.tracking_number or "",
+                "shippedQty": int(r.qty),
+                "shippingFee": float(r.fee),
+                "signed": bool(r.signed)
+            }
+            for r in shipment_rows
+        ]
+    }
+
+
+def _existing_result(status: Optional[str], shipment_rows) -> dict:
+    """GET /api/bol/{po_sku_key} payload for an order (status None: unknown key) and its shipments."""
+    act_ship_date = None
+    bols = []
+    for s in shipment_rows:
+        if not act_ship_date and s.shipped_at:
+            act_ship_date = s.shipped_at.isoformat().split('T')[0]
+        bols.append({
+            "bolNumber": s.tracking_number if s.tracking_number else "",
+            "shippedQty": int(s.qty),
+            "shippingFee": float(s.fee),
+            "signed": bool(s.signed)
+        })
+    return {
+        "success": True,
+        "bols": bols,
+        "actShipDate": act_ship_date,
+        "isFulfilled": status in FULFILLED_STATUSES,
+        "message": None
+    }
+
+
+def _json_value(value):
+    """JSONB column value; decoded here if the driver handed back text."""
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def _order_read(order, shipment_rows) -> dict:
+    """OrderRead payload (app/schemas/order.py) for an order row and its shipment rows."""
+    return {
+        "id": str(order.id),
+        "order_number": order.order_number,
+        "source": order.source,
+        "status": order.status,
+        "customer_info": _json_value(order.customer_info),
+        "items": _json_value(order.items),
+        "created_at": order.created_at,
+        "updated_at": order.updated_at,
+        "shipments": [
+            {
+                "id": str(s.id),
+                "tracking_number": s.tracking_number,
+                "carrier": s.carrier,
+                "shipped_at": s.shipped_at,
+                "items": _json_value(s.items),
+                "created_at": s.created_at
+            }
+            for s in shipment_rows
+        ]
+    }
+
+
+def _cacheable(db: AsyncSession, result: dict) -> bool:
+    """
+    Only successful reads from the primary may fill bol_cache. A replica read can return
+    pre-write data after the write's invalidation arrived, and would keep serving it for the
+    whole TTL, also to clients routed to the primary for read-your-writes.
+    """
+    return bool(result.get("success")) and session_route(db) == "primary"
+
+
+def _target_status(payload: BolSaveRequest, current: str) -> str:
+    """Order status implied by a BOL save (a COMPLETED order stays COMPLETED when its BOLs are corrected)."""
+    if payload.isFulfilled:
+        return 'COMPLETED' if current == 'COMPLETED' else 'SHIPPED'
+    if any(b.bolNumber and b.shippedQty > 0 for b in payload.bols):
+        return 'PARTIALLY_SHIPPED'
+    return 'CONFIRMED'
+
+
 class BolService:
     
     @staticmethod
-    async def get_initial_bol_data(db: AsyncSession):
+    async def get_initial_bol_data(db: AsyncSession, columnar: bool = False):
         """
         Fetches all orders and separates them into pending/fulfilled lists.
         Direct SQL implementation for performance.
+        With columnar=True the lists are returned as parallel arrays (see build_initial_data_columnar).
+        Concurrent identical calls share one query (single_flight.bol_reads).
         """
+        return await bol_reads.do(
+            initial_data_key(columnar, session_route(db)),
+            lambda: BolService._fetch_initial_bol_data(db, columnar)
+        )
+
+    @staticmethod
+    async def _fetch_initial_bol_data(db: AsyncSession, columnar: bool):
         try:
             # Query all orders
-            result = await db.execute(text("SELECT order_number, status, created_at FROM orders"))
-            orders = result.fetchall()
-            
-            pending_list = []
-            fulfilled_list = []
+            orders = await OrderRepository.list_summary(db)
             
-            for row in orders:
-                key = row.order_number
-                status = row.status
-                created_at = row.created_at # datetime object
-                
-                display = f"{key} ({status})"
-                timestamp = created_at.isoformat() if created_at else ""
-                
-                is_fulfilled = status in ['SHIPPED', 'COMPLETED']
-                
-                if is_fulfilled:
-                    fulfilled_list.append({"key": key, "display": display, "timestamp": timestamp})
-                else:
-                    pending_list.append({"key": key, "display": display})
-            
-            # Sort
-            fulfilled_list.sort(key=lambda x: x['timestamp'], reverse=True)
-            pending_list.sort(key=lambda x: x['display'])
-            
-            return {
-                "success": True,
-                "pendingList": pending_list,
-                "fulfilledList": fulfilled_list
-            }
+            if columnar:
+                return build_initial_data_columnar(orders)
+            return build_initial_data(orders)
             
         except Exception as e:
             logger.error(f"Error in get_initial_bol_data: {e}")
+            if columnar:
+                return {"success": False, "format": "columnar", "statuses": [],
+                        "pending": {"keys": [], "status": []},
+                        "fulfilled": {"keys": [], "status": [], "timestamps": []},
+                        "message": str(e)}
             return {"success": False, "pendingList": [], "fulfilledList": [], "message": str(e)}
 
     @staticmethod
     async def get_existing_bol_data(db: AsyncSession, po_sku_key: str):
+        """
+        Shipments of one order. Served from the per-order cache (bol_cache) when hot;
+        otherwise concurrent calls for the same key share one query.
+        Only results read from the primary are cached (see _cacheable).
+        """
+        cached = existing_bol_cache.get(po_sku_key)
+        if cached is not None:
+            return cached
+        token = existing_bol_cache.reserve(po_sku_key)
+        result = await bol_reads.do(
+            existing_data_key(po_sku_key, session_route(db)),
+            lambda: BolService._fetch_existing_bol_data(db, po_sku_key)
+        )
+        existing_bol_cache.put(po_sku_key, result if _cacheable(db, result) else None, token)
+        return result
+
+    @staticmethod
+    async def _fetch_existing_bol_data(db: AsyncSession, po_sku_key: str):
         try:
             # 1. Get Order
-            order_res = await db.execute(
-                text("SELECT id, status FROM orders WHERE order_number = :key"),
-                {"key": po_sku_key}
-            )
-            order = order_res.fetchone()
+            order = await OrderRepository.find_by_order_number(db, po_sku_key)
             
             if not order:
-                return {"success": True, "bols": [], "actShipDate": None, "isFulfilled": False}
-            
-            order_id = order.id
-            status = order.status
+                return _existing_result(None, [])
             
             # 2. Get Shipments
-            ship_res = await db.execute(
-                text("SELECT tracking_number, shipped_at, items FROM shipments WHERE order_id = :oid"),
-                {"oid": order_id}
-            )
-            shipments = ship_res.fetchall()
+            shipments = await ShipmentRepository.find_by_order_id(db, order.id)
             
             # 3. Map Data
-            act_ship_date = None
-            is_fulfilled = status in ['SHIPPED', 'COMPLETED']
-            bols = []
-            
-            for s in shipments:
-                shipped_at = s.shipped_at
-                if not act_ship_date and shipped_at:
-                    act_ship_date = shipped_at.isoformat().split('T')[0]
-                
-                raw_items = s.items # This should be a python dict/list if using SQLAlchemy JSON type, or str if text
-                if isinstance(raw_items, str):
-                    try:
-                        items = json.loads(raw_items)
-                    except:
-                        items = []
-                else:
-                    items = raw_items if raw_items else []
-                
-                qty = 0
-                if isinstance(items, list):
-                    qty = sum((int(i.get('qty', 0)) for i in items))
-                
-                bols.append({
-                    "bolNumber": s.tracking_number if s.tracking_number else "",
-                    "shippedQty": qty,
-                    "shippingFee": 0,
-                    "signed": False
+            return _existing_result(order.status, shipments)
+
+        except Exception as e:
+            logger.error(f"Error in get_existing_bol_data: {e}")
+            return {"success": False, "bols": [], "actShipDate": None, "isFulfilled": False, "message": str(e)}
+
+    @staticmethod
+    async def get_existing_bol_data_many(db: AsyncSession, po_sku_keys: List[str]):
+        """
+        get_existing_bol_data for a batch of keys (POST /api/bol/existing).
+        Cache hits are served first; the misses are read in two queries for the whole batch.
+        """
+        results = {}
+        misses = []
+        for key in po_sku_keys:
+            cached = existing_bol_cache.get(key)
+            if cached is not None:
+                results[key] = cached
+            else:
+                misses.append(key)
+
+        if misses:
+            tokens = {key: existing_bol_cache.reserve(key) for key in misses}
+            fetched = await BolService._fetch_existing_bol_data_many(db, misses)
+            for key in misses:
+                result = fetched[key]
+                existing_bol_cache.put(key, result if _cacheable(db, result) else None, tokens[key])
+                results[key] = result
+
+        items = [{"key": key, **results[key]} for key in po_sku_keys]
+        return {"success": all(item["success"] for item in items), "results": items, "message": None}
+
+    @staticmethod
+    async def _fetch_existing_bol_data_many(db: AsyncSession, po_sku_keys: List[str]) -> dict:
+        try:
+            orders = await OrderRepository.find_many_by_order_number(db, po_sku_keys)
+            shipments = await ShipmentRepository.find_many_by_order_id(db, [o.id for o in orders.values()])
+            return {
+                key: _existing_result(orders[key].status, shipments.get(orders[key].id, []))
+                if key in orders else _existing_result(None, [])
+                for key in po_sku_keys
+            }
+
+        except Exception as e:
+            logger.error(f"Error in get_existing_bol_data_many: {e}")
+            failure = {"success": False, "bols": [], "actShipDate": None, "isFulfilled": False, "message": str(e)}
+            return {key: dict(failure) for key in po_sku_keys}
+
+    @staticmethod
+    async def get_orders(db: AsyncSession, limit: int = 100):
+        """
+        Newest orders with their shipments (OrderRead shape) in two queries:
+        the orders, then all their shipments in one batch.
+        """
+        try:
+            orders = await OrderRepository.list_details(db, limit)
+            shipments = await ShipmentRepository.find_details_by_order_ids(db, [o.id for o in orders])
+            return {"success": True, "orders": [_order_read(o, shipments.get(o.id, [])) for o in orders]}
+
+        except Exception as e:
+            logger.error(f"Error in get_orders: {e}")
+            return {"success": False, "orders": [], "message": str(e)}
+
+    @staticmethod
+    async def get_order_detail(db: AsyncSession, po_sku_key: str):
+        """One order with its shipments (OrderRead shape); `order` is None for an unknown key."""
+        try:
+            order = await OrderRepository.find_detail_by_order_number(db, po_sku_key)
+            if order is None:
+                return {"success": True, "order": None}
+            shipments = await ShipmentRepository.find_details_by_order_ids(db, [order.id])
+            return {"success": True, "order": _order_read(order, shipments.get(order.id, []))}
+
+        except Exception as e:
+            logger.error(f"Error in get_order_detail: {e}")
+            return {"success": False, "order": None, "message": str(e)}
+
+    @staticmethod
+    async def get_bol_data_by_tracking(db: AsyncSession, bol_numbers: List[str]):
+        """
+        Reverse lookup: BOL / tracking numbers -> PO|SKU keys.
+        One query for the whole batch (uses idx_shipments_tracking_number).
+        """
+        try:
+            rows = await ShipmentRepository.find_by_tracking(db, bol_numbers)
+
+            results = []
+            found = set()
+            for row in rows:
+                found.add(row.tracking_number)
+                results.append({
+                    "bolNumber": row.tracking_number,
+                    "key": row.order_number,
+                    "status": row.status,
+                    "isFulfilled": row.status in FULFILLED_STATUSES,
+                    "actShipDate": row.shipped_at.date().isoformat() if row.shipped_at else None,
+                    "shippedQty": int(row.qty),
+                    "shippingFee": float(row.fee),
+                    "signed": bool(row.signed),
+                    "carrier": row.carrier
                 })
-                
+
             return {
                 "success": True,
-                "bols": bols,
-                "actShipDate": act_ship_date,
-                "isFulfilled": is_fulfilled
+                "results": results,
+                "notFound": [b for b in bol_numbers if b not in found],
+                "message": None
             }
 
         except Exception as e:
-            logger.error(f"Error in get_existing_bol_data: {e}")
-            return {"success": False, "bols": [], "message": str(e), "isFulfilled": False}
+            logger.error(f"Error in get_bol_data_by_tracking: {e}")
+            return {"success": False, "results": [], "notFound": [], "message": str(e)}
 
     @staticmethod
-    async def save_bol_data(db: AsyncSession, payload: BolSaveRequest):
+    async def save_bol_data(db: AsyncSession, payload: BolSaveRequest, actor: Optional[str] = None):
         try:
             # Transaction handled by caller presumably, or managed here?
             # In FastAPI, db session dependency handles transaction commit if we don't raise exception?
             # Actually, standard dependency is usually autocommit=False. We should commit explicitly.
             
             # 1. Get Order ID
-            order_res = await db.execute(
-                text("SELECT id FROM orders WHERE order_number = :key"),
-                {"key": payload.poSkuKey}
-            )
-            order = order_res.fetchone()
+            order = await OrderRepository.find_by_order_number(db, payload.poSkuKey)
             
             if not order:
                 raise Exception(f"Order not found: {payload.poSkuKey}")
             
             order_id = order.id
+            new_status = _target_status(payload, order.status)
+            if new_status != order.status and not can_transition(order.status, new_status):
+                raise Exception(f"Invalid status transition for '{payload.poSkuKey}': {order.status} -> {new_status}")
+            fees = [clean_fee(b.shippingFee) for b in payload.bols if b.bolNumber]
+            if None in fees:
+                # BolItem validation rejects these already; never let them reach the NUMERIC column
+                raise Exception(f"Invalid shipping fee for '{payload.poSkuKey}'")
             
-            # 2. Delete existing shipments
-            await db.execute(
-                text("DELETE FROM shipments WHERE order_id = :oid"),
-                {"oid": order_id}
-            )
-            
-            # 3. Insert new shipments
-            if payload.bols:
-                for b in payload.bols:
-                    if b.bolNumber:
-                        # Prepare items JSON
-                        items_json = json.dumps([{"qty": b.shippedQty}])
-                        # Parse date
-                        shipped_at = datetime.strptime(payload.actShipDate, "%Y-%m-%d")
-                        
-                        await db.execute(
-                            text("""
-                                INSERT INTO shipments (order_id, tracking_number, shipped_at, items) 
-                                VALUES (:oid, :track, :date, :items)
-                            """),
-                            {
-                                "oid": order_id,
-                                "track": b.bolNumber,
-                                "date": shipped_at,
-                                "items": items_json  # asyncpg handles casting if param style is correct
-                            }
-                        )
+            # 2. Delete existing shipments (RETURNING gives the audit "before" snapshot for free)
+            deleted = await ShipmentRepository.delete_by_order_id(db, order_id)
+            before = _audit_snapshot(order.status, deleted)
             
-            # 4. Update Order Status
-            new_status = 'SHIPPED' if payload.isFulfilled else 'CONFIRMED'
+            # 3. Insert new shipments (one statement for all BOLs)
+            new_bols = [b for b in payload.bols if b.bolNumber]
+            if new_bols:
+                shipped_at = datetime.strptime(payload.actShipDate, "%Y-%m-%d")
+                sku = sku_from_key(payload.poSkuKey)
+                await ShipmentRepository.insert_many(db, [
+                    {
+                        "order_id": order_id,
+                        "tracking_number": b.bolNumber,
+                        "shipped_at": shipped_at,
+                        "sku": sku,
+                        "qty": b.shippedQty,
+                        "fee": fee,
+                        "signed": b.signed
+                    }
+                    for b, fee in zip(new_bols, fees)
+                ])
             
-            await db.execute(
-                text("UPDATE orders SET status = :status, updated_at = NOW() WHERE id = :oid"),
-                {"status": new_status, "oid": order_id}
-            )
+            # 4. Update Order Status (validated + recorded in order_status_history)
+            if new_status != order.status:
+                changed = await OrderStatusService.apply_transition(
+                    db, [payload.poSkuKey], new_status, source="bol_save"
+                )
+                if not changed:
+                    raise Exception(f"Status of '{payload.poSkuKey}' changed concurrently, please retry")
+            else:
+                await OrderRepository.touch(db, order_id)
             
             await db.commit()
-            return {"success": True, "message": f"Successfully saved for '{payload.poSkuKey}'."}
 
         except Exception as e:
             await db.rollback()
             logger.error(f"Error in save_bol_data: {e}")
             return {"success": False, "message": str(e)}
+
+        # Committed: from here on nothing may turn the save into a failure (the client would retry it)
+        # Drop the cached copy; readers from now on must not join a pre-write query
+        order_changed(payload.poSkuKey)
+        try:
+            # 5. Audit trail (queued, written in the background; never waits)
+            audit_writer.record(
+                order_id, payload.poSkuKey, "save", before,
+                {
+                    "status": new_status,
+                    "actShipDate": payload.actShipDate,
+                    "bols": [
+                        {"bolNumber": b.bolNumber, "shippedQty": b.shippedQty, "shippingFee": b.shippingFee, "signed": b.signed}
+                        for b in payload.bols if b.bolNumber
+                    ]
+                },
+                actor=actor
+            )
+
+            # 6. Push delta to /api/bol/stream subscribers
+            order_events.publish_local(
+                payload.poSkuKey,
+                new_status,
+                order.created_at.isoformat() if order.created_at else ""
+            )
+        except Exception as e:
+            logger.error(f"Error in save_bol_data after commit for '{payload.poSkuKey}': {e}")
+        return {"success": True, "message": f"Successfully saved for '{payload.poSkuKey}'."}
@@ -0,0 +1,276 @@
+"""
+import_validation.py
+====================
+Data-quality checks for the BOL_DB import, run inside the streaming import
+instead of printing a warning per bad row.
+
+Row-local checks and column profiling (inspect_row / ColumnProfile) run where
+chunks are cleaned, i.e. in the job process pool. ImportValidator folds the
+per-chunk results together and adds the checks that need state across chunks
+(duplicates, per-key status, outliers). It keeps per-rule counters and a fixed
+size reservoir sample of offending rows, so the final JSON/HTML report costs
+no second pass over the data.
+"""
+
+from array import array
+from html import escape
+from typing import Dict, List, Optional, Tuple
+import random
+import re
+
+RULES = {
+    "missing_key": "No PO_SKU_Key; row not imported",
+    "bad_qty": "Shipped Qty is not a number",
+    "zero_qty": "Shipped Qty is 0 or negative; no shipment created",
+    "missing_date": "No Act. Ship Date; no shipment created",
+    "bad_date": "Act. Ship Date could not be parsed; no shipment created",
+    "bad_fee": "Shipping Fee is not a number",
+    "duplicate_bol": "BOL # repeated for the same PO_SKU_Key; only the first row is imported",
+    "inconsistent_status": "Rows of one PO_SKU_Key disagree on Status (Fulfilled vs not)",
+    "qty_outlier": "Shipped Qty outside the IQR fences",
+    "fee_outlier": "Shipping Fee outside the IQR fences",
+}
+
+SAMPLE_SIZE = 20
+# Tukey fences: [Q1 - k*IQR, Q3 + k*IQR]
+OUTLIER_IQR_FACTOR = 3.0
+
+_INT = re.compile(r"^-?\d+$")
+_DECIMAL = re.compile(r"^-?(\d{1,3}(,\d{3})+|\d*)(\.\d+)?$")
+_MONEY = re.compile(r"^-?\$\s?-?[\d,]*(\.\d+)?$")
+_DATE = re.compile(r"^\d{1,4}[-/]\d{1,2}[-/]\d{1,4}")
+_BOOL = {"true", "false", "yes", "no"}
+
+
+def parse_number(value: str) -> Optional[float]:
+    """'$1,200.50' -> 1200.5; None when empty or not a number."""
+    cleaned = value.replace("$", "").replace(",", "").strip()
+    if not cleaned:
+        return None
+    try:
+        return float(cleaned)
+    except ValueError:
+        return None
+
+
+def value_type(value: str) -> str:
+    if not value:
+        return "empty"
+    if _INT.match(value):
+        return "int"
+    if _DECIMAL.match(value):
+        return "decimal"
+    if _MONEY.match(value):
+        return "money"
+    if _DATE.match(value):
+        return "date"
+    if value.lower() in _BOOL:
+        return "bool"
+    return "text"
+
+
+def inspect_row(qty_raw: str, date_raw: str, fee_raw: str, qty: int, shipped_at) -> Tuple[List[str], Optional[float]]:
+    """Row-local rule violations for a keyed row, plus the parsed fee (None if blank/invalid)."""
+    rules = []
+    if qty_raw and parse_number(qty_raw) is None:
+        rules.append("bad_qty")
+    elif qty <= 0:
+        rules.append("zero_qty")
+    if not date_raw:
+        if qty > 0:
+            rules.append("missing_date")
+    elif shipped_at is None:
+        rules.append("bad_date")
+    fee = parse_number(fee_raw) if fee_raw else None
+    if fee_raw and fee is None:
+        rules.append("bad_fee")
+    return rules, fee
+
+
+class ColumnProfile:
+    """Per-column value-type counts and max length; mergeable across chunks."""
+
+    def __init__(self, width: int):
+        self.types: List[Dict[str, int]] = [{} for _ in range(width)]
+        self.max_length = [0] * width
+
+    def observe(self, raw: List[str]):
+        for i, value in enumerate(raw):
+            kind = value_type(value)
+            counts = self.types[i]
+            counts[kind] = counts.get(kind, 0) + 1
+            if len(value) > self.max_length[i]:
+                self.max_length[i] = len(value)
+
+    def to_dict(self) -> dict:
+        return {"types": self.types, "maxLength": self.max_length}
+
+    def merge(self, other: dict):
+        for i, counts in enumerate(other["types"]):
+            mine = self.types[i]
+            for kind, n in counts.items():
+                mine[kind] = mine.get(kind, 0) + n
+            self.max_length[i] = max(self.max_length[i], other["maxLength"][i])
+
+
+class Reservoir:
+    """Uniform sample of up to `size` items from a stream (Algorithm R)."""
+
+    def __init__(self, size: int, rng: random.Random):
+        self.size = size
+        self.rng = rng
+        self.seen = 0
+        self.items = []
+
+    def add(self, item):
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(item)
+        else:
+            j = self.rng.randrange(self.seen)
+            if j < self.size:
+                self.items[j] = item
+
+
+class ImportValidator:
+    """
+    Accumulates the data-quality report for one import.
+    `columns` are the raw column names; chunks come from bol_import_service.clean_rows.
+    """
+
+    def __init__(self, columns: List[str], sample_size: int = SAMPLE_SIZE, seed: int = 0):
+        self.columns = columns
+        self.key_index = columns.index("po_sku_key")
+        self.bol_index = columns.index("bol_number")
+        self.status_index = columns.index("status")
+        self.rng = random.Random(seed)
+        self.sample_size = sample_size
+        self.counts = {rule: 0 for rule in RULES}
+        self.samples = {rule: Reservoir(sample_size, self.rng) for rule in RULES}
+        self.profile = ColumnProfile(len(columns))
+        self.rows_checked = 0
+
+        self._pairs = set()
+        self._key_fulfilled: Dict[str, bool] = {}
+        self._inconsistent_keys = set()
+        # Row numbers and values for the outlier pass at the end
+        self._qty_rows, self._qty = array("l"), array("d")
+        self._fee_rows, self._fee = array("l"), array("d")
+        self._report: Optional[dict] = None
+
+    def _flag(self, rule: str, row_no: int, raw: List[str]):
+        self.counts[rule] += 1
+        self.samples[rule].add({"row": row_no, **dict(zip(self.columns, raw))})
+
+    def observe(self, cleaned: dict):
+        """Fold in one cleaned chunk: {"records", "issues", "profile", "fees", ...}."""
+        self.profile.merge(cleaned["profile"])
+        self.rows_checked += len(cleaned["records"]) + cleaned["skipped"]
+        for rule, row_no, raw in cleaned["issues"]:
+            self._flag(rule, row_no, raw)
+
+        width = len(self.columns)
+        for record, fee in zip(cleaned["records"], cleaned["fees"]):
+            row_no = record[0]
+            raw = list(record[1:1 + width])
+            key, bol = raw[self.key_index], raw[self.bol_index]
+
+            if (key, bol) in self._pairs:
+                self._flag("duplicate_bol", row_no, raw)
+            else:
+                self._pairs.add((key, bol))
+
+            fulfilled = raw[self.status_index].lower() == "fulfilled"
+            first = self._key_fulfilled.setdefault(key, fulfilled)
+            if first != fulfilled and key not in self._inconsistent_keys:
+                self._inconsistent_keys.add(key)
+                self._flag("inconsistent_status", row_no, raw)
+
+            qty = record[1 + width]
+            if qty > 0:
+                self._qty_rows.append(row_no)
+                self._qty.append(qty)
+            if fee is not None:
+                self._fee_rows.append(row_no)
+                self._fee.append(fee)
+
+    def _outliers(self, rule: str, rows: array, values: array) -> Optional[dict]:
+        if len(values) < 4:
+            return None
+        ordered = sorted(values)
+        q1 = ordered[len(ordered) // 4]
+        q3 = ordered[(len(ordered) * 3) // 4]
+        iqr = q3 - q1
+        if iqr <= 0:
+            return {"low": q1, "high": q3, "q1": q1, "q3": q3}
+        low, high = q1 - OUTLIER_IQR_FACTOR * iqr, q3 + OUTLIER_IQR_FACTOR * iqr
+        for row_no, value in zip(rows, values):
+            if value < low or value > high:
+                self.counts[rule] += 1
+                self.samples[rule].add({"row": row_no, "value": value})
+        return {"low": low, "high": high, "q1": q1, "q3": q3}
+
+    def report(self) -> dict:
+        """Finish the outlier rules and build the report (computed once)."""
+        if self._report is not None:
+            return self._report
+        bounds = {
+            "qty": self._outliers("qty_outlier", self._qty_rows, self._qty),
+            "fee": self._outliers("fee_outlier", self._fee_rows, self._fee),
+        }
+        self._report = {
+            "rowsChecked": self.rows_checked,
+            "rowsWithIssues": sum(self.counts.values()),
+            "rules": {
+                rule: {
+                    "description": description,
+                    "count": self.counts[rule],
+                    "samples": sorted(self.samples[rule].items, key=lambda s: s["row"])
+                }
+                for rule, description in RULES.items()
+            },
+            "outlierBounds": bounds,
+            "profile": {
+                column: {"types": self.profile.types[i], "maxLength": self.profile.max_length[i]}
+                for i, column in enumerate(self.columns)
+            }
+        }
+        return self._report
+
+
+def render_report_html(report: dict, title: str = "BOL import data quality") -> str:
+    """Standalone HTML page for a report produced by ImportValidator.report()."""
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>",
+        f"<title>{escape(title)}</title>",
+        "<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin:1em 0}"
+        "td,th{border:1px solid #ccc;padding:4px 8px;text-align:left;font-size:13px}"
+        "th{background:#f3f3f3}.zero{color:#999}</style></head><body>",
+        f"<h1>{escape(title)}</h1>",
+        f"<p>{report['rowsChecked']:,} rows checked, {report['rowsWithIssues']:,} issues.</p>",
+        "<h2>Rules</h2><table><tr><th>Rule</th><th>Count</th><th>Description</th></tr>",
+    ]
+    for rule, info in report["rules"].items():
+        css = " class='zero'" if not info["count"] else ""
+        parts.append(
+            f"<tr{css}><td>{escape(rule)}</td><td>{info['count']:,}</td><td>{escape(info['description'])}</td></tr>"
+        )
+    parts.append("</table>")
+
+    for rule, info in report["rules"].items():
+        if not info["samples"]:
+            continue
+        headers = list(info["samples"][0])
+        parts.append(f"<h3>{escape(rule)} (sample of {len(info['samples'])})</h3><table><tr>")
+        parts.extend(f"<th>{escape(h)}</th>" for h in headers)
+        parts.append("</tr>")
+        for sample in info["samples"]:
+            parts.append("<tr>" + "".join(f"<td>{escape(str(sample.get(h, '')))}</td>" for h in headers) + "</tr>")
+        parts.append("</table>")
+
+    parts.append("<h2>Column profile</h2><table><tr><th>Column</th><th>Max length</th><th>Value types</th></tr>")
+    for column, info in report["profile"].items():
+        types = ", ".join(f"{k}: {v:,}" for k, v in sorted(info["types"].items(), key=lambda kv: -kv[1]))
+        parts.append(f"<tr><td>{escape(column)}</td><td>{info['maxLength']}</td><td>{escape(types)}</td></tr>")
+    parts.append("</table></body></html>")
+    return "".join(parts)
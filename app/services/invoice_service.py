@@ -0,0 +1,187 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from app.repositories import InvoiceRepository
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Customer grouping key: name from the linked order (estimate), else UNASSIGNED
+CUSTOMER_EXPR = "COALESCE(o.customer_info->>'name', 'UNASSIGNED')"
+
+# Unpaid invoices with days past due (NULL due_date counts as current).
+# Filters on status so idx_invoices_status_due_date applies.
+OPEN_INVOICES_SQL = f"""
+    SELECT {CUSTOMER_EXPR} AS customer,
+           i.balance,
+           CURRENT_DATE - i.due_date AS days_past_due
+    FROM invoices i
+    LEFT JOIN orders o ON o.id = i.estimate_id
+    WHERE i.status IN ('OPEN', 'OVERDUE')
+"""
+
+# Aging buckets: current / 1-30 / 31-60 / 61-90 / 90+
+AGING_COLUMNS_SQL = """
+    COUNT(*) AS invoice_count,
+    COALESCE(SUM(balance), 0) AS balance,
+    COALESCE(SUM(balance) FILTER (WHERE days_past_due IS NULL OR days_past_due <= 0), 0) AS current_balance,
+    COALESCE(SUM(balance) FILTER (WHERE days_past_due BETWEEN 1 AND 30), 0) AS days_1_30,
+    COALESCE(SUM(balance) FILTER (WHERE days_past_due BETWEEN 31 AND 60), 0) AS days_31_60,
+    COALESCE(SUM(balance) FILTER (WHERE days_past_due BETWEEN 61 AND 90), 0) AS days_61_90,
+    COALESCE(SUM(balance) FILTER (WHERE days_past_due > 90), 0) AS days_90_plus,
+    COUNT(*) FILTER (WHERE days_past_due > 0) AS overdue_count
+"""
+
+SUMMARY_COLUMNS = [
+    "invoice_count", "balance", "current_balance", "days_1_30",
+    "days_31_60", "days_61_90", "days_90_plus", "overdue_count"
+]
+
+# Live: per-customer rows plus the grand total in one grouped query
+LIVE_AGING_SQL = f"""
+    WITH open_invoices AS ({OPEN_INVOICES_SQL})
+    SELECT customer, GROUPING(customer) = 1 AS is_total, CURRENT_DATE AS as_of,
+           {AGING_COLUMNS_SQL}
+    FROM open_invoices
+    GROUP BY GROUPING SETS ((customer), ())
+    ORDER BY is_total DESC, balance DESC
+"""
+
+# Customers whose summary rows must be recomputed, marked by the invoice / order triggers
+# (015_invoice_aging_dirty.sql); taken (deleted) by the refresh that recomputes them
+TAKE_DIRTY_CUSTOMERS_SQL = "DELETE FROM invoice_aging_dirty RETURNING customer"
+
+# Summary: same shape, read from invoice_aging_summary
+SUMMARY_AGING_SQL = f"""
+    SELECT s.customer, GROUPING(s.customer) = 1 AS is_total, r.as_of_date AS as_of,
+           {", ".join(f"SUM(s.{c}) AS {c}" for c in SUMMARY_COLUMNS)}
+    FROM invoice_aging_summary s
+    CROSS JOIN invoice_aging_refresh r
+    GROUP BY GROUPING SETS ((s.customer, r.as_of_date), (r.as_of_date))
+    ORDER BY is_total DESC, balance DESC
+"""
+
+
+def _aging_row(row) -> dict:
+    return {
+        "customer": row.customer if not row.is_total else "TOTAL",
+        "invoiceCount": int(row.invoice_count or 0),
+        "balance": float(row.balance or 0),
+        "current": float(row.current_balance or 0),
+        "days1to30": float(row.days_1_30 or 0),
+        "days31to60": float(row.days_31_60 or 0),
+        "days61to90": float(row.days_61_90 or 0),
+        "days90Plus": float(row.days_90_plus or 0),
+        "overdueCount": int(row.overdue_count or 0)
+    }
+
+
+class InvoiceService:
+
+    @staticmethod
+    async def get_aging_report(db: AsyncSession, live: bool = False):
+        """
+        Aging buckets and open balance per customer, plus the grand total.
+        live=False reads invoice_aging_summary (see refresh_aging_summary); live=True aggregates invoices directly.
+        """
+        try:
+            result = await db.execute(text(LIVE_AGING_SQL if live else SUMMARY_AGING_SQL))
+            rows = result.fetchall()
+
+            total = None
+            customers = []
+            as_of = None
+            for row in rows:
+                as_of = row.as_of
+                if row.is_total:
+                    total = _aging_row(row)
+                else:
+                    customers.append(_aging_row(row))
+
+            return {
+                "success": True,
+                "source": "live" if live else "summary",
+                "asOf": as_of.isoformat() if as_of else None,
+                "total": total,
+                "customers": customers
+            }
+
+        except Exception as e:
+            logger.error(f"Error in get_aging_report: {e}")
+            return {"success": False, "source": "live" if live else "summary", "message": str(e)}
+
+    @staticmethod
+    async def refresh_aging_summary(db: AsyncSession):
+        """
+        Bring invoice_aging_summary up to date.
+        Same day: only customers marked dirty by the invoice / order triggers are recomputed
+        (both the old and the new customer when an invoice or an order's customer changes).
+        New day (buckets shift) or first run: full rebuild.
+        """
+        try:
+            state = (await db.execute(text("""
+                SELECT r.refreshed_at, r.as_of_date, r.as_of_date = CURRENT_DATE AS is_today, now() AS started_at
+                FROM invoice_aging_refresh r
+                WHERE r.id = 1
+                FOR UPDATE
+            """))).fetchone()
+
+            columns = ", ".join(SUMMARY_COLUMNS)
+            insert_sql = f"""
+                INSERT INTO invoice_aging_summary (customer, {columns})
+                WITH open_invoices AS ({OPEN_INVOICES_SQL})
+                SELECT customer, {AGING_COLUMNS_SQL}
+                FROM open_invoices
+                {{where}}
+                GROUP BY customer
+            """
+
+            if state is None or state.refreshed_at is None or not state.is_today:
+                mode = "full"
+                await db.execute(text(TAKE_DIRTY_CUSTOMERS_SQL))
+                await db.execute(text("DELETE FROM invoice_aging_summary"))
+                await db.execute(text(insert_sql.format(where="")))
+                refreshed = (await db.execute(text("SELECT COUNT(*) FROM invoice_aging_summary"))).scalar()
+            else:
+                mode = "incremental"
+                # Taken before recomputing: the recompute statements then see every write that marked them
+                changed = (await db.execute(text(TAKE_DIRTY_CUSTOMERS_SQL))).scalars().all()
+                refreshed = len(changed)
+
+                if changed:
+                    await db.execute(
+                        text("DELETE FROM invoice_aging_summary WHERE customer = ANY(:customers)"),
+                        {"customers": list(changed)}
+                    )
+                    await db.execute(
+                        text(insert_sql.format(where="WHERE customer = ANY(:customers)")),
+                        {"customers": list(changed)}
+                    )
+
+            await db.execute(
+                text("""
+                    INSERT INTO invoice_aging_refresh (id, refreshed_at, as_of_date)
+                    VALUES (1, COALESCE(:started_at, now()), CURRENT_DATE)
+                    ON CONFLICT (id) DO UPDATE SET refreshed_at = EXCLUDED.refreshed_at, as_of_date = EXCLUDED.as_of_date
+                """),
+                {"started_at": state.started_at if state else None}
+            )
+            await db.commit()
+            return {"success": True, "updated": refreshed, "message": f"{mode} refresh"}
+
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error in refresh_aging_summary: {e}")
+            return {"success": False, "updated": 0, "message": str(e)}
+
+    @staticmethod
+    async def mark_overdue(db: AsyncSession):
+        """Flip OPEN invoices past due_date with a remaining balance to OVERDUE."""
+        try:
+            updated = await InvoiceRepository.mark_overdue(db)
+            await db.commit()
+            return {"success": True, "updated": updated}
+
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error in mark_overdue: {e}")
+            return {"success": False, "updated": 0, "message": str(e)}
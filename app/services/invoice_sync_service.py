@@ -0,0 +1,165 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories import InvoiceRepository
+from app.repositories.invoice_repository import CONTENT_FIELDS
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Iterator, Optional
+import csv
+import hashlib
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+
+
+def _money(value) -> Decimal:
+    """'$1,428.00' / 1428 / None -> Decimal (0 if unparsable)."""
+    if value is None or value == "":
+        return Decimal("0")
+    try:
+        return Decimal(str(value).replace("$", "").replace(",", "").strip()).quantize(Decimal("0.01"))
+    except InvalidOperation:
+        return Decimal("0")
+
+
+def _date(value) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(str(value).strip()[:10])
+    except ValueError:
+        return None
+
+
+def _timestamp(value) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        return None
+
+
+def load_export(path: Path) -> Iterator[dict]:
+    """
+    Yield raw invoice records from an accounting export.
+    JSON: a list, {"Invoice": [...]} or {"QueryResponse": {"Invoice": [...]}}. CSV: one row per invoice.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            yield from csv.DictReader(f)
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("QueryResponse", data).get("Invoice", [])
+    yield from data
+
+
+def normalize(record: dict, today: date) -> Optional[dict]:
+    """Map a QBO-style or CSV record onto invoice columns; None if it has no invoice id."""
+    invoice_id = record.get("Id") or record.get("qbo_invoice_id")
+    if not invoice_id:
+        return None
+
+    estimate_ref = record.get("estimate_id") or None
+    for txn in record.get("LinkedTxn") or []:
+        if txn.get("TxnType") == "Estimate":
+            estimate_ref = txn.get("TxnId")
+
+    amount = _money(record.get("TotalAmt", record.get("amount")))
+    balance = _money(record.get("Balance", record.get("balance")))
+    due_date = _date(record.get("DueDate") or record.get("due_date"))
+
+    if balance <= 0:
+        status = "PAID"
+    elif due_date and due_date < today:
+        status = "OVERDUE"
+    else:
+        status = "OPEN"
+
+    row = {
+        "qbo_invoice_id": str(invoice_id),
+        "qbo_doc_number": record.get("DocNumber") or record.get("qbo_doc_number") or None,
+        "estimate_ref": estimate_ref,
+        "order_number": record.get("order_number") or None,
+        "amount": amount,
+        "balance": balance,
+        "due_date": due_date,
+        "status": status,
+    }
+    row["content_hash"] = hashlib.sha1(
+        "\x1f".join("" if row[f] is None else str(row[f]) for f in CONTENT_FIELDS).encode()
+    ).hexdigest()
+    row["source_updated_at"] = _timestamp((record.get("MetaData") or {}).get("LastUpdatedTime") or record.get("updated_at"))
+    return row
+
+
+class InvoiceSyncService:
+
+    @staticmethod
+    async def sync_file(db: AsyncSession, path: Path, batch_size: int = BATCH_SIZE, full: bool = False):
+        """
+        Upsert invoices from an export file in batches.
+        Records whose LastUpdatedTime is not newer than the newest one already applied
+        (source_updated_at, the accounting system's clock) are skipped up front (unless full=True);
+        the rest are skipped in SQL when their content hash is unchanged.
+        An id repeated in the export counts once; the extra occurrences are reported as `duplicates`.
+        """
+        started = time.perf_counter()
+        metrics = {
+            "rowsRead": 0, "inserted": 0, "updated": 0,
+            "skippedUnchanged": 0, "skippedNotModified": 0, "duplicates": 0, "invalid": 0
+        }
+        try:
+            watermark = None
+            if not full:
+                watermark = await InvoiceRepository.source_watermark(db)
+
+            today = date.today()
+            pending = {}
+
+            async def flush():
+                if not pending:
+                    return
+                batch = list(pending.values())
+                pending.clear()
+                inserted, updated = await InvoiceRepository.upsert_many(db, batch)
+                metrics["inserted"] += inserted
+                metrics["updated"] += updated
+                metrics["skippedUnchanged"] += len(batch) - inserted - updated
+
+            for record in load_export(path):
+                metrics["rowsRead"] += 1
+                row = normalize(record, today)
+                if row is None:
+                    metrics["invalid"] += 1
+                    continue
+                updated_at = row["source_updated_at"]
+                if watermark and updated_at and updated_at.tzinfo and updated_at <= watermark:
+                    metrics["skippedNotModified"] += 1
+                    continue
+                # Last occurrence wins; one id may appear only once per INSERT ... ON CONFLICT
+                if row["qbo_invoice_id"] in pending:
+                    metrics["duplicates"] += 1
+                pending[row["qbo_invoice_id"]] = row
+                if len(pending) >= batch_size:
+                    await flush()
+            await flush()
+
+            await db.commit()
+            elapsed = time.perf_counter() - started
+            metrics["seconds"] = round(elapsed, 3)
+            metrics["rowsPerSec"] = round(metrics["rowsRead"] / elapsed, 1) if elapsed > 0 else 0.0
+            return {"success": True, "metrics": metrics}
+
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error in sync_file: {e}")
+            return {"success": False, "metrics": metrics, "message": str(e)}
@@ -0,0 +1,353 @@
+"""
+job_service.py
+==============
+In-app background jobs (currently: BOL CSV import).
+
+Job state lives in the `jobs` table so any instance can answer GET /api/jobs/{id}.
+Work runs in this process as asyncio tasks behind a semaphore (JOB_MAX_CONCURRENCY);
+CPU-heavy parse/clean stages go to a small process pool so they never block the
+event loop serving API requests. Job DB work runs on its own small engine
+(database.get_job_sessionmaker), never on the pool API requests are admitted against.
+Cancellation sets `cancel_requested`; the running job sees it at its next progress
+update (or immediately, via task.cancel(), when it runs on the instance that received
+the request) and rolls back.
+
+Every job a runner holds, queued behind the semaphore or running, gets a heartbeat
+every JOB_HEARTBEAT_SECONDS. At startup, jobs without a heartbeat for JOB_STALE_SECONDS
+(their runner's process died) are marked FAILED.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional
+import asyncio
+import json
+import logging
+import os
+import uuid
+
+from app.services.bol_import_service import BolImportService
+
+logger = logging.getLogger(__name__)
+
+# Jobs running at once on this instance
+JOB_MAX_CONCURRENCY = int(os.getenv("JOB_MAX_CONCURRENCY", "2"))
+# QUEUED + RUNNING jobs allowed across all instances; further submissions are rejected
+JOB_MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", "10"))
+JOB_PROCESS_WORKERS = int(os.getenv("JOB_PROCESS_WORKERS", "1"))
+# Active jobs without a heartbeat for this long are considered abandoned
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "300"))
+# How often a runner refreshes heartbeat_at of the jobs it holds (well below JOB_STALE_SECONDS)
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", str(max(1, JOB_STALE_SECONDS // 5))))
+
+CREATE_JOB_SQL = text("""
+    INSERT INTO jobs (kind, params)
+    SELECT :kind, CAST(:params AS jsonb)
+    WHERE (SELECT COUNT(*) FROM jobs WHERE status IN ('QUEUED', 'RUNNING')) < :max_pending
+    RETURNING id
+""")
+
+GET_JOB_SQL = text("""
+    SELECT id, kind, status, params, progress, result, error, cancel_requested,
+           created_at, started_at, finished_at
+    FROM jobs
+    WHERE id = :id
+""")
+
+START_JOB_SQL = text("""
+    UPDATE jobs SET status = 'RUNNING', started_at = NOW(), heartbeat_at = NOW()
+    WHERE id = :id AND status = 'QUEUED' AND NOT cancel_requested
+    RETURNING id
+""")
+
+PROGRESS_SQL = text("""
+    UPDATE jobs SET progress = CAST(:progress AS jsonb), heartbeat_at = NOW()
+    WHERE id = :id
+    RETURNING cancel_requested
+""")
+
+FINISH_JOB_SQL = text("""
+    UPDATE jobs
+    SET status = :status, result = CAST(:result AS jsonb), error = :error, finished_at = NOW()
+    WHERE id = :id AND status IN ('QUEUED', 'RUNNING')
+""")
+
+HEARTBEAT_SQL = text("""
+    UPDATE jobs SET heartbeat_at = NOW()
+    WHERE id = ANY(CAST(:ids AS uuid[])) AND status IN ('QUEUED', 'RUNNING')
+""")
+
+CANCEL_JOB_SQL = text("""
+    UPDATE jobs
+    SET cancel_requested = TRUE,
+        status = CASE WHEN status = 'QUEUED' THEN 'CANCELLED' ELSE status END,
+        finished_at = CASE WHEN status = 'QUEUED' THEN NOW() ELSE finished_at END
+    WHERE id = :id AND status IN ('QUEUED', 'RUNNING')
+    RETURNING status
+""")
+
+RECOVER_STALE_SQL = text("""
+    UPDATE jobs
+    SET status = 'FAILED', error = 'abandoned (no heartbeat)', finished_at = NOW()
+    WHERE status IN ('QUEUED', 'RUNNING')
+      AND COALESCE(heartbeat_at, created_at) < NOW() - make_interval(secs => :stale_seconds)
+""")
+
+
+class JobCancelled(asyncio.CancelledError):
+    """Raised from a progress update once cancellation was requested; unwinds like task.cancel()."""
+
+
+ProgressReporter = Callable[[dict], Awaitable[None]]
+
+
+async def _run_bol_import(runner: "JobRunner", upload_path: str, params: dict, report: ProgressReporter) -> dict:
+    from app.database import get_job_sessionmaker
+
+    async def on_progress(metrics: dict):
+        await report({"stage": "loading", **metrics})
+
+    await report({"stage": "loading"})
+    async with get_job_sessionmaker()() as db:
+        result = await BolImportService.import_csv(
+            db,
+            Path(upload_path),
+            keep_raw=params.get("keepRaw", False),
+            full=params.get("full", False),
+            run_cpu=runner.run_cpu,
+            on_progress=on_progress
+        )
+    if not result["success"]:
+        raise RuntimeError(result.get("message"))
+    return {**result["metrics"], "report": result["report"]}
+
+
+JOB_HANDLERS: Dict[str, Callable] = {
+    "bol_import": _run_bol_import,
+}
+
+
+class JobRunner:
+    """Runs jobs as asyncio tasks with a concurrency cap; CPU stages go to a process pool."""
+
+    def __init__(self):
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> int:
+        return len(self._tasks)
+
+    async def run_cpu(self, fn, *args):
+        """Run a picklable, CPU-bound function in the job process pool."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=JOB_PROCESS_WORKERS)
+        return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+
+    def submit(self, job_id: str, kind: str, upload_path: str, params: dict):
+        """Schedule a job. The runner owns `upload_path` from here on and deletes it when the job ends."""
+        if self._semaphore is None:
+            raise RuntimeError("Job runner not started")
+        task = asyncio.create_task(self._run(job_id, kind, upload_path, params))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    def cancel(self, job_id: str) -> bool:
+        task = self._tasks.get(job_id)
+        if task is None:
+            return False
+        task.cancel()
+        return True
+
+    async def _execute(self, sql, params: dict):
+        from app.database import get_job_sessionmaker
+
+        async with get_job_sessionmaker()() as db:
+            result = await db.execute(sql, params)
+            row = result.fetchone() if result.returns_rows else None
+            await db.commit()
+            return row
+
+    async def _finish(self, job_id: str, status: str, result: Optional[dict] = None, error: Optional[str] = None):
+        try:
+            await asyncio.shield(self._execute(FINISH_JOB_SQL, {
+                "id": job_id,
+                "status": status,
+                "result": json.dumps(result) if result is not None else None,
+                "error": error
+            }))
+        except Exception as e:
+            logger.error(f"❌ Could not record {status} for job {job_id}: {e}")
+
+    async def _run(self, job_id: str, kind: str, upload_path: str, params: dict):
+        handler = JOB_HANDLERS[kind]
+
+        async def report(progress: dict):
+            row = await self._execute(PROGRESS_SQL, {"id": job_id, "progress": json.dumps(progress)})
+            if row is not None and row.cancel_requested:
+                raise JobCancelled()
+            # Let API requests in between batches
+            await asyncio.sleep(0)
+
+        try:
+            async with self._semaphore:
+                if await self._execute(START_JOB_SQL, {"id": job_id}) is None:
+                    return  # cancelled while queued
+                logger.info(f"▶️ Job {job_id} ({kind}) started")
+                result = await handler(self, upload_path, params, report)
+            await self._finish(job_id, "SUCCEEDED", result=result)
+            logger.info(f"✅ Job {job_id} ({kind}) finished: {result}")
+        except (JobCancelled, asyncio.CancelledError):
+            await self._finish(job_id, "CANCELLED")
+            logger.info(f"⏹️ Job {job_id} ({kind}) cancelled")
+        except Exception as e:
+            await self._finish(job_id, "FAILED", error=str(e))
+            logger.error(f"Error in job {job_id} ({kind}): {e}")
+        finally:
+            Path(upload_path).unlink(missing_ok=True)
+
+    async def _recover_stale(self):
+        try:
+            await self._execute(RECOVER_STALE_SQL, {"stale_seconds": JOB_STALE_SECONDS})
+        except Exception as e:
+            logger.error(f"Error in _recover_stale: {e}")
+
+    async def _heartbeat(self):
+        """Keep this runner's jobs (queued or running) from looking abandoned to other instances."""
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+            if not self._tasks:
+                continue
+            try:
+                await self._execute(HEARTBEAT_SQL, {"ids": list(self._tasks)})
+            except Exception as e:
+                logger.error(f"Error in _heartbeat: {e}")
+
+    def start(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(JOB_MAX_CONCURRENCY)
+            asyncio.create_task(self._recover_stale())
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+
+    async def stop(self):
+        """Cancel running jobs (their transactions roll back) and shut the process pool down."""
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._semaphore = None
+
+
+job_runner = JobRunner()
+
+
+def _job_row(row) -> dict:
+    return {
+        "id": str(row.id),
+        "kind": row.kind,
+        "status": row.status,
+        "params": row.params or {},
+        "progress": row.progress or {},
+        "result": row.result,
+        "error": row.error,
+        "cancelRequested": row.cancel_requested,
+        "createdAt": row.created_at.isoformat(),
+        "startedAt": row.started_at.isoformat() if row.started_at else None,
+        "finishedAt": row.finished_at.isoformat() if row.finished_at else None
+    }
+
+
+class JobService:
+
+    @staticmethod
+    async def create_import_job(
+        db: AsyncSession,
+        upload_path: str,
+        filename: Optional[str] = None,
+        keep_raw: bool = False,
+        full: bool = False
+    ):
+        """
+        Record a bol_import job for an uploaded CSV and hand it to the runner.
+        Rejected when JOB_MAX_PENDING jobs are active; the upload is deleted in that case.
+        """
+        try:
+            params = {"filename": filename, "bytes": Path(upload_path).stat().st_size, "keepRaw": keep_raw, "full": full}
+            job_id = (await db.execute(CREATE_JOB_SQL, {
+                "kind": "bol_import",
+                "params": json.dumps(params),
+                "max_pending": JOB_MAX_PENDING
+            })).scalar()
+            await db.commit()
+            if job_id is None:
+                Path(upload_path).unlink(missing_ok=True)
+                return {"success": False, "busy": True, "message": f"Too many active jobs (limit {JOB_MAX_PENDING})"}
+
+            job_id = str(job_id)
+            job_runner.submit(job_id, "bol_import", upload_path, params)
+            return {"success": True, "jobId": job_id, "status": "QUEUED"}
+
+        except Exception as e:
+            await db.rollback()
+            Path(upload_path).unlink(missing_ok=True)
+            logger.error(f"Error in create_import_job: {e}")
+            return {"success": False, "message": str(e)}
+
+    @staticmethod
+    async def get_job(db: AsyncSession, job_id: str):
+        try:
+            uuid.UUID(job_id)
+        except ValueError:
+            return {"success": False, "message": f"Job '{job_id}' not found"}
+        try:
+            row = (await db.execute(GET_JOB_SQL, {"id": job_id})).fetchone()
+            if row is None:
+                return {"success": False, "message": f"Job '{job_id}' not found"}
+            return {"success": True, "job": _job_row(row)}
+
+        except Exception as e:
+            logger.error(f"Error in get_job: {e}")
+            return {"success": False, "message": str(e)}
+
+    @staticmethod
+    async def get_report(db: AsyncSession, job_id: str):
+        """Data-quality report of a finished import job."""
+        result = await JobService.get_job(db, job_id)
+        if not result.get("success"):
+            return result
+        job = result["job"]
+        report = (job["result"] or {}).get("report")
+        if report is None:
+            return {"success": False, "message": f"Job '{job_id}' has no report (status {job['status']})"}
+        return {"success": True, "jobId": job_id, "report": report}
+
+    @staticmethod
+    async def cancel_job(db: AsyncSession, job_id: str):
+        """Request cancellation. Queued jobs are cancelled at once; running ones stop at their next batch."""
+        try:
+            uuid.UUID(job_id)
+        except ValueError:
+            return {"success": False, "message": f"Job '{job_id}' not found or already finished"}
+        try:
+            status = (await db.execute(CANCEL_JOB_SQL, {"id": job_id})).scalar()
+            await db.commit()
+            if status is None:
+                return {"success": False, "message": f"Job '{job_id}' not found or already finished"}
+            job_runner.cancel(job_id)
+            return {"success": True, "jobId": job_id, "status": status}
+
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error in cancel_job: {e}")
+            return {"success": False, "message": str(e)}
@@ -0,0 +1,155 @@
+"""
+order_events.py
+===============
+In-process fan-out of order status deltas ({key, status, timestamp}) to
+GET /api/bol/stream subscribers.
+
+Sources (BOL_EVENTS_SOURCE):
+- "local"    (default) save_bol_data publishes after commit. Single instance only.
+- "postgres" One LISTEN connection per instance on the `order_status` channel,
+             fed by the trigger in db/migrations/003_order_status_notify.sql.
+             Sees writes from every instance and script. The same connection
+             keeps the per-order BOL cache (bol_cache) coherent across instances.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from itertools import count
+from typing import Optional, Set
+
+from app.services.bol_cache import CACHE_CHANNEL, order_changed, orders_changed
+
+logger = logging.getLogger(__name__)
+
+EVENTS_SOURCE = os.getenv("BOL_EVENTS_SOURCE", "local")
+NOTIFY_CHANNEL = "order_status"
+
+# Per-subscriber buffer; a subscriber that falls this far behind is disconnected
+SUBSCRIBER_QUEUE_SIZE = int(os.getenv("BOL_STREAM_QUEUE_SIZE", "256"))
+
+_CLOSE = object()
+
+
+class OrderEventHub:
+    """Broadcasts pre-encoded SSE frames to all subscriber queues."""
+
+    def __init__(self):
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._ids = count(1)
+        self._listener_task: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def _close(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(_CLOSE)
+
+    def publish(self, key: str, status: str, timestamp: Optional[str]):
+        """Encode the delta once and hand the same bytes to every subscriber."""
+        if not self._subscribers:
+            return
+        payload = json.dumps({"key": key, "status": status, "timestamp": timestamp or ""})
+        frame = f"id: {next(self._ids)}\nevent: status\ndata: {payload}\n\n".encode()
+
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                # Too slow: drop it so the client reconnects and reloads initial-data
+                self._close(queue)
+
+    def publish_local(self, key: str, status: str, timestamp: Optional[str]):
+        """Publish from the service layer; ignored when Postgres NOTIFY is the source."""
+        if EVENTS_SOURCE == "local":
+            self.publish(key, status, timestamp)
+
+    async def stream(self, queue: asyncio.Queue, heartbeat: float = 15.0):
+        """Yield SSE frames for one subscriber, with keep-alive comments for proxies."""
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                if frame is _CLOSE:
+                    return
+                yield frame
+        finally:
+            self.unsubscribe(queue)
+
+    # --- Postgres LISTEN source ---
+
+    def _on_notify(self, connection, pid, channel, payload):
+        try:
+            data = json.loads(payload)
+            order_changed(data["key"])
+            self.publish(data["key"], data["status"], data.get("timestamp"))
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Ignoring malformed {NOTIFY_CHANNEL} payload: {e}")
+
+    def _on_cache_notify(self, connection, pid, channel, payload):
+        orders_changed()
+
+    async def _listen(self):
+        from app.database import get_engine
+
+        backoff = 1
+        while True:
+            try:
+                async with get_engine().connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    driver_conn = raw.driver_connection
+                    await driver_conn.add_listener(NOTIFY_CHANNEL, self._on_notify)
+                    await driver_conn.add_listener(CACHE_CHANNEL, self._on_cache_notify)
+                    # Changes missed while disconnected
+                    orders_changed()
+                    logger.info(f"✅ Listening on '{NOTIFY_CHANNEL}' for order status changes")
+                    backoff = 1
+                    try:
+                        while not driver_conn.is_closed():
+                            await asyncio.sleep(5)
+                    finally:
+                        if not driver_conn.is_closed():
+                            await driver_conn.remove_listener(NOTIFY_CHANNEL, self._on_notify)
+                            await driver_conn.remove_listener(CACHE_CHANNEL, self._on_cache_notify)
+                logger.warning(f"'{NOTIFY_CHANNEL}' listener connection closed, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ '{NOTIFY_CHANNEL}' listener failed: {e}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+    def start(self):
+        if EVENTS_SOURCE == "postgres" and self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+        for queue in list(self._subscribers):
+            self._close(queue)
+
+
+order_events = OrderEventHub()
@@ -0,0 +1,101 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from typing import Dict, FrozenSet, List
+from app.services.bol_cache import order_changed
+import logging
+
+logger = logging.getLogger(__name__)
+
+ORDER_STATUSES = ['DRAFT', 'CONFIRMED', 'ALLOCATING', 'PARTIALLY_SHIPPED', 'SHIPPED', 'COMPLETED', 'CANCELLED']
+
+# from_status -> statuses it may move to (order_status_enum)
+TRANSITIONS: Dict[str, FrozenSet[str]] = {
+    # BOL tool may record shipments against an order that was never confirmed
+    'DRAFT': frozenset({'CONFIRMED', 'PARTIALLY_SHIPPED', 'SHIPPED', 'CANCELLED'}),
+    'CONFIRMED': frozenset({'ALLOCATING', 'PARTIALLY_SHIPPED', 'SHIPPED', 'CANCELLED'}),
+    'ALLOCATING': frozenset({'CONFIRMED', 'PARTIALLY_SHIPPED', 'SHIPPED', 'CANCELLED'}),
+    'PARTIALLY_SHIPPED': frozenset({'CONFIRMED', 'SHIPPED', 'CANCELLED'}),
+    # BOL tool can un-fulfil an order (isFulfilled=false) or drop BOLs
+    'SHIPPED': frozenset({'CONFIRMED', 'PARTIALLY_SHIPPED', 'COMPLETED'}),
+    'COMPLETED': frozenset(),
+    'CANCELLED': frozenset(),
+}
+
+# to_status -> statuses allowed to move into it
+ALLOWED_FROM: Dict[str, List[str]] = {
+    to: [frm for frm in ORDER_STATUSES if to in TRANSITIONS[frm]] for to in ORDER_STATUSES
+}
+
+# Conditional bulk update + history rows in one statement.
+# Rows not in an allowed from-status are left untouched and not returned.
+TRANSITION_SQL = text("""
+    WITH prev AS (
+        SELECT id, status AS from_status
+        FROM orders
+        WHERE order_number = ANY(:keys)
+          AND status = ANY(CAST(:allowed_from AS order_status_enum[]))
+        FOR UPDATE
+    ),
+    changed AS (
+        UPDATE orders o
+        SET status = CAST(:to_status AS order_status_enum), updated_at = NOW()
+        FROM prev
+        WHERE o.id = prev.id
+        RETURNING o.id, o.order_number, prev.from_status, o.status AS to_status, o.updated_at
+    ),
+    history AS (
+        INSERT INTO order_status_history (order_id, from_status, to_status, source, changed_at)
+        SELECT id, from_status, to_status, :source, updated_at FROM changed
+    )
+    SELECT order_number, from_status, to_status FROM changed
+""")
+
+
+def can_transition(from_status: str, to_status: str) -> bool:
+    return to_status in TRANSITIONS.get(from_status, frozenset())
+
+
+class OrderStatusService:
+
+    @staticmethod
+    async def apply_transition(db: AsyncSession, keys: List[str], to_status: str, source: str = "api") -> List[dict]:
+        """
+        Move orders (by order_number) to `to_status` where the transition table allows it.
+        Runs inside the caller's transaction (no commit). Returns the rows actually changed.
+        """
+        if to_status not in TRANSITIONS:
+            raise ValueError(f"Unknown order status: {to_status}")
+        if not keys or not ALLOWED_FROM[to_status]:
+            return []
+
+        result = await db.execute(TRANSITION_SQL, {
+            "keys": list(keys),
+            "allowed_from": ALLOWED_FROM[to_status],
+            "to_status": to_status,
+            "source": source
+        })
+        return [
+            {"key": row.order_number, "fromStatus": row.from_status, "toStatus": row.to_status}
+            for row in result
+        ]
+
+    @staticmethod
+    async def transition(db: AsyncSession, keys: List[str], to_status: str, source: str = "api"):
+        """Bulk transition in its own transaction."""
+        try:
+            changed = await OrderStatusService.apply_transition(db, keys, to_status, source)
+            await db.commit()
+            for c in changed:
+                order_changed(c["key"])
+
+            changed_keys = {c["key"] for c in changed}
+            return {
+                "success": True,
+                "changed": changed,
+                "skipped": [k for k in dict.fromkeys(keys) if k not in changed_keys]
+            }
+
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error in transition: {e}")
+            return {"success": False, "changed": [], "skipped": [], "message": str(e)}
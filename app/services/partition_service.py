@@ -0,0 +1,136 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from datetime import date
+from typing import List, Optional
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SCHEMA = "archive"
+PARTITION_NAME = re.compile(r"^shipments_p(\d{4})_(\d{2})$")
+
+LIST_PARTITIONS_SQL = text("""
+    SELECT c.relname AS name
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = to_regclass(:parent)
+    ORDER BY c.relname
+""")
+
+# shipment_items is partitioned by the same months (012_shipment_items.sql); detached together
+ITEMS_PARENT = "shipment_items"
+
+# Detaching fires no DELETE triggers, so the analytics rollup (011_shipment_rollup.sql) is cleared
+# for detached months here; partitions and rollup days are both UTC. Locking the refresh row first
+# makes a concurrent refresh_shipment_rollup wait instead of deadlocking with the detach.
+ROLLUP_EXISTS_SQL = text("SELECT to_regclass('shipment_daily_rollup') IS NOT NULL")
+LOCK_ROLLUP_SQL = text("SELECT 1 FROM shipment_rollup_refresh WHERE id = 1 FOR UPDATE")
+DELETE_ROLLUP_SQL = text("DELETE FROM shipment_daily_rollup WHERE day >= :start AND day < :end")
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partition_month(name: str):
+    match = PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+class PartitionService:
+
+    @staticmethod
+    async def list_partitions(db: AsyncSession, parent: str = "shipments") -> List[str]:
+        result = await db.execute(LIST_PARTITIONS_SQL, {"parent": parent})
+        return [row.name for row in result]
+
+    @staticmethod
+    async def maintain(
+        db: AsyncSession,
+        months_ahead: int = 3,
+        retain_months: int = 36,
+        archive: bool = True,
+        drop: bool = False,
+        dry_run: bool = False,
+        today: Optional[date] = None
+    ):
+        """
+        Create monthly shipments partitions `months_ahead` into the future and detach those
+        entirely older than `retain_months`. Detached partitions are moved to the `archive`
+        schema (archive=True), dropped (drop=True) or left as standalone tables.
+        The matching shipment_items partitions are created and detached alongside, and the
+        rollup rows of detached months are deleted in the same transaction.
+        """
+        try:
+            this_month = (today or date.today()).replace(day=1)
+            cutoff = _add_months(this_month, -retain_months)
+            created, detached = [], []
+            rollup_rows = 0
+
+            existing = set(await PartitionService.list_partitions(db))
+            existing_items = set(await PartitionService.list_partitions(db, ITEMS_PARENT))
+            expired = [name for name in sorted(existing)
+                       if _partition_month(name) is not None and _partition_month(name) < cutoff]
+            # Before any partition DDL: the refresh takes this lock before it reads shipments
+            has_rollup = bool(expired) and (await db.execute(ROLLUP_EXISTS_SQL)).scalar()
+            if has_rollup and not dry_run:
+                await db.execute(LOCK_ROLLUP_SQL)
+
+            for offset in range(months_ahead + 1):
+                month = _add_months(this_month, offset)
+                name = f"shipments_p{month:%Y_%m}"
+                items_name = f"{ITEMS_PARENT}_p{month:%Y_%m}"
+                # existing_items is empty until 012_shipment_items.sql is applied
+                missing = [n for n in (name,) if n not in existing]
+                if existing_items and items_name not in existing_items:
+                    missing.append(items_name)
+                if missing:
+                    if not dry_run:
+                        await db.execute(text("SELECT ensure_shipment_partition(:month)"), {"month": month})
+                    created.extend(missing)
+
+            for name in expired:
+                month = _partition_month(name)
+                items_name = f"{ITEMS_PARENT}_p{month:%Y_%m}"
+                pairs = [("shipments", name)]
+                if items_name in existing_items:
+                    pairs.append((ITEMS_PARENT, items_name))
+                if not dry_run:
+                    for parent, partition in pairs:
+                        await db.execute(text(f'ALTER TABLE {parent} DETACH PARTITION "{partition}"'))
+                        if drop:
+                            await db.execute(text(f'DROP TABLE "{partition}"'))
+                        elif archive:
+                            await db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+                            await db.execute(text(f'ALTER TABLE "{partition}" SET SCHEMA {ARCHIVE_SCHEMA}'))
+                    if has_rollup:
+                        deleted = await db.execute(DELETE_ROLLUP_SQL, {"start": month, "end": _add_months(month, 1)})
+                        rollup_rows += deleted.rowcount
+                detached.extend(partition for _, partition in pairs)
+
+            # Rows here block creating the matching monthly partition later
+            default_rows = 0
+            if "shipments_default" in existing:
+                default_rows = (await db.execute(text("SELECT COUNT(*) FROM shipments_default"))).scalar()
+                if default_rows:
+                    logger.warning(f"shipments_default holds {default_rows} rows outside the monthly partitions")
+
+            if dry_run:
+                await db.rollback()
+            else:
+                await db.commit()
+            return {
+                "success": True,
+                "created": created,
+                "detached": detached,
+                "rollupRowsDeleted": rollup_rows,
+                "defaultRows": default_rows,
+                "dryRun": dry_run
+            }
+
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error in maintain: {e}")
+            return {"success": False, "created": [], "detached": [], "rollupRowsDeleted": 0, "message": str(e)}
@@ -0,0 +1,121 @@
+"""
+single_flight.py
+================
+Request coalescing for identical concurrent reads.
+
+While a read for a key (endpoint + parameters) is in flight, further callers
+with the same key wait for that call and share its result instead of running
+their own queries. Nothing is kept after the call finishes, so this is not a
+cache: a caller never sees data older than the query it joined.
+
+Writes call forget() after commit, so readers arriving after a write start a
+fresh call rather than joining one that may have read pre-write data.
+"""
+
+from typing import Awaitable, Callable, Dict, Hashable
+import asyncio
+
+
+class _LeaderGone(Exception):
+    """The caller running the shared call was cancelled; followers retry."""
+
+
+class SingleFlight:
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        # Per endpoint (first element of the key): [calls, executions]
+        self._counts: Dict[str, list] = {}
+
+    def _count(self, key: Hashable, executed: bool):
+        counts = self._counts.setdefault(str(key[0] if isinstance(key, tuple) else key), [0, 0])
+        counts[0] += 1
+        counts[1] += executed
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        """Run fn() once for all concurrent callers with the same key."""
+        while True:
+            shared = self._calls.get(key)
+            if shared is None:
+                break
+            self._count(key, False)
+            try:
+                return await asyncio.shield(shared)
+            except _LeaderGone:
+                continue
+
+        # Leader: runs the call in its own request (and DB session)
+        shared = asyncio.get_running_loop().create_future()
+        self._calls[key] = shared
+        self._count(key, True)
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            shared.set_exception(_LeaderGone())
+            raise
+        except BaseException as e:
+            shared.set_exception(e)
+            raise
+        else:
+            shared.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is shared:
+                del self._calls[key]
+            # Retrieve the exception so an un-joined call does not log "never retrieved"
+            if shared.done():
+                shared.exception()
+
+    def forget(self, *keys: Hashable):
+        """Stop coalescing onto the in-flight calls for `keys` (after a write to them)."""
+        for key in keys:
+            self._calls.pop(key, None)
+
+    def forget_all(self):
+        """After a bulk write (e.g. a BOL import)."""
+        self._calls.clear()
+
+    def snapshot(self) -> dict:
+        endpoints = {}
+        for endpoint, (calls, executions) in self._counts.items():
+            endpoints[endpoint] = {
+                "calls": calls,
+                "executions": executions,
+                "coalesced": calls - executions,
+                "coalescingRatio": round((calls - executions) / calls, 4) if calls else 0.0
+            }
+        calls = sum(c for c, _ in self._counts.values())
+        executions = sum(e for _, e in self._counts.values())
+        return {
+            "inFlight": len(self._calls),
+            "calls": calls,
+            "executions": executions,
+            "coalescingRatio": round((calls - executions) / calls, 4) if calls else 0.0,
+            "endpoints": endpoints
+        }
+
+
+# Keys include the database a call reads from (database.session_route): a request routed
+# to the primary after its own write must not join a call running on a lagging replica.
+DB_ROUTES = ("primary", "replica")
+
+
+def initial_data_key(columnar: bool, route: str) -> tuple:
+    return ("initial-data", columnar, route)
+
+
+def existing_data_key(po_sku_key: str, route: str) -> tuple:
+    return ("existing", po_sku_key, route)
+
+
+# Coalesces the hot BOL reads (GET /api/bol/initial-data and GET /api/bol/{po_sku_key})
+bol_reads = SingleFlight()
+
+
+def forget_order(po_sku_key: str):
+    """After a write to an order: its detail and the initial-data lists must be re-read."""
+    bol_reads.forget(*(
+        key
+        for route in DB_ROUTES
+        for key in (initial_data_key(False, route), initial_data_key(True, route), existing_data_key(po_sku_key, route))
+    ))
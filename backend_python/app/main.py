@@ -1,40 +0,0 @@
-"""
-main.py
-=======
-FastAPI Application Entrypoint.
-"""
-
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from app.routers import bol
-
-# Initialize FastAPI app
-app = FastAPI(
-    title="HSUS Order Status API",
-    description="Backend API for BOL (Bill of Lading) management",
-    version="2.0.0"
-)
-
-# CORS Middleware (allow all origins for development)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include routers
-app.include_router(bol.router, prefix="/api")
-
-
-@app.get("/")
-async def root():
-    """Health check endpoint."""
-    return {"status": "ok", "message": "HSUS Order Status API v2.0"}
-
-
-@app.get("/health")
-async def health():
-    """Health check for Cloud Run."""
-    return {"status": "healthy"}
@@ -19,7 +19,8 @@ SCRIPT_DIR = Path(__file__).resolve().parent
 BACKEND_DIR = SCRIPT_DIR.parent
 ROOT_DIR = BACKEND_DIR.parent
 
-sys.path.insert(0, str(BACKEND_DIR))
+# Import the service package (app/) from the project root
+sys.path.insert(0, str(ROOT_DIR))
 
 from dotenv import load_dotenv
 ROOT_ENV = ROOT_DIR / ".env"
@@ -31,7 +32,7 @@ load_dotenv(ROOT_ENV, override=True)
 # ============================================================
 
 from sqlalchemy import text
-from app.database import engine
+from app.database import get_engine
 
 # ============================================================
 # CSV TO TABLE COLUMN MAPPING
@@ -211,7 +212,7 @@ async def main():
     records = read_csv_data(csv_path)
     
     # Create table and insert data
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         await create_table(conn)
         await insert_data(conn, records)
     
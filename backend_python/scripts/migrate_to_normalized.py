@@ -19,8 +19,8 @@ SCRIPT_DIR = Path(__file__).resolve().parent
 BACKEND_DIR = SCRIPT_DIR.parent
 ROOT_DIR = BACKEND_DIR.parent
 
-# Add backend_python to path so we can import 'app'
-sys.path.insert(0, str(BACKEND_DIR))
+# Import the service package (app/) from the project root
+sys.path.insert(0, str(ROOT_DIR))
 
 # Force load .env from project root
 from dotenv import load_dotenv
@@ -70,7 +70,7 @@ from datetime import datetime
 from typing import Optional
 
 from sqlalchemy import text
-from app.database import engine
+from app.database import get_engine
 
 # ============================================================
 # HELPER FUNCTIONS: Data Cleaning
@@ -178,7 +178,7 @@ async def migrate_data():
     print("🚀 Starting Migration: bol_db → orders + shipments")
     print("=" * 60 + "\n")
     
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         # ========================================
         # STEP 1: EXTRACT
         # ========================================
@@ -0,0 +1,146 @@
+"""
+test_admission.py
+=================
+Checks for app/admission.py (no database needed).
+
+- classify(): CORS preflights and exempt paths are not limited, bulk routes go to
+  the bulk lane, other reads to the read lane, everything else to the write lane
+- lane limits: reads keep the write reserve free, bulk reads stop at their cap
+- priority: a freed slot goes to a waiting write before an earlier read
+- shedding: a full lane queue is shed at once, a waiter is shed at the queue
+  timeout, both with Retry-After >= 1; a cancelled waiter leaves the queue
+
+Run from project root: python backend_python/scripts/test_admission.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Ensure we can import 'app' (the service package at the project root)
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from app.admission import AdmissionController, Overloaded
+
+
+def controller(capacity=4, write_reserve=1, bulk_limit=1, queue_factor=1, queue_timeout=0.2) -> AdmissionController:
+    return AdmissionController(capacity, write_reserve, bulk_limit, queue_factor=queue_factor, queue_timeout=queue_timeout)
+
+
+async def try_acquire(ctl: AdmissionController, lane: str):
+    """None when admitted, else the Overloaded it was shed with."""
+    try:
+        await ctl.acquire(lane)
+    except Overloaded as e:
+        return e
+    return None
+
+
+def report(name: str, problems: list) -> bool:
+    if problems:
+        print(f"❌ {name}: {len(problems)} mismatch(es)")
+        for problem in problems[:10]:
+            print(f"   - {problem}")
+        return False
+    print(f"✅ {name}")
+    return True
+
+
+async def run_tests() -> bool:
+    print("\n🚀 Starting admission control checks...\n")
+    passed = True
+
+    print("=== TEST 1: classify ===")
+    expected = {
+        ("OPTIONS", "/api/bol/save"): None,
+        ("GET", "/health"): None,
+        ("GET", "/api/bol/stream"): None,
+        ("POST", "/api/jobs/import"): None,
+        ("GET", "/api/bol/initial-data"): "bulk",
+        ("POST", "/api/bol/existing"): "bulk",
+        ("GET", "/api/bol/PO1|A"): "read",
+        ("HEAD", "/api/bol/PO1|A"): "read",
+        ("POST", "/api/bol/save"): "write",
+        ("DELETE", "/api/orders/1"): "write",
+    }
+    problems = [f"{method} {path}: {AdmissionController.classify(method, path)!r}, expected {lane!r}"
+                for (method, path), lane in expected.items() if AdmissionController.classify(method, path) != lane]
+    passed &= report(f"{len(expected)} requests classified", problems)
+
+    print("\n=== TEST 2: lane limits ===")
+    ctl = controller(capacity=4, write_reserve=1, bulk_limit=1, queue_timeout=0.05)
+    problems = []
+    if await try_acquire(ctl, "bulk") is not None:
+        problems.append("first bulk read not admitted")
+    if await try_acquire(ctl, "bulk") is None:
+        problems.append("second bulk read admitted past ADMISSION_BULK_LIMIT=1")
+    for i in range(2):
+        if await try_acquire(ctl, "read") is not None:
+            problems.append(f"read {i + 1} not admitted")
+    if await try_acquire(ctl, "read") is None:
+        problems.append("read admitted into the write reserve")
+    if await try_acquire(ctl, "write") is not None:
+        problems.append("write not admitted into its reserve")
+    if ctl.in_flight != 4:
+        problems.append(f"in_flight {ctl.in_flight} != 4")
+    passed &= report("bulk capped, reads leave the write reserve free, writes use it", problems)
+
+    print("\n=== TEST 3: writes are dequeued before earlier reads ===")
+    ctl = controller(capacity=2, write_reserve=0, bulk_limit=1, queue_factor=2, queue_timeout=1)
+    await ctl.acquire("read")
+    await ctl.acquire("write")
+    order = []
+
+    async def waiter(lane):
+        await ctl.acquire(lane)
+        order.append(lane)
+
+    read_waiter = asyncio.create_task(waiter("read"))
+    await asyncio.sleep(0)
+    write_waiter = asyncio.create_task(waiter("write"))
+    await asyncio.sleep(0)
+    ctl.release("read")
+    await asyncio.sleep(0.01)
+    problems = [] if order == ["write"] else [f"admitted after one release: {order}, expected ['write']"]
+    ctl.release("write")
+    await asyncio.wait_for(asyncio.gather(read_waiter, write_waiter), 1)
+    if order != ["write", "read"]:
+        problems.append(f"admission order {order}, expected ['write', 'read']")
+    passed &= report("queued write admitted first, then the earlier read", problems)
+
+    print("\n=== TEST 4: shedding ===")
+    ctl = controller(capacity=1, write_reserve=0, bulk_limit=1, queue_factor=1, queue_timeout=0.05)
+    await ctl.acquire("read")
+    queued = asyncio.create_task(try_acquire(ctl, "read"))
+    await asyncio.sleep(0)
+    problems = []
+    full = await try_acquire(ctl, "read")
+    if not isinstance(full, Overloaded) or full.retry_after < 1:
+        problems.append(f"full queue: {full!r}, expected Overloaded with retry_after >= 1")
+    timed_out = await queued
+    if not isinstance(timed_out, Overloaded) or timed_out.retry_after < 1:
+        problems.append(f"queue timeout: {timed_out!r}, expected Overloaded with retry_after >= 1")
+    lane = ctl.lanes["read"]
+    if (lane.shed, lane.timed_out, len(lane.waiters)) != (2, 1, 0):
+        problems.append(f"shed={lane.shed} timed_out={lane.timed_out} waiters={len(lane.waiters)}, expected 2/1/0")
+    passed &= report("full queue shed at once, waiter shed at the timeout", problems)
+
+    cancelled = asyncio.create_task(ctl.acquire("read"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.gather(cancelled, return_exceptions=True)
+    ctl.release("read")
+    problems = []
+    if len(lane.waiters) or ctl.in_flight:
+        problems.append(f"waiters={len(lane.waiters)} in_flight={ctl.in_flight} after cancel + release")
+    if await try_acquire(ctl, "read") is not None:
+        problems.append("slot not reusable after a cancelled waiter")
+    passed &= report("cancelled waiter leaves the queue and takes no slot", problems)
+    return passed
+
+
+if __name__ == "__main__":
+    ok = asyncio.run(run_tests())
+    print("\n🎉 All checks passed" if ok else "\n❌ Some checks failed")
+    sys.exit(0 if ok else 1)
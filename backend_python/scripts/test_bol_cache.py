@@ -0,0 +1,128 @@
+"""
+test_bol_cache.py
+=================
+Checks for app/services/bol_cache.py (no database needed).
+
+- put() stores only with a reservation that is still valid: invalidate() and
+  clear() drop reservations, so a read that started before a write never fills the cache
+- eviction is bounded by bytes as well as entries (least recently used first);
+  a single value larger than the byte budget is rejected
+- entries expire after the TTL; a zero-sized cache stores nothing
+- the cache is on only when invalidations reach every worker (shared_invalidation)
+
+Run from project root: python backend_python/scripts/test_bol_cache.py
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+# Ensure we can import 'app' (the service package at the project root)
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from app.services.bol_cache import LruTtlCache, shared_invalidation
+
+
+def fill(cache: LruTtlCache, key, value, size=None):
+    cache.put(key, value, cache.reserve(key), size=size)
+
+
+def report(name: str, problems: list) -> bool:
+    if problems:
+        print(f"❌ {name}: {len(problems)} mismatch(es)")
+        for problem in problems[:10]:
+            print(f"   - {problem}")
+        return False
+    print(f"✅ {name}")
+    return True
+
+
+def run_tests() -> bool:
+    print("\n🚀 Starting BOL cache checks...\n")
+    passed = True
+
+    print("=== TEST 1: reservations ===")
+    cache = LruTtlCache(max_entries=10, max_bytes=10_000, ttl_seconds=60)
+    problems = []
+    token = cache.reserve("PO1|A")
+    cache.invalidate("PO1|A")  # a save committed while the read was in flight
+    cache.put("PO1|A", {"bols": ["old"]}, token)
+    if cache.get("PO1|A") is not None:
+        problems.append("pre-write read cached after invalidate()")
+    token = cache.reserve("PO2|B")
+    cache.clear()  # a BOL import
+    cache.put("PO2|B", {"bols": ["old"]}, token)
+    if cache.get("PO2|B") is not None:
+        problems.append("pre-import read cached after clear()")
+    stale, fresh = cache.reserve("PO3|C"), cache.reserve("PO3|C")
+    cache.put("PO3|C", {"bols": ["stale"]}, stale)
+    cache.put("PO3|C", {"bols": ["fresh"]}, fresh)
+    if cache.get("PO3|C") != {"bols": ["fresh"]}:
+        problems.append(f"superseded reservation stored: {cache.get('PO3|C')}")
+    fill(cache, "PO4|D", {"bols": []})
+    if cache.get("PO4|D") != {"bols": []}:
+        problems.append("valid reservation not stored")
+    passed &= report("only still-valid reservations fill the cache", problems)
+
+    print("\n=== TEST 2: byte-bound eviction ===")
+    cache = LruTtlCache(max_entries=100, max_bytes=300, ttl_seconds=60)
+    problems = []
+    for key in ("a", "b", "c"):
+        fill(cache, key, key, size=100)
+    cache.get("a")  # a becomes most recently used
+    fill(cache, "d", "d", size=100)
+    if cache.get("b") is not None or any(cache.get(k) is None for k in ("a", "c", "d")):
+        problems.append("least recently used entry not the one evicted")
+    if cache.bytes != 300 or cache.evictions != 1:
+        problems.append(f"bytes={cache.bytes} evictions={cache.evictions}, expected 300/1")
+    fill(cache, "huge", "x", size=301)
+    if cache.get("huge") is not None or cache.rejected != 1 or cache.bytes != 300:
+        problems.append(f"oversized value: rejected={cache.rejected} bytes={cache.bytes}")
+    fill(cache, "c", "c", size=250)  # replacing an entry frees its old size first
+    if cache.bytes > 300 or cache.get("c") != "c":
+        problems.append(f"replaced entry: bytes={cache.bytes}")
+    fill(cache, "json", {"bols": [{"bolNumber": "3130"}]})
+    if cache.snapshot()["bytes"] > 300:
+        problems.append("JSON-sized entry pushed the cache over max_bytes")
+    cache.invalidate("json")
+    cache.invalidate("c")
+    if cache.bytes != sum(size for _, size, _ in cache._entries.values()):
+        problems.append(f"bytes {cache.bytes} out of sync with entries")
+    passed &= report("evicts LRU by bytes, rejects values over the budget", problems)
+
+    print("\n=== TEST 3: TTL and disabled cache ===")
+    cache = LruTtlCache(max_entries=10, max_bytes=10_000, ttl_seconds=60)
+    fill(cache, "PO1|A", {"bols": []})
+    problems = []
+    with mock.patch("app.services.bol_cache.time.monotonic", return_value=time.monotonic() + 61):
+        if cache.get("PO1|A") is not None or cache.expirations != 1:
+            problems.append("entry served after its TTL")
+    disabled = LruTtlCache(max_entries=0, max_bytes=10_000, ttl_seconds=60)
+    fill(disabled, "PO1|A", {"bols": []})
+    if disabled.enabled or disabled.get("PO1|A") is not None:
+        problems.append("zero-sized cache stored an entry")
+    passed &= report("expired entries dropped, disabled cache stores nothing", problems)
+
+    print("\n=== TEST 4: enabled only with shared invalidation ===")
+    expected = [
+        ({"BOL_EVENTS_SOURCE": "local", "WEB_CONCURRENCY": "1", "MAX_INSTANCES": "1"}, True),
+        ({"BOL_EVENTS_SOURCE": "local", "WEB_CONCURRENCY": "4", "MAX_INSTANCES": "1"}, False),
+        ({"BOL_EVENTS_SOURCE": "local", "WEB_CONCURRENCY": "1", "MAX_INSTANCES": "3"}, False),
+        ({"BOL_EVENTS_SOURCE": "postgres", "WEB_CONCURRENCY": "4", "MAX_INSTANCES": "3"}, True),
+    ]
+    problems = []
+    for env, enabled in expected:
+        with mock.patch.dict(os.environ, env):
+            if shared_invalidation() != enabled:
+                problems.append(f"{env}: {shared_invalidation()}, expected {enabled}")
+    passed &= report("local events: single worker and instance only", problems)
+    return passed
+
+
+if __name__ == "__main__":
+    ok = run_tests()
+    print("\n🎉 All checks passed" if ok else "\n❌ Some checks failed")
+    sys.exit(0 if ok else 1)
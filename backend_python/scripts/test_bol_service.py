@@ -1,65 +1,179 @@
+"""
+test_bol_service.py
+===================
+Integration checks for app/services/bol_service.py (the single BOL service)
+against the database in .env, mimicking 01_Test_BolService.ts.
+
+Besides the save round-trip, checks that the two response shapes agree:
+- GAS shape (GET /api/bol/{key}, initial-data) vs OrderRead shape
+  (GET /api/bol/orders, /api/bol/detail/{key}) for the same orders
+- single vs batch reads (POST /api/bol/existing), objects vs columnar initial-data
+- shipment_items quantities vs the shipments.items JSONB they replaced
+- a BOL save on a COMPLETED order keeps it COMPLETED
+
+Run from project root: python backend_python/scripts/test_bol_service.py [orders_to_compare]
+"""
+
 import asyncio
 import sys
-import os
+from pathlib import Path
 
-# Ensure we can import 'app'
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Ensure we can import 'app' (the service package at the project root)
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
 
-from app.database import get_db
+from app.database import get_db, dispose_engine
+from app.services.bol_cache import existing_bol_cache
 from app.services.bol_service import BolService
+from app.services.order_status_service import OrderStatusService
 from app.schemas.bol import BolSaveRequest, BolItem
 
-async def run_tests():
-    print("\n🚀 Starting Python Migration Tests (mimicking 01_Test_BolService.ts)...\n")
-    
-    # Manually get a session since we are not in FastAPI context
+FULFILLED_STATUSES = {"SHIPPED", "COMPLETED"}
+TEST_KEY = "PO-TEST-001"  # must exist (e.g. from the Node.js tests)
+
+
+def jsonb_qty(items) -> int:
+    """Quantity the way the old ORM service read shipments.items ({"qty"} or [{"qty"}])."""
+    if isinstance(items, dict):
+        return int(items.get("qty", 0))
+    if isinstance(items, list):
+        return sum(int(i.get("qty", 0)) for i in items if isinstance(i, dict))
+    return 0
+
+
+def existing_vs_detail(existing: dict, order: dict) -> list:
+    """Differences between the GAS-shaped and OrderRead-shaped view of one order."""
+    problems = []
+    if existing["isFulfilled"] != (order["status"] in FULFILLED_STATUSES):
+        problems.append(f"isFulfilled={existing['isFulfilled']} but status={order['status']}")
+
+    gas = sorted((b["bolNumber"], b["shippedQty"]) for b in existing["bols"])
+    rich = sorted((s["tracking_number"] or "", jsonb_qty(s["items"])) for s in order["shipments"])
+    if gas != rich:
+        problems.append(f"bols {gas} != shipments {rich}")
+
+    dates = {s["shipped_at"].date().isoformat() for s in order["shipments"] if s["shipped_at"]}
+    if (existing["actShipDate"] is None) != (not dates) or (dates and existing["actShipDate"] not in dates):
+        problems.append(f"actShipDate {existing['actShipDate']} not in {sorted(dates)}")
+    return problems
+
+
+def comparable(existing: dict) -> dict:
+    """GET /api/bol/{key} payload without row-order effects (shipments come back unordered)."""
+    return {
+        "success": existing["success"],
+        "isFulfilled": existing["isFulfilled"],
+        "hasShipDate": existing["actShipDate"] is not None,
+        "bols": sorted(existing["bols"], key=lambda b: (b["bolNumber"], b["shippedQty"]))
+    }
+
+
+def report(name: str, problems: list) -> bool:
+    if problems:
+        print(f"❌ {name}: {len(problems)} mismatch(es)")
+        for problem in problems[:10]:
+            print(f"   - {problem}")
+        return False
+    print(f"✅ {name}")
+    return True
+
+
+async def run_tests(n_orders: int) -> bool:
+    print("\n🚀 Starting BOL service checks (mimicking 01_Test_BolService.ts)...\n")
+    passed = True
+
     async for db in get_db():
-        
-        # === TEST 1: getInitialBolData ===
+
+        # === TEST 1: getInitialBolData (objects vs columnar) ===
         print("=== TEST 1: getInitialBolData ===")
-        try:
-            initial_data = await BolService.get_initial_bol_data(db)
-            print(f"✅ Success. Result: {initial_data['success']}")
-            # print(initial_data) # Verbose
-        except Exception as e:
-            print(f"❌ Test 1 Failed: {e}")
-
-        # === TEST 3: saveBolData ===
-        print("\n=== TEST 3: saveBolData (Transaction) ===")
-        test_key = "PO-TEST-001" 
-        # Note: Must align with existing data in DB or insert it first ideally.
-        # Assuming PO-TEST-001 exists from previous Node.js tests
-        
+        objects = await BolService.get_initial_bol_data(db)
+        columnar = await BolService.get_initial_bol_data(db, columnar=True)
+        problems = [] if objects["success"] and columnar["success"] else [objects.get("message") or columnar.get("message")]
+        if not problems:
+            if [o["key"] for o in objects["pendingList"]] != columnar["pending"]["keys"]:
+                problems.append("pending keys differ between objects and columnar")
+            if [o["key"] for o in objects["fulfilledList"]] != columnar["fulfilled"]["keys"]:
+                problems.append("fulfilled keys differ between objects and columnar")
+        passed &= report(f"initial-data: {len(objects.get('pendingList', []))} pending, "
+                         f"{len(objects.get('fulfilledList', []))} fulfilled, objects == columnar", problems)
+
+        # === TEST 2: GAS shape vs OrderRead shape ===
+        print("\n=== TEST 2: getExistingBolData vs getOrders / getOrderDetail ===")
+        listed = await BolService.get_orders(db, limit=n_orders)
+        problems = [] if listed["success"] else [listed["message"]]
+        orders = listed["orders"]
+        existing_bol_cache.clear()
+        for order in orders:
+            key = order["order_number"]
+            existing = await BolService.get_existing_bol_data(db, key)
+            detail = await BolService.get_order_detail(db, key)
+            if not existing["success"] or not detail["success"]:
+                problems.append(f"{key}: {existing.get('message') or detail.get('message')}")
+                continue
+            if detail["order"] != order:
+                problems.append(f"{key}: /detail differs from /orders")
+            problems.extend(f"{key}: {p}" for p in existing_vs_detail(existing, detail["order"]))
+        passed &= report(f"{len(orders)} orders: GAS shape == OrderRead shape", problems)
+
+        # === TEST 3: single vs batch reads ===
+        print("\n=== TEST 3: getExistingBolData vs getExistingBolDataMany ===")
+        keys = [o["order_number"] for o in orders] + ["NO-SUCH-ORDER|X"]
+        existing_bol_cache.clear()
+        batch = await BolService.get_existing_bol_data_many(db, keys)
+        problems = [] if batch["success"] else [batch.get("message", "batch read failed")]
+        existing_bol_cache.clear()
+        for item in batch["results"]:
+            key = item.pop("key")
+            single = await BolService.get_existing_bol_data(db, key)
+            if comparable(single) != comparable(item):
+                problems.append(f"{key}: single {single} != batch {item}")
+        passed &= report(f"{len(keys)} keys: single == batch", problems)
+
+        detail = await BolService.get_order_detail(db, "NO-SUCH-ORDER|X")
+        passed &= report("unknown key -> order None (404)", [] if detail == {"success": True, "order": None} else [detail])
+
+        # === TEST 4: saveBolData (transaction) + verify ===
+        print("\n=== TEST 4: saveBolData (Transaction) ===")
         payload = BolSaveRequest(
-            poSkuKey=test_key,
+            poSkuKey=TEST_KEY,
             actShipDate="2026-01-09",
             isFulfilled=True,
-            bols=[
-                BolItem(bolNumber="PY-TRACK-999", shippedQty=10, signed=False, shippingFee=0)
-            ]
+            bols=[BolItem(bolNumber="PY-TRACK-999", shippedQty=10, signed=True, shippingFee=128.5)]
         )
-        
-        try:
+        result = await BolService.save_bol_data(db, payload)
+        print(f"   Save Result: {result}")
+        if not result["success"]:
+            passed &= report("save", [result["message"]])
+        else:
+            verify = await BolService.get_existing_bol_data(db, TEST_KEY)
+            detail = await BolService.get_order_detail(db, TEST_KEY)
+            expected = [{"bolNumber": "PY-TRACK-999", "shippedQty": 10, "shippingFee": 128.5, "signed": True}]
+            problems = [] if verify["bols"] == expected else [f"bols {verify['bols']} != {expected}"]
+            problems.extend(existing_vs_detail(verify, detail["order"]))
+            passed &= report("saved BOL read back in both shapes", problems)
+
+            # === TEST 5: saveBolData on a COMPLETED order (BOL corrections keep COMPLETED) ===
+            print("\n=== TEST 5: saveBolData on a COMPLETED order ===")
+            await OrderStatusService.transition(db, [TEST_KEY], "COMPLETED", source="test")
+            payload.bols = [BolItem(bolNumber="PY-TRACK-999", shippedQty=12, signed=True, shippingFee=128.5)]
             result = await BolService.save_bol_data(db, payload)
-            print(f"✅ Save Result: {result}")
-            
-            # === TEST 2: getExistingBolData (Verify) ===
-            print("\n=== TEST 2: getExistingBolData (Verify) ===")
-            verify = await BolService.get_existing_bol_data(db, test_key)
-            
-            if verify['success'] and verify['bols']:
-                found = any(b['bolNumber'] == "PY-TRACK-999" for b in verify['bols'])
-                if found:
-                    print(f"🎉 Verified! Found inserted record: PY-TRACK-999")
-                else:
-                    print(f"❌ Verification Failed: Record not found. Data: {verify}")
-            else:
-                print(f"❌ Verification Failed: {verify}")
-                
-        except Exception as e:
-            print(f"❌ Test 3 Failed: {e}")
-            
-        break # One session usage
+            print(f"   Save Result: {result}")
+            detail = await BolService.get_order_detail(db, TEST_KEY)
+            problems = [] if result["success"] else [result["message"]]
+            if detail["order"]["status"] != "COMPLETED":
+                problems.append(f"status {detail['order']['status']} != COMPLETED")
+            if [s["tracking_number"] for s in detail["order"]["shipments"]] != ["PY-TRACK-999"]:
+                problems.append(f"shipments {detail['order']['shipments']}")
+            passed &= report("save on COMPLETED order keeps status COMPLETED", problems)
+
+        break  # One session usage
+
+    await dispose_engine()
+    return passed
+
 
 if __name__ == "__main__":
-    asyncio.run(run_tests())
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    ok = asyncio.run(run_tests(limit))
+    print("\n🎉 All checks passed" if ok else "\n❌ Some checks failed")
+    sys.exit(0 if ok else 1)
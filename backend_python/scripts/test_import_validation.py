@@ -0,0 +1,135 @@
+"""
+test_import_validation.py
+=========================
+Checks for app/services/import_validation.py (no database needed), fed by the
+import's own chunk cleaner (bol_import_service.clean_rows).
+
+- row rules: missing key, bad/zero qty, missing/bad date, bad fee
+- duplicate_bol: a (PO_SKU_Key, BOL #) pair repeated, also across chunks;
+  the same BOL # under another key is not a duplicate
+- inconsistent_status: flagged once per key, on the first disagreeing row,
+  whatever the case of "Fulfilled"
+- outliers: Tukey fences [Q1 - 3*IQR, Q3 + 3*IQR] (values on a fence are kept),
+  no outliers when IQR is 0, no bounds with fewer than 4 values
+
+Run from project root: python backend_python/scripts/test_import_validation.py
+"""
+
+import sys
+from pathlib import Path
+
+# Ensure we can import 'app' (the service package at the project root)
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from app.services.bol_import_service import COLUMN_MAPPING, RAW_COLUMNS, clean_rows
+from app.services.import_validation import OUTLIER_IQR_FACTOR, ImportValidator
+
+HEADER = list(COLUMN_MAPPING)
+
+
+def row(bol, key, qty="1", fee="10", date="2025-03-01", status="Fulfilled"):
+    # BOL #, PO_SKU_Key, Shipped Qty, Shipping Fee, Act. Ship Date, Signed BOL, Status, TimeStamp
+    return [bol, key, qty, fee, date, "TRUE", status, ""]
+
+
+def validate(*chunks) -> dict:
+    """Report for chunks of rows, cleaned and folded the way the import does."""
+    validator = ImportValidator(RAW_COLUMNS)
+    first_row_no = 1
+    for rows in chunks:
+        validator.observe(clean_rows(first_row_no, HEADER, rows))
+        first_row_no += len(rows)
+    return validator.report()
+
+
+def flagged(result: dict, rule: str) -> list:
+    return [sample["row"] for sample in result["rules"][rule]["samples"]]
+
+
+def expect(result: dict, expected: dict) -> list:
+    """Problems where rule counts / flagged rows differ from {rule: [row numbers]}."""
+    problems = []
+    for rule, rows in expected.items():
+        count = result["rules"][rule]["count"]
+        if count != len(rows) or flagged(result, rule) != rows:
+            problems.append(f"{rule}: count {count}, rows {flagged(result, rule)}; expected rows {rows}")
+    return problems
+
+
+def report(name: str, problems: list) -> bool:
+    if problems:
+        print(f"❌ {name}: {len(problems)} mismatch(es)")
+        for problem in problems[:10]:
+            print(f"   - {problem}")
+        return False
+    print(f"✅ {name}")
+    return True
+
+
+def run_tests() -> bool:
+    print("\n🚀 Starting import validation checks...\n")
+    passed = True
+
+    print("=== TEST 1: row rules ===")
+    result = validate([
+        row("B1", ""),                             # 1 missing_key
+        row("B2", "PO1|A", qty="abc"),             # 2 bad_qty
+        row("B3", "PO1|A", qty="0"),               # 3 zero_qty
+        row("B4", "PO1|A", date=""),               # 4 missing_date
+        row("B5", "PO1|A", date="not a date"),     # 5 bad_date
+        row("B6", "PO1|A", fee="ten"),             # 6 bad_fee
+        row("B7", "PO1|A", qty="0", date=""),      # 7 zero_qty only (no shipment, so no date needed)
+        row("B8", "PO1|A", fee="$1,200.50"),       # 8 clean
+    ])
+    problems = expect(result, {
+        "missing_key": [1], "bad_qty": [2], "zero_qty": [3, 7], "missing_date": [4], "bad_date": [5], "bad_fee": [6],
+    })
+    if result["rowsChecked"] != 8:
+        problems.append(f"rowsChecked {result['rowsChecked']} != 8")
+    passed &= report("each row-local rule flags its row", problems)
+
+    print("\n=== TEST 2: duplicate BOLs ===")
+    result = validate(
+        [row("B1", "PO1|A"), row("B1", "PO2|B"), row("B2", "PO1|A")],
+        [row("B1", "PO1|A"), row("B1", "PO1|A")],
+    )
+    passed &= report("repeats flagged across chunks, same BOL # under another key is not",
+                   expect(result, {"duplicate_bol": [4, 5]}))
+
+    print("\n=== TEST 3: inconsistent status ===")
+    result = validate(
+        [row("B1", "PO1|A", status="Fulfilled"), row("B2", "PO1|A", status="FULFILLED"),
+         row("B3", "PO1|A", status="")],
+        [row("B4", "PO1|A", status="Fulfilled"), row("B5", "PO2|B", status=""), row("B6", "PO2|B", status="")],
+    )
+    passed &= report("flagged once per key, case-insensitive",
+                   expect(result, {"inconsistent_status": [3]}))
+
+    print("\n=== TEST 4: IQR outlier fences ===")
+    # Sorted qty 3, 10, 10, 10, 12, 12, 12, 18, 19 -> Q1 = 10, Q3 = 12, fences 10 - 3*2 = 4 and 12 + 3*2 = 18
+    quantities = ["10", "3", "10", "12", "19", "10", "12", "18", "12"]
+    result = validate([row(f"B{i}", "PO1|A", qty=q, fee="25") for i, q in enumerate(quantities)] +
+                      [row("B-zero", "PO1|A", qty="0", fee="25")])
+    bounds = result["outlierBounds"]
+    problems = expect(result, {"qty_outlier": [2, 5], "fee_outlier": []})
+    expected_qty = {"low": 10 - OUTLIER_IQR_FACTOR * 2, "high": 12 + OUTLIER_IQR_FACTOR * 2, "q1": 10, "q3": 12}
+    if bounds["qty"] != expected_qty:
+        problems.append(f"qty bounds {bounds['qty']} != {expected_qty}")
+    if bounds["fee"] != {"low": 25, "high": 25, "q1": 25, "q3": 25}:
+        problems.append(f"fee bounds with IQR 0: {bounds['fee']}")
+    if [s["value"] for s in result["rules"]["qty_outlier"]["samples"]] != [3, 19]:
+        problems.append(f"qty outlier samples {result['rules']['qty_outlier']['samples']}")
+    passed &= report("outside the fences flagged, fence values kept, zero qty ignored", problems)
+
+    result = validate([row(f"B{i}", "PO1|A", qty=q) for i, q in enumerate(["1", "2", "500"])])
+    problems = [] if result["outlierBounds"] == {"qty": None, "fee": None} else [f"bounds {result['outlierBounds']}"]
+    problems += expect(result, {"qty_outlier": []})
+    passed &= report("fewer than 4 values: no fences", problems)
+    return passed
+
+
+if __name__ == "__main__":
+    ok = run_tests()
+    print("\n🎉 All checks passed" if ok else "\n❌ Some checks failed")
+    sys.exit(0 if ok else 1)
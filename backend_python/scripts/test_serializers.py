@@ -0,0 +1,222 @@
+"""
+test_serializers.py
+===================
+Wire checks for app/serializers.py (no database needed).
+
+For every pre-rendered BOL read route, the service result is rendered both by the
+precompiled adapter and by FastAPI's response_model path (what the route returned
+before the adapters), and the two JSON documents must be identical: same keys,
+same values, including nulls and defaults. Service results come from the real
+service code run against a scripted session (canned rows, or a failing database).
+
+Also checks that json_response keeps the headers and cookies dependencies set on
+the injected Response (e.g. `X-DB-Route` from app/dependencies.get_db).
+
+Run from project root: python backend_python/scripts/test_serializers.py
+"""
+
+import asyncio
+import json
+import sys
+import warnings
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+
+# Ensure we can import 'app' (the service package at the project root)
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import RootModel
+
+from app import serializers
+from app.serializers import json_response
+from app.schemas.bol import (
+    BolExistingBatchResponse,
+    BolExistingDataResponse,
+    BolHistoryResponse,
+    BolInitialDataColumnarResponse,
+    BolInitialDataResponse,
+    BolTrackingLookupResponse,
+)
+from app.schemas.order import OrderRead
+from app.services.audit_service import AuditService
+from app.services.bol_cache import existing_bol_cache
+from app.services.bol_service import BolService
+
+SHIPPED_AT = datetime(2025, 3, 1, 8, 30, tzinfo=timezone.utc)
+
+
+class OrderList(RootModel[List[OrderRead]]):
+    pass
+
+
+class _Result(list):
+    def fetchall(self):
+        return list(self)
+
+    def fetchone(self):
+        return self[0] if self else None
+
+
+class ScriptedSession:
+    """Stands in for AsyncSession: each execute() returns the next canned rows (or raises)."""
+
+    def __init__(self, *results):
+        self._results = list(results)
+
+    async def execute(self, *args, **kwargs):
+        result = self._results.pop(0) if self._results else RuntimeError("database unavailable")
+        if isinstance(result, Exception):
+            raise result
+        return _Result(result)
+
+    async def rollback(self):
+        pass
+
+
+def broken():
+    return ScriptedSession(RuntimeError("database unavailable"))
+
+
+def order_row(key, status="SHIPPED"):
+    return SimpleNamespace(id=f"id-{key}", order_number=key, status=status, created_at=SHIPPED_AT,
+                           updated_at=SHIPPED_AT)
+
+
+def shipment_row(order_id, bol, qty=4, fee="12.50", signed=True, shipped_at=SHIPPED_AT):
+    return SimpleNamespace(order_id=order_id, tracking_number=bol, shipped_at=shipped_at, qty=qty,
+                           fee=Decimal(fee), signed=signed)
+
+
+async def cases():
+    pending, shipped = order_row("PO1|A", "CONFIRMED"), order_row("PO2|B")
+    summary = [pending, shipped, order_row("PO3|C", "COMPLETED")]
+    history = [SimpleNamespace(action="save", actor=None, before={"status": "CONFIRMED", "bols": []},
+                               after='{"status": "SHIPPED"}', created_at=SHIPPED_AT)]
+    tracking = [SimpleNamespace(tracking_number="3130", order_number="PO2|B", status="SHIPPED", shipped_at=None,
+                                qty=4, fee=Decimal("0"), signed=False, carrier=None)]
+    detail = SimpleNamespace(id="00000000-0000-0000-0000-000000000001", order_number="PO2|B", source="DEALER",
+                             status="SHIPPED", customer_info='{"name": "Dealer"}', items=None,
+                             created_at=SHIPPED_AT, updated_at=None)
+    detail_shipment = SimpleNamespace(id="10000000-0000-0000-0000-000000000001", order_id=detail.id,
+                                      tracking_number=None, carrier="UPS", shipped_at=SHIPPED_AT,
+                                      items='[{"qty": 4}]', created_at=SHIPPED_AT)
+
+    fetch = BolService._fetch_existing_bol_data
+
+    async def fetch_many(db, keys):
+        existing_bol_cache.clear()
+        return await BolService.get_existing_bol_data_many(db, keys)
+
+    return [
+        ("initial-data (objects)", BolInitialDataResponse, serializers.INITIAL_DATA,
+         await BolService._fetch_initial_bol_data(ScriptedSession(summary), False)),
+        ("initial-data (objects, error)", BolInitialDataResponse, serializers.INITIAL_DATA,
+         await BolService._fetch_initial_bol_data(broken(), False)),
+        ("initial-data (columnar)", BolInitialDataColumnarResponse, serializers.INITIAL_DATA_COLUMNAR,
+         await BolService._fetch_initial_bol_data(ScriptedSession(summary), True)),
+        ("initial-data (columnar, error)", BolInitialDataColumnarResponse, serializers.INITIAL_DATA_COLUMNAR,
+         await BolService._fetch_initial_bol_data(broken(), True)),
+        ("existing-data", BolExistingDataResponse, serializers.EXISTING_DATA,
+         await fetch(ScriptedSession([shipped], [shipment_row(shipped.id, "3130"), shipment_row(shipped.id, None)]),
+                     "PO2|B")),
+        ("existing-data (unknown key)", BolExistingDataResponse, serializers.EXISTING_DATA,
+         await fetch(ScriptedSession([]), "NO|SUCH")),
+        ("existing-data (error)", BolExistingDataResponse, serializers.EXISTING_DATA,
+         await fetch(broken(), "PO2|B")),
+        ("existing (batch)", BolExistingBatchResponse, serializers.EXISTING_BATCH,
+         await fetch_many(ScriptedSession([pending, shipped], [shipment_row(shipped.id, "3130")]),
+                          ["PO1|A", "PO2|B", "NO|SUCH"])),
+        ("existing (batch, error)", BolExistingBatchResponse, serializers.EXISTING_BATCH,
+         await fetch_many(broken(), ["PO1|A"])),
+        ("by-tracking", BolTrackingLookupResponse, serializers.TRACKING_LOOKUP,
+         await BolService.get_bol_data_by_tracking(ScriptedSession(tracking), ["3130", "9999"])),
+        ("by-tracking (error)", BolTrackingLookupResponse, serializers.TRACKING_LOOKUP,
+         await BolService.get_bol_data_by_tracking(broken(), ["3130"])),
+        ("history", BolHistoryResponse, serializers.HISTORY,
+         await AuditService.get_history(ScriptedSession(history), "PO2|B")),
+        ("history (error)", BolHistoryResponse, serializers.HISTORY,
+         await AuditService.get_history(broken(), "PO2|B")),
+        ("detail", OrderRead, serializers.ORDER,
+         (await BolService.get_order_detail(ScriptedSession([detail], [detail_shipment]), "PO2|B"))["order"]),
+        ("orders", OrderList, serializers.ORDER_LIST,
+         (await BolService.get_orders(ScriptedSession([detail], [detail_shipment]), 10))["orders"]),
+    ]
+
+
+async def response_model_json(model, data):
+    """What FastAPI sent for a route declaring response_model=model that returned `data`."""
+    field = create_response_field(name=f"Response_{model.__name__}", type_=model, mode="serialization")
+    return json.loads(JSONResponse(await serialize_response(field=field, response_content=data)).body)
+
+
+def differences(expected, actual, path="$") -> list:
+    """Paths where two JSON documents differ (missing/extra keys, values, types)."""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        problems = [f"{path}.{k}: missing (expected {expected[k]!r})" for k in expected if k not in actual]
+        problems += [f"{path}.{k}: unexpected ({actual[k]!r})" for k in actual if k not in expected]
+        for k in expected.keys() & actual.keys():
+            problems += differences(expected[k], actual[k], f"{path}.{k}")
+        return problems
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return [f"{path}: {len(actual)} items, expected {len(expected)}"]
+        return [p for i, (e, a) in enumerate(zip(expected, actual)) for p in differences(e, a, f"{path}[{i}]")]
+    if expected != actual or type(expected) is not type(actual):
+        return [f"{path}: {actual!r}, expected {expected!r}"]
+    return []
+
+
+def report(name: str, problems: list) -> bool:
+    if problems:
+        print(f"❌ {name}: {len(problems)} mismatch(es)")
+        for problem in problems[:10]:
+            print(f"   - {problem}")
+        return False
+    print(f"✅ {name}")
+    return True
+
+
+async def run_tests() -> bool:
+    print("\n🚀 Starting serializer wire checks...\n")
+    passed = True
+
+    print("=== TEST 1: adapter JSON == response_model JSON ===")
+    for name, model, adapter, data in await cases():
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            try:
+                fast = json.loads(adapter.dump_json(data))
+            except Exception as e:
+                passed &= report(name, [f"adapter failed: {e}"])
+                continue
+        passed &= report(name, differences(await response_model_json(model, data), fast))
+
+    print("\n=== TEST 2: json_response keeps dependency headers ===")
+    injected = Response()
+    injected.headers["X-DB-Route"] = "replica"
+    injected.set_cookie("db_primary_until", "1", max_age=6)
+    rendered = json_response(serializers.EXISTING_DATA, {"success": True, "bols": [], "isFulfilled": False},
+                             response=injected)
+    problems = []
+    if rendered.headers.get("x-db-route") != "replica":
+        problems.append(f"X-DB-Route: {rendered.headers.get('x-db-route')}")
+    if "db_primary_until=1" not in rendered.headers.get("set-cookie", ""):
+        problems.append(f"Set-Cookie: {rendered.headers.get('set-cookie')}")
+    if rendered.headers.get("content-length") != str(len(rendered.body)):
+        problems.append(f"Content-Length {rendered.headers.get('content-length')} != {len(rendered.body)}")
+    passed &= report("X-DB-Route and Set-Cookie copied, Content-Length of the JSON body", problems)
+    return passed
+
+
+if __name__ == "__main__":
+    ok = asyncio.run(run_tests())
+    print("\n🎉 All checks passed" if ok else "\n❌ Some checks failed")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,143 @@
+"""
+test_single_flight.py
+=====================
+Checks for app/services/single_flight.py (no database needed).
+
+- concurrent calls with the same key share one execution and its result
+- different keys (including the same order on another DB route) never share
+- an error raised by the shared call reaches every caller; the next call runs again
+- a cancelled leader does not fail its followers: one of them runs the call
+- forget_order() makes later callers start a fresh call instead of joining
+
+Run from project root: python backend_python/scripts/test_single_flight.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Ensure we can import 'app' (the service package at the project root)
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from app.services.single_flight import SingleFlight, bol_reads, existing_data_key, forget_order
+
+
+class Call:
+    """A shared call that blocks until released and counts its executions."""
+
+    def __init__(self, result="rows", error: Exception = None):
+        self.result = result
+        self.error = error
+        self.executions = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.executions += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def report(name: str, problems: list) -> bool:
+    if problems:
+        print(f"❌ {name}: {len(problems)} mismatch(es)")
+        for problem in problems[:10]:
+            print(f"   - {problem}")
+        return False
+    print(f"✅ {name}")
+    return True
+
+
+async def run_tests() -> bool:
+    print("\n🚀 Starting request coalescing checks...\n")
+    passed = True
+
+    print("=== TEST 1: same key shares one execution ===")
+    flight = SingleFlight()
+    call = Call()
+    tasks = [asyncio.create_task(flight.do(("existing", "PO1|A", "primary"), call)) for _ in range(5)]
+    await settle()
+    call.release.set()
+    results = await asyncio.gather(*tasks)
+    problems = [] if call.executions == 1 else [f"{call.executions} executions, expected 1"]
+    if results != ["rows"] * 5:
+        problems.append(f"results {results}")
+    stats = flight.snapshot()
+    if (stats["calls"], stats["executions"], stats["inFlight"]) != (5, 1, 0):
+        problems.append(f"snapshot {stats}")
+    passed &= report("5 callers, 1 execution, same result", problems)
+
+    print("\n=== TEST 2: key isolation ===")
+    flight = SingleFlight()
+    calls = {
+        existing_data_key("PO1|A", "primary"): Call("a-primary"),
+        existing_data_key("PO1|A", "replica"): Call("a-replica"),
+        existing_data_key("PO2|B", "primary"): Call("b-primary"),
+    }
+    tasks = {key: asyncio.create_task(flight.do(key, call)) for key, call in calls.items()}
+    await settle()
+    for call in calls.values():
+        call.release.set()
+    problems = []
+    for key, task in tasks.items():
+        if await task != calls[key].result or calls[key].executions != 1:
+            problems.append(f"{key}: {task.result()!r} after {calls[key].executions} executions")
+    passed &= report("other orders and other DB routes never join", problems)
+
+    print("\n=== TEST 3: error propagation ===")
+    flight = SingleFlight()
+    failing = Call(error=RuntimeError("database unavailable"))
+    tasks = [asyncio.create_task(flight.do("initial-data", failing)) for _ in range(3)]
+    await settle()
+    failing.release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    problems = [f"caller got {r!r}" for r in results if not isinstance(r, RuntimeError)]
+    if failing.executions != 1:
+        problems.append(f"{failing.executions} executions, expected 1")
+    retry = Call("recovered")
+    retry.release.set()
+    if await flight.do("initial-data", retry) != "recovered" or retry.executions != 1:
+        problems.append("the call after a failure did not run again")
+    passed &= report("every caller sees the error, the next call runs fresh", problems)
+
+    print("\n=== TEST 4: cancelled leader ===")
+    flight = SingleFlight()
+    leader_call = Call("leader")
+    leader = asyncio.create_task(flight.do("k", leader_call))
+    await settle()
+    follower_call = Call("follower")
+    follower_call.release.set()
+    follower = asyncio.create_task(flight.do("k", follower_call))
+    await settle()
+    leader.cancel()
+    result = await asyncio.wait_for(follower, 1)
+    problems = [] if result == "follower" and follower_call.executions == 1 else \
+        [f"follower got {result!r} after {follower_call.executions} executions"]
+    passed &= report("a follower takes over the call", problems)
+
+    print("\n=== TEST 5: forget_order after a write ===")
+    before_write = Call("before")
+    key = existing_data_key("PO9|Z", "primary")
+    first = asyncio.create_task(bol_reads.do(key, before_write))
+    await settle()
+    forget_order("PO9|Z")
+    after_write = Call("after")
+    after_write.release.set()
+    second = await asyncio.wait_for(bol_reads.do(key, after_write), 1)
+    before_write.release.set()
+    problems = [] if second == "after" and await first == "before" else [f"after the write got {second!r}"]
+    passed &= report("callers after forget_order start a fresh call", problems)
+    return passed
+
+
+if __name__ == "__main__":
+    ok = asyncio.run(run_tests())
+    print("\n🎉 All checks passed" if ok else "\n❌ Some checks failed")
+    sys.exit(0 if ok else 1)
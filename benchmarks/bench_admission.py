@@ -0,0 +1,134 @@
+"""
+bench_admission.py
+==================
+Load test: admission control (app/admission.py) under 5x overload.
+
+An in-process ASGI endpoint stands in for a DB-bound route: it takes a
+connection from a simulated pool (semaphore of CAPACITY slots, SQLAlchemy-style
+pool timeout -> 500) and holds it for the service time. Open-loop arrivals at
+5x the pool's throughput (mix of writes, point reads and bulk reads) are sent
+  - straight to the endpoint (today: requests queue in the pool), and
+  - through AdmissionMiddleware (bounded queue, 503 + Retry-After).
+Reports per-lane latency of successful requests, 500s and 503s.
+
+Run from project root: python benchmarks/bench_admission.py [overload] [seconds]
+"""
+
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from app.admission import AdmissionController
+from app.middleware import AdmissionMiddleware
+
+CAPACITY = 30
+POOL_TIMEOUT = 5.0  # scaled down from SQLAlchemy's 30s so the baseline run finishes
+SERVICE_SECONDS = {"write": 0.010, "read": 0.010, "bulk": 0.060}
+MIX = {"write": 0.15, "read": 0.60, "bulk": 0.25}
+PATHS = {
+    "write": ("POST", "/api/bol/save"),
+    "read": ("GET", "/api/bol/PO1|SKU1"),
+    "bulk": ("GET", "/api/bol/initial-data"),
+}
+LANE_BY_PATH = {path: lane for lane, (_, path) in PATHS.items()}
+
+
+def make_endpoint():
+    pool = asyncio.Semaphore(CAPACITY)
+
+    async def app(scope, receive, send):
+        try:
+            await asyncio.wait_for(pool.acquire(), POOL_TIMEOUT)
+        except asyncio.TimeoutError:
+            await send({"type": "http.response.start", "status": 500, "headers": []})
+            await send({"type": "http.response.body", "body": b'{"success": false}'})
+            return
+        try:
+            await asyncio.sleep(SERVICE_SECONDS[LANE_BY_PATH[scope["path"]]])
+        finally:
+            pool.release()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b'{"success": true}'})
+
+    return app
+
+
+async def call(app, lane, results):
+    method, path = PATHS[lane]
+    scope = {"type": "http", "method": method, "path": path, "headers": []}
+    status = {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+
+    start = time.perf_counter()
+    await app(scope, receive, send)
+    results.append((lane, status["code"], time.perf_counter() - start))
+
+
+async def run(app, overload: float, seconds: float, seed: int = 0):
+    rng = random.Random(seed)
+    mean_service = sum(SERVICE_SECONDS[lane] * share for lane, share in MIX.items())
+    rate = overload * CAPACITY / mean_service
+    lanes, weights = zip(*MIX.items())
+    results, tasks = [], []
+    deadline = time.perf_counter() + seconds
+    next_at = time.perf_counter()
+    while next_at < deadline:
+        next_at += rng.expovariate(rate)
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(call(app, rng.choices(lanes, weights)[0], results)))
+    await asyncio.gather(*tasks)
+    return rate, results
+
+
+def pct(values, p):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def report(label, results):
+    print(f"\n   {label}")
+    print(f"   {'lane':<6} {'requests':>9} {'200':>7} {'500':>6} {'503':>6} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for lane in MIX:
+        rows = [r for r in results if r[0] == lane]
+        ok = [latency * 1000 for _, code, latency in rows if code == 200]
+        counts = {code: sum(1 for _, c, _ in rows if c == code) for code in (200, 500, 503)}
+        print(f"   {lane:<6} {len(rows):>9,} {counts[200]:>7,} {counts[500]:>6,} {counts[503]:>6,} "
+              f"{pct(ok, 0.5):>8.1f} {pct(ok, 0.99):>8.1f} {max(ok, default=float('nan')):>8.1f}")
+
+
+async def main():
+    overload = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+
+    print(f"\n🚦 Admission control: {overload:.0f}x overload for {seconds:.0f}s, pool of {CAPACITY}")
+    print("-" * 80)
+    rate, baseline = await run(make_endpoint(), overload, seconds)
+    print(f"   offered load: {rate:,.0f} req/s")
+    report("No admission control (queue in the pool)", baseline)
+
+    controller = AdmissionController(CAPACITY, write_reserve=CAPACITY // 5, bulk_limit=CAPACITY // 4)
+    _, admitted = await run(AdmissionMiddleware(make_endpoint(), controller), overload, seconds)
+    report("AdmissionMiddleware (bounded queue, 503 + Retry-After)", admitted)
+    snapshot = controller.snapshot()
+    print(f"\n   shed: {snapshot['shed']:,}   max queue depth: "
+          + ", ".join(f"{name}={lane['maxQueueDepth']}" for name, lane in snapshot["lanes"].items()))
+    print("-" * 80)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
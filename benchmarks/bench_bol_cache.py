@@ -0,0 +1,151 @@
+"""
+bench_bol_cache.py
+==================
+Benchmark: p50/p99 of repeated GET /api/bol/{po_sku_key} reads with and
+without the per-order cache (app/services/bol_cache.py).
+
+Workload: CLIENTS concurrent operators opening orders drawn from a Zipf
+distribution over HOT_KEYS keys (a few orders are opened over and over), with
+WRITE_SHARE of the operations being saves (order_changed invalidation).
+Part 1 (no DB): BolService.get_existing_bol_data with the query replaced by a
+simulated round-trip (lognormal, ~4 ms median with a tail).
+Part 2 (BENCH_DATABASE_URL set): the real query on a scratch schema.
+Run from project root: [BENCH_DATABASE_URL=postgresql://...] python benchmarks/bench_bol_cache.py [requests]
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from app.services.bol_cache import existing_bol_cache, order_changed
+from app.services.bol_service import BolService
+
+CLIENTS = 20
+HOT_KEYS = 200
+WRITE_SHARE = 0.02
+ZIPF_S = 1.1
+
+
+def zipf_keys(rng, n):
+    weights = [1 / (rank ** ZIPF_S) for rank in range(1, HOT_KEYS + 1)]
+    return rng.choices([f"PO{i}|SKU{i}" for i in range(HOT_KEYS)], weights, k=n)
+
+
+def pct(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+async def workload(session_factory, n_requests, seed=0):
+    rng = random.Random(seed)
+    keys = zipf_keys(rng, n_requests)
+    writes = [rng.random() < WRITE_SHARE for _ in keys]
+    # (latency, repeat): repeat = key already read since its last write
+    latencies = []
+    seen = set()
+    queue = asyncio.Queue()
+    for item in zip(keys, writes):
+        queue.put_nowait(item)
+
+    async def operator():
+        async with session_factory() as db:
+            while not queue.empty():
+                key, is_write = queue.get_nowait()
+                if is_write:
+                    order_changed(key)
+                    seen.discard(key)
+                    continue
+                repeat = key in seen
+                seen.add(key)
+                start = time.perf_counter()
+                result = await BolService.get_existing_bol_data(db, key)
+                latencies.append((time.perf_counter() - start, repeat))
+                assert result["success"], result
+
+    await asyncio.gather(*(operator() for _ in range(CLIENTS)))
+    return latencies
+
+
+async def compare(label, session_factory, n_requests):
+    print(f"\n{label}")
+    print("-" * 80)
+    print(f"   {'':<18} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'p99 repeat':>11} {'hit rate':>9}")
+    max_entries = existing_bol_cache.max_entries
+    for name, enabled in (("no cache", False), ("cache", True)):
+        existing_bol_cache.clear()
+        existing_bol_cache.hits = existing_bol_cache.misses = 0
+        existing_bol_cache.max_entries = max_entries if enabled else 0
+        results = await workload(session_factory, n_requests)
+        latencies = [x * 1000 for x, _ in results]
+        repeats = [x * 1000 for x, repeat in results if repeat]
+        hit_rate = existing_bol_cache.snapshot()["hitRate"]
+        print(f"   {name:<18} {pct(latencies, 0.5):>8.2f} {pct(latencies, 0.99):>8.2f} "
+              f"{max(latencies):>8.2f} {pct(repeats, 0.99):>11.2f} {hit_rate:>9.1%}")
+    existing_bol_cache.max_entries = max_entries
+    snapshot = existing_bol_cache.snapshot()
+    print(f"   entries {snapshot['entries']}, {snapshot['bytes']:,} bytes, "
+          f"{snapshot['invalidations']} invalidations")
+    print("-" * 80)
+
+
+class _NoSession:
+    async def __aenter__(self):
+        return None
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+async def bench_simulated(n_requests):
+    rng = random.Random(1)
+    original = BolService._fetch_existing_bol_data
+
+    async def fake_fetch(db, po_sku_key):
+        await asyncio.sleep(rng.lognormvariate(-5.5, 0.6))  # median ~4 ms
+        return {"success": True, "bols": [{"bolNumber": "B1", "shippedQty": 3, "shippingFee": 0, "signed": False}],
+                "actShipDate": "2025-01-15", "isFulfilled": True}
+
+    BolService._fetch_existing_bol_data = staticmethod(fake_fetch)
+    try:
+        await compare(f"🧊 Simulated DB, {n_requests:,} reads, {CLIENTS} clients, Zipf over {HOT_KEYS} keys",
+                      _NoSession, n_requests)
+    finally:
+        BolService._fetch_existing_bol_data = original
+
+
+async def bench_db(n_requests):
+    from benchmarks.pg_scratch import scratch_schema
+
+    async with scratch_schema() as (conn, Session):
+        await conn.execute(f"""
+            INSERT INTO orders (order_number, source, status)
+            SELECT 'PO' || g || '|SKU' || g, 'DEALER', 'SHIPPED' FROM generate_series(0, {HOT_KEYS - 1}) g
+        """)
+        await conn.execute("""
+            INSERT INTO shipments (order_id, tracking_number, shipped_at, items)
+            SELECT o.id, 'BOL-' || o.order_number || '-' || n, $1, $2::jsonb
+            FROM orders o, generate_series(1, 3) n
+        """, datetime(2025, 1, 15), json.dumps([{"qty": 2}]))
+        await compare(f"🗄️  Postgres, {n_requests:,} reads, {CLIENTS} clients, Zipf over {HOT_KEYS} keys",
+                      Session, n_requests)
+
+
+def main():
+    n_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    asyncio.run(bench_simulated(n_requests))
+    if os.getenv("BENCH_DATABASE_URL"):
+        asyncio.run(bench_db(n_requests))
+    else:
+        print("\n   (set BENCH_DATABASE_URL to also run against Postgres)")
+
+
+if __name__ == "__main__":
+    main()
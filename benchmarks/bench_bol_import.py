@@ -0,0 +1,74 @@
+"""
+bench_bol_import.py
+===================
+Benchmark: end-to-end throughput of the streaming BOL_DB importer on a synthetic
+sheet export (with and without the raw `bol_db` copy), then incremental
+re-imports of the same sheet unchanged and with ~1% of rows edited.
+Run from project root: BENCH_DATABASE_URL=postgresql://... python benchmarks/bench_bol_import.py [rows]
+"""
+
+import asyncio
+import csv
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks.pg_scratch import scratch_schema
+from app.services.bol_import_service import BolImportService, COLUMN_MAPPING
+
+
+def write_sheet(path: Path, rows: int, edit_ratio: float = 0.0):
+    """~3 BOL rows per PO|SKU key, a few with missing keys/dates like the real sheet."""
+    rng = random.Random(42)
+    edits = random.Random(7)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(list(COLUMN_MAPPING))
+        for i in range(rows):
+            key = f"PO{i // 3:07d}|SKU-{i % 7}" if rng.random() > 0.01 else ""
+            ship_date = f"{rng.randint(1, 12)}/{rng.randint(1, 28)}/{rng.choice([2023, 2024])}" if rng.random() > 0.05 else ""
+            qty = rng.randint(0, 1500)
+            if edit_ratio and edits.random() < edit_ratio:
+                qty += 1
+            writer.writerow([
+                f"BOL{i:08d}", key, f"{qty:,}", f"${rng.randint(50, 900)}",
+                ship_date, rng.choice(["TRUE", "FALSE"]), rng.choice(["Fulfilled", ""]), "2024-01-01 00:00:00"
+            ])
+
+
+async def run(Session, label: str, path: Path, keep_raw: bool = False):
+    async with Session() as db:
+        result = await BolImportService.import_csv(db, path, keep_raw=keep_raw)
+    m = result["metrics"]
+    print(f"   {label:<22} {m.get('seconds', 0):8.2f}s  {m.get('rowsPerSec', 0):>10,.0f} rows/s"
+          f"  new={m['rowsInserted']:,} changed={m['rowsChanged']:,} unchanged={m['rowsUnchanged']:,}"
+          f"  shipments +{m['shipmentsCreated']:,}/-{m['shipmentsDeleted']:,}")
+    if not result["success"]:
+        print(f"   ❌ {result.get('message')}")
+
+
+async def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bol_db.csv"
+        edited = Path(tmp) / "bol_db_edited.csv"
+        write_sheet(path, rows)
+        write_sheet(edited, rows, edit_ratio=0.01)
+        print(f"\n📦 BOL import benchmark ({rows:,} rows, {path.stat().st_size / 1e6:.1f} MB)")
+        print("-" * 100)
+        # Fresh schema per initial load so both start from empty tables
+        async with scratch_schema() as (_, Session):
+            await run(Session, "initial + bol_db copy", path, keep_raw=True)
+        async with scratch_schema() as (_, Session):
+            await run(Session, "initial", path)
+            await run(Session, "re-import unchanged", path)
+            await run(Session, "re-import 1% edited", edited)
+        print("-" * 100)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
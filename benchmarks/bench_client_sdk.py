@@ -0,0 +1,188 @@
+"""
+bench_client_sdk.py
+===================
+Benchmark: hsus_client.BolClient (pooled keep-alive, bounded concurrency,
+batch reads, 503 retries) vs naive per-call usage (a fresh connection per
+request, one at a time or all at once), as internal tools do today.
+
+A stub of the BOL routes runs under uvicorn in a child process behind the
+real AdmissionMiddleware (small capacity, so bursts get 503 + Retry-After).
+Handlers sleep for a simulated DB time; the first request on every new
+connection also sleeps HANDSHAKE_MS to stand in for the TCP + TLS setup a
+fresh connection costs against the deployed service (loopback has none).
+
+Run from project root: python benchmarks/bench_client_sdk.py [keys] [saves]
+Needs httpx (pip install -r hsus_client/requirements.txt).
+"""
+
+import asyncio
+import json
+import multiprocessing
+import socket
+import sys
+import time
+from pathlib import Path
+from urllib.parse import quote
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+import httpx
+
+from hsus_client import BolClient
+
+HANDSHAKE_MS = 30
+READ_MS = 3
+SAVE_MS = 6
+BATCH_KEY_MS = 0.05
+CAPACITY = 8
+CONCURRENCY = 8
+
+
+def stub_app():
+    from app.admission import AdmissionController
+    from app.middleware import AdmissionMiddleware
+
+    seen_connections = set()
+
+    def existing(key):
+        return {"success": True, "bols": [{"bolNumber": f"B-{key}", "shippedQty": 3, "shippingFee": 12.5,
+                                           "signed": False}], "actShipDate": "2025-01-15", "isFulfilled": True}
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        if scope["client"] not in seen_connections:
+            seen_connections.add(scope["client"])
+            await asyncio.sleep(HANDSHAKE_MS / 1000)
+
+        method, path = scope["method"], scope["path"]
+        if method == "POST" and path == "/api/bol/save":
+            await asyncio.sleep(SAVE_MS / 1000)
+            result = {"success": True, "message": "Saved successfully"}
+        elif method == "POST" and path == "/api/bol/existing":
+            keys = json.loads(body)["keys"]
+            await asyncio.sleep((READ_MS + BATCH_KEY_MS * len(keys)) / 1000)
+            result = {"success": True, "results": [{"key": k, **existing(k)} for k in keys]}
+        else:
+            await asyncio.sleep(READ_MS / 1000)
+            result = existing(path.rsplit("/", 1)[-1])
+        payload = json.dumps(result).encode()
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": payload})
+
+    controller = AdmissionController(capacity=CAPACITY, write_reserve=2, bulk_limit=4, queue_factor=2, queue_timeout=1)
+    return AdmissionMiddleware(app, controller=controller)
+
+
+def serve(port):
+    import uvicorn
+    uvicorn.run(stub_app(), host="127.0.0.1", port=port, log_level="warning", loop="asyncio")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def wait_ready(base_url):
+    async with httpx.AsyncClient() as http:
+        for _ in range(100):
+            try:
+                await http.get(f"{base_url}/api/bol/ready")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError("stub server did not start")
+
+
+# --- Naive usage: a new connection per call, no retries ---
+
+async def naive_call(base_url, method, path, **kwargs):
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as http:
+        response = await http.request(method, path, **kwargs)
+        return response.status_code == 200
+
+
+async def naive_sequential(base_url, calls):
+    return [await naive_call(base_url, *c[:2], **c[2]) for c in calls]
+
+
+async def naive_burst(base_url, calls):
+    return await asyncio.gather(*(naive_call(base_url, *c[:2], **c[2]) for c in calls))
+
+
+def read_calls(keys):
+    return [("GET", f"/api/bol/{quote(k, safe='')}", {}) for k in keys]
+
+
+def save_calls(payloads):
+    return [("POST", "/api/bol/save", {"json": p}) for p in payloads]
+
+
+async def sdk(base_url, fn, concurrency=CONCURRENCY, batch=True):
+    async with BolClient(base_url, concurrency=concurrency, backoff_base=0.05) as client:
+        if not batch:
+            client._batch_supported = False
+        results = await fn(client)
+        values = results.values() if isinstance(results, dict) else results
+        return [r.get("success", False) for r in values], client.stats
+
+
+def report(label, elapsed, ok, stats=None):
+    n = len(ok)
+    extra = f"  retries={stats['retries']:>4}" if stats else ""
+    print(f"   {label:<38} {elapsed * 1000:9.1f} ms  {n / elapsed:8.1f} ops/s  failed={n - sum(ok):>4}{extra}")
+
+
+async def timed(label, coro):
+    start = time.perf_counter()
+    result = await coro
+    elapsed = time.perf_counter() - start
+    ok, stats = result if isinstance(result, tuple) else (result, None)
+    report(label, elapsed, ok, stats)
+
+
+async def main():
+    n_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    n_saves = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    keys = [f"{4000 + i}|F10{i:04d}" for i in range(n_keys)]
+    payloads = [{"poSkuKey": k, "actShipDate": "2025-01-15", "isFulfilled": True,
+                 "bols": [{"bolNumber": f"B-{k}", "shippedQty": 3}]} for k in keys[:n_saves]]
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = multiprocessing.Process(target=serve, args=(port,), daemon=True)
+    server.start()
+    try:
+        await wait_ready(base_url)
+        print(f"\n🔌 BOL client SDK vs naive calls (stub server: {READ_MS} ms read, {SAVE_MS} ms save, "
+              f"{HANDSHAKE_MS} ms per new connection, admission capacity {CAPACITY})")
+        print("-" * 96)
+        print(f"   Reads of {n_keys} keys")
+        await timed("naive, sequential, fresh connections", naive_sequential(base_url, read_calls(keys)))
+        await timed("naive, all at once, fresh connections", naive_burst(base_url, read_calls(keys)))
+        await timed(f"SDK get_many, per-key GETs (x{CONCURRENCY})",
+                    sdk(base_url, lambda c: c.get_many(keys), batch=False))
+        await timed("SDK get_many, batch endpoint", sdk(base_url, lambda c: c.get_many(keys)))
+        await timed("SDK get_many, per-key GETs (x64, shed)",
+                    sdk(base_url, lambda c: c.get_many(keys), concurrency=64, batch=False))
+        print(f"   Saves of {n_saves} orders")
+        await timed("naive, sequential, fresh connections", naive_sequential(base_url, save_calls(payloads)))
+        await timed(f"SDK save_many (x{CONCURRENCY})", sdk(base_url, lambda c: c.save_many(payloads)))
+        print("-" * 96)
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
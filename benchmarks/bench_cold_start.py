@@ -0,0 +1,74 @@
+"""
+bench_cold_start.py
+===================
+Benchmark: Cloud Run style cold start.
+Measures (1) `import app.main` time in a fresh interpreter and
+(2) time from process spawn to the first successful response.
+Run from project root: python benchmarks/bench_cold_start.py [path] [runs]
+  path defaults to /health; use /api/bol/initial-data to include the first DB round-trip.
+"""
+
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def import_time():
+    out = subprocess.check_output([sys.executable, "-c", IMPORT_SNIPPET], cwd=ROOT_DIR, text=True)
+    return float(out.strip().splitlines()[-1]) * 1000
+
+
+def time_to_first_request(path, timeout=30.0):
+    port = free_port()
+    url = f"http://127.0.0.1:{port}{path}"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT_DIR, env=os.environ.copy(),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=5) as resp:
+                    if resp.status == 200:
+                        return (time.perf_counter() - start) * 1000
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError(f"No successful response from {url} within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else "/health"
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    imports = [import_time() for _ in range(runs)]
+    firsts = [time_to_first_request(path) for _ in range(runs)]
+
+    print(f"\n🚀 Cold start benchmark ({runs} runs, first request: {path})")
+    print("-" * 60)
+    print(f"   import app.main       median={statistics.median(imports):8.1f} ms  max={max(imports):8.1f} ms")
+    print(f"   spawn → first 200     median={statistics.median(firsts):8.1f} ms  max={max(firsts):8.1f} ms")
+    print("-" * 60)
+
+
+if __name__ == "__main__":
+    main()
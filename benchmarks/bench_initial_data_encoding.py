@@ -0,0 +1,73 @@
+"""
+bench_initial_data_encoding.py
+==============================
+Benchmark: /api/bol/initial-data payload shape.
+Compares the legacy object list against ?format=columnar on bytes-on-wire
+(raw / gzip / brotli) and client parse time (json.loads).
+Run from project root: python benchmarks/bench_initial_data_encoding.py [n_orders]
+"""
+
+import gzip
+import json
+import random
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from app.services.bol_service import build_initial_data, build_initial_data_columnar
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+Row = namedtuple("Row", ["order_number", "status", "created_at"])
+
+STATUSES = ["DRAFT", "CONFIRMED", "ALLOCATING", "PARTIALLY_SHIPPED", "SHIPPED", "COMPLETED", "CANCELLED"]
+
+
+def make_rows(n):
+    rng = random.Random(42)
+    base = datetime(2025, 1, 1)
+    return [
+        Row(
+            f"PO{rng.randint(1000000, 9999999)}|F10{rng.randint(1000, 9999)}",
+            rng.choice(STATUSES),
+            base + timedelta(minutes=rng.randint(0, 500000)),
+        )
+        for _ in range(n)
+    ]
+
+
+def parse_time(body, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        json.loads(body)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def report(name, payload):
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    gz = len(gzip.compress(body, compresslevel=9))
+    br = len(brotli.compress(body)) if brotli else None
+    print(f"{name:<10} raw={len(body):>10,}  gzip={gz:>9,}  "
+          f"brotli={br if br is not None else 'n/a':>9}  parse={parse_time(body):7.2f} ms")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rows = make_rows(n)
+    print(f"\n📦 initial-data encoding benchmark ({n:,} orders)")
+    print("-" * 80)
+    report("objects", build_initial_data(rows))
+    report("columnar", build_initial_data_columnar(rows))
+    print("-" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+bench_invoice_aging.py
+======================
+Benchmark: invoice aging dashboard over a synthetic invoice table.
+Compares the live grouped query against the incrementally refreshed summary.
+Run from project root: BENCH_DATABASE_URL=postgresql://... python benchmarks/bench_invoice_aging.py [n_invoices]
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks.pg_scratch import scratch_schema, timed
+from app.services.invoice_service import InvoiceService
+
+N_CUSTOMERS = 2000
+N_ORDERS = 100000
+
+
+async def seed(conn, n):
+    await conn.execute(f"""
+        INSERT INTO orders (order_number, source, status, customer_info)
+        SELECT 'BENCH-' || g, 'DEALER', 'SHIPPED', jsonb_build_object('name', 'Customer ' || (g % {N_CUSTOMERS}))
+        FROM generate_series(1, {N_ORDERS}) g
+    """)
+    await conn.execute(f"""
+        WITH o AS (SELECT array_agg(id) AS ids FROM orders)
+        INSERT INTO invoices (qbo_invoice_id, estimate_id, amount, balance, due_date, status, last_synced_at)
+        SELECT 'INV-' || g,
+               o.ids[1 + g % {N_ORDERS}],
+               (g % 5000) + 100,
+               CASE WHEN g % 4 = 0 THEN 0 ELSE (g % 5000) + 100 END,
+               CURRENT_DATE + 30 - (g % 180),
+               (CASE WHEN g % 4 = 0 THEN 'PAID' ELSE 'OPEN' END)::invoice_status_enum,
+               now() - interval '1 day'
+        FROM generate_series(1, {n}) g, o
+    """)
+    await conn.execute("ANALYZE")
+
+
+async def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    async with scratch_schema() as (conn, Session):
+        print(f"\n🧾 Invoice aging benchmark ({n:,} invoices, {N_CUSTOMERS:,} customers)")
+        print("-" * 80)
+        await seed(conn, n)
+
+        async def run(fn, **kwargs):
+            async with Session() as db:
+                result = await fn(db, **kwargs)
+                assert result["success"], result.get("message")
+                return result
+
+        await timed("mark_overdue", lambda: run(InvoiceService.mark_overdue), repeat=1)
+        live = await timed("aging (live grouped query)", lambda: run(InvoiceService.get_aging_report, live=True))
+        await timed("refresh summary (full)", lambda: run(InvoiceService.refresh_aging_summary), repeat=1)
+
+        await conn.execute("UPDATE invoices SET balance = 0, status = 'PAID', last_synced_at = now() WHERE qbo_invoice_id IN (SELECT 'INV-' || g FROM generate_series(1, 500) g)")
+        await timed("refresh summary (500 changed invoices)", lambda: run(InvoiceService.refresh_aging_summary), repeat=1)
+        summary = await timed("aging (summary table)", lambda: run(InvoiceService.get_aging_report))
+
+        live = await run(InvoiceService.get_aging_report, live=True)
+        assert abs(live["total"]["balance"] - summary["total"]["balance"]) < 0.01, "summary drifted from live"
+
+        # Changes that leave the old customer's row stale unless it is recomputed too
+        await conn.execute("""
+            UPDATE invoices SET estimate_id = (SELECT id FROM orders WHERE order_number = 'BENCH-1')
+            WHERE qbo_invoice_id IN (SELECT 'INV-' || g FROM generate_series(1001, 1100) g)
+        """)
+        await conn.execute("""
+            UPDATE orders SET customer_info = jsonb_build_object('name', 'Renamed Customer')
+            WHERE order_number IN ('BENCH-2', 'BENCH-3')
+        """)
+        await timed("refresh summary (moved invoices, renamed customer)",
+                    lambda: run(InvoiceService.refresh_aging_summary), repeat=1)
+        summary = await run(InvoiceService.get_aging_report)
+        live = await run(InvoiceService.get_aging_report, live=True)
+        assert {c["customer"]: c for c in live["customers"]} == {c["customer"]: c for c in summary["customers"]}, \
+            "summary drifted from live per customer"
+        print("-" * 80)
+        print(f"   Open balance: {summary['total']['balance']:,.2f} across {len(summary['customers'])} customers")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,162 @@
+"""
+bench_order_read_strategies.py
+==============================
+Benchmark: the two query strategies that existed for the same BOL reads
+before backend_python/app was folded into app/:
+  - ORM (backend_python): select(Order) + selectinload(Order.shipments),
+    ORM objects -> OrderRead / ExistingDataResponse models
+  - raw SQL (app/): repository text() queries -> dicts -> precompiled adapters
+for GET /api/bol/orders, /api/bol/detail/{key} and /api/bol/{key}, and checks
+both return the same documents. The ORM models are kept here as they were.
+Run from project root: BENCH_DATABASE_URL=postgresql://... python benchmarks/bench_order_read_strategies.py [orders]
+"""
+
+import asyncio
+import json
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from sqlalchemy import Column, DateTime, ForeignKey, String, select
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import declarative_base, relationship, selectinload
+
+from benchmarks.pg_scratch import scratch_schema, timed
+from app import serializers
+from app.schemas.order import OrderRead
+from app.services.bol_cache import existing_bol_cache
+from app.services.bol_service import BolService
+
+SAMPLE_KEYS = 200
+
+# --- Before: backend_python/app/models.py ---
+
+Base = declarative_base()
+
+
+class Order(Base):
+    __tablename__ = "orders"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    order_number = Column(String, unique=True, nullable=False)
+    source = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    customer_info = Column(JSONB)
+    items = Column(JSONB)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    shipments = relationship("Shipment", back_populates="order", lazy="selectin")
+
+
+class Shipment(Base):
+    __tablename__ = "shipments"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    order_id = Column(UUID(as_uuid=True), ForeignKey("orders.id"), nullable=False)
+    tracking_number = Column(String)
+    carrier = Column(String)
+    shipped_at = Column(DateTime(timezone=True), nullable=False)
+    items = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True))
+    order = relationship("Order", back_populates="shipments")
+
+
+def orm_order_read(order) -> dict:
+    shipments = sorted(order.shipments, key=lambda s: (s.shipped_at, s.created_at, str(s.id)))
+    return OrderRead(
+        id=str(order.id), order_number=order.order_number, source=order.source, status=order.status,
+        customer_info=order.customer_info, items=order.items,
+        created_at=order.created_at, updated_at=order.updated_at,
+        shipments=[
+            {"id": str(s.id), "tracking_number": s.tracking_number, "carrier": s.carrier,
+             "shipped_at": s.shipped_at, "items": s.items, "created_at": s.created_at}
+            for s in shipments
+        ]
+    ).model_dump(mode="json")
+
+
+async def orm_orders(db, limit):
+    stmt = select(Order).options(selectinload(Order.shipments)).order_by(Order.created_at.desc()).limit(limit)
+    orders = (await db.execute(stmt)).scalars().all()
+    return [orm_order_read(o) for o in orders]
+
+
+async def orm_existing(db, key):
+    order = (await db.execute(
+        select(Order).options(selectinload(Order.shipments)).where(Order.order_number == key)
+    )).scalar_one_or_none()
+    if order is None:
+        return {"success": True, "bols": [], "actShipDate": None, "isFulfilled": False}
+    qty = lambda items: int(items.get("qty", 0)) if isinstance(items, dict) else \
+        sum(int(i.get("qty", 0)) for i in items if isinstance(i, dict))
+    return {
+        "success": True,
+        "bols": [{"bolNumber": s.tracking_number or "", "shippedQty": qty(s.items)} for s in order.shipments],
+        "isFulfilled": order.status in ("SHIPPED", "COMPLETED")
+    }
+
+
+# --- After: app/services/bol_service.py ---
+
+async def raw_orders(db, limit):
+    result = await BolService.get_orders(db, limit)
+    return json.loads(serializers.ORDER_LIST.dump_json(result["orders"]))
+
+
+async def raw_existing(db, key):
+    existing_bol_cache.clear()
+    return await BolService.get_existing_bol_data(db, key)
+
+
+async def seed(conn, n_orders):
+    await conn.execute(f"""
+        INSERT INTO orders (order_number, source, status, items)
+        SELECT 'PO' || g || '|SKU-' || (g % 50), 'DEALER',
+               (CASE WHEN g % 3 = 0 THEN 'CONFIRMED' ELSE 'SHIPPED' END)::order_status_enum,
+               jsonb_build_array(jsonb_build_object('sku', 'PO' || g, 'original_qty', 1 + g % 9))
+        FROM generate_series(1, {n_orders}) g
+    """)
+    await conn.execute("""
+        INSERT INTO shipments (order_id, tracking_number, carrier, shipped_at, items)
+        SELECT o.id, 'BOL-' || o.order_number || '-' || n, 'UPS', $1,
+               jsonb_build_array(jsonb_build_object('qty', n))
+        FROM orders o, generate_series(1, 3) n
+    """, datetime(2025, 1, 15))
+    await conn.execute("ANALYZE")
+
+
+async def main():
+    n_orders = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    async with scratch_schema() as (conn, Session):
+        print(f"\n🔀 ORM vs raw SQL read paths ({n_orders:,} orders, 3 shipments each)")
+        print("-" * 80)
+        await seed(conn, n_orders)
+        keys = [r["order_number"] for r in await conn.fetch(
+            f"SELECT order_number FROM orders ORDER BY random() LIMIT {SAMPLE_KEYS}")]
+
+        async with Session() as db:
+            for limit in (100, 1000):
+                orm = await timed(f"/orders?limit={limit} (ORM)", lambda: orm_orders(db, limit))
+                raw = await timed(f"/orders?limit={limit} (raw SQL)", lambda: raw_orders(db, limit))
+                assert orm == raw, f"/orders?limit={limit}: ORM and raw SQL documents differ"
+
+            async def each(fn):
+                return [await fn(db, key) for key in keys]
+
+            orm = await timed(f"{SAMPLE_KEYS} x /{{key}} (ORM)", lambda: each(orm_existing), repeat=3)
+            raw = await timed(f"{SAMPLE_KEYS} x /{{key}} (raw SQL, no cache)", lambda: each(raw_existing), repeat=3)
+            for a, b in zip(orm, raw):
+                assert sorted((x["bolNumber"], x["shippedQty"]) for x in a["bols"]) == \
+                    sorted((x["bolNumber"], x["shippedQty"]) for x in b["bols"]), "GET /{key} differs"
+                assert a["isFulfilled"] == b["isFulfilled"]
+        print("-" * 80)
+        print("✅ ORM and raw SQL return the same documents")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
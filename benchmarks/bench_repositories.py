@@ -0,0 +1,115 @@
+"""
+bench_repositories.py
+=====================
+Benchmark: per-call overhead of inline `text()` statements vs the module-level
+statements in app/repositories.
+Part 1 (no DB): building + compiling the statement the way every execute() does.
+Part 2 (BENCH_DATABASE_URL set): per-key lookups vs find_many_by_order_number,
+and per-row inserts vs ShipmentRepository.insert_many.
+Run from project root: [BENCH_DATABASE_URL=postgresql://...] python benchmarks/bench_repositories.py [n_keys]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+
+from app.repositories import OrderRepository, ShipmentRepository
+from app.repositories.order_repository import FIND_BY_ORDER_NUMBER_SQL
+
+INLINE_SQL = FIND_BY_ORDER_NUMBER_SQL.text
+DIALECT = asyncpg_dialect()
+CALLS = 20000
+
+
+def bench_statement_overhead():
+    cache = {}
+
+    def prepare(stmt):
+        # What Connection.execute does before hitting the driver: cache key, then compiled-cache lookup
+        key = stmt._generate_cache_key().key
+        compiled = cache.get(key)
+        if compiled is None:
+            compiled = cache[key] = stmt.compile(dialect=DIALECT)
+        return compiled
+
+    print(f"\n🧱 Statement overhead ({CALLS:,} calls, CPU only)")
+    print("-" * 80)
+    for label, factory in (
+        ("inline text() per call", lambda: text(INLINE_SQL)),
+        ("module-level statement", lambda: FIND_BY_ORDER_NUMBER_SQL),
+    ):
+        cache.clear()
+        start = time.perf_counter()
+        for _ in range(CALLS):
+            prepare(factory())
+        per_call = (time.perf_counter() - start) / CALLS * 1e6
+        print(f"   {label:<40} {per_call:8.2f} µs/call")
+
+
+async def bench_db(n_keys):
+    from benchmarks.pg_scratch import scratch_schema, timed
+
+    async with scratch_schema() as (conn, Session):
+        await conn.execute(f"""
+            INSERT INTO orders (order_number, source, status)
+            SELECT 'BENCH-' || g, 'DEALER', 'CONFIRMED' FROM generate_series(1, {n_keys * 10}) g
+        """)
+        keys = [f"BENCH-{i}" for i in range(1, n_keys * 10, 10)]
+
+        print(f"\n🗄️  Round-trips ({n_keys} keys)")
+        print("-" * 80)
+        async with Session() as db:
+            async def inline_loop():
+                for key in keys:
+                    (await db.execute(text(INLINE_SQL), {"key": key})).fetchone()
+
+            async def repo_loop():
+                for key in keys:
+                    await OrderRepository.find_by_order_number(db, key)
+
+            await timed("inline text(), one query per key", inline_loop)
+            await timed("repository, one query per key", repo_loop)
+            await timed("find_many_by_order_number", lambda: OrderRepository.find_many_by_order_number(db, keys))
+
+            orders = await OrderRepository.find_many_by_order_number(db, keys)
+            shipments = [
+                {"order_id": row.id, "tracking_number": f"BOL-{key}", "shipped_at": datetime(2025, 1, 15),
+                 "items": json.dumps([{"qty": 1}])}
+                for key, row in orders.items()
+            ]
+
+            async def insert_loop():
+                for s in shipments:
+                    await ShipmentRepository.insert_many(db, [s])
+                await db.rollback()
+
+            async def insert_batch():
+                await ShipmentRepository.insert_many(db, shipments)
+                await db.rollback()
+
+            await timed("shipments, one INSERT per row", insert_loop)
+            await timed("ShipmentRepository.insert_many", insert_batch)
+        print("-" * 80)
+
+
+def main():
+    n_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    bench_statement_overhead()
+    if os.getenv("BENCH_DATABASE_URL"):
+        asyncio.run(bench_db(n_keys))
+    else:
+        print("\n   (set BENCH_DATABASE_URL to also run the round-trip comparison)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+bench_serialization.py
+======================
+Benchmark: per-request CPU of rendering BOL responses.
+Compares FastAPI's response_model path (validate the service dict against the
+pydantic model, jsonable_encoder, json.dumps) with the precompiled TypeAdapters
+in app/serializers.py. Wire parity of the two paths is checked by
+backend_python/scripts/test_serializers.py; here the adapters only have to render
+every case without serializer warnings.
+Run from project root: python benchmarks/bench_serialization.py [n_orders]
+"""
+
+import asyncio
+import json
+import sys
+import time
+import warnings
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app import serializers
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from pydantic import RootModel
+
+from app.schemas.bol import (
+    BolExistingBatchResponse,
+    BolExistingDataResponse,
+    BolHistoryResponse,
+    BolInitialDataColumnarResponse,
+    BolInitialDataResponse,
+    BolTrackingLookupResponse,
+)
+from app.schemas.order import OrderRead
+from app.services.bol_service import build_initial_data, build_initial_data_columnar
+from benchmarks.bench_initial_data_encoding import make_rows
+
+
+def existing_data(n_bols):
+    return {
+        "success": True,
+        "bols": [
+            {"bolNumber": f"3130{i:04d}", "shippedQty": 10 + i, "shippingFee": 0, "signed": False}
+            for i in range(n_bols)
+        ],
+        "actShipDate": "2025-03-01",
+        "isFulfilled": False
+    }
+
+
+class OrderList(RootModel[List[OrderRead]]):
+    pass
+
+
+def existing_batch(n):
+    return {"success": True, "results": [{"key": f"PO{i}|SKU", **existing_data(2)} for i in range(n)]}
+
+
+def orders(n):
+    created = datetime(2025, 3, 1, 8, 30, tzinfo=timezone.utc)
+    return [
+        {
+            "id": f"00000000-0000-0000-0000-{i:012d}", "order_number": f"PO{i}|SKU", "source": "DEALER",
+            "status": "SHIPPED", "customer_info": None, "items": [{"sku": f"PO{i}|SKU", "original_qty": 4}],
+            "created_at": created + timedelta(minutes=i), "updated_at": created + timedelta(minutes=i),
+            "shipments": [
+                {"id": f"10000000-0000-0000-0000-{i:012d}", "tracking_number": f"3130{i:04d}", "carrier": None,
+                 "shipped_at": created, "items": [{"qty": 4}], "created_at": created}
+            ]
+        }
+        for i in range(n)
+    ]
+
+
+def tracking_lookup(n):
+    return {
+        "success": True,
+        "results": [
+            {"bolNumber": f"3130{i:04d}", "key": f"PO{i}|SKU", "status": "SHIPPED", "isFulfilled": True,
+             "actShipDate": "2025-03-01", "shippedQty": 5, "shippingFee": 120.5, "signed": True, "carrier": None}
+            for i in range(n)
+        ],
+        "notFound": ["00000000"]
+    }
+
+
+def history(n):
+    return {
+        "success": True,
+        "key": "PO1|SKU",
+        "entries": [
+            {"action": "save", "actor": "ops", "before": {"status": "CONFIRMED", "bols": []},
+             "after": {"status": "SHIPPED", "bols": [{"bolNumber": "1", "shippedQty": 2}]},
+             "timestamp": "2025-03-01T10:00:00+00:00"}
+            for _ in range(n)
+        ]
+    }
+
+
+def cases(n_orders):
+    rows = make_rows(n_orders)
+    failure = {"success": False, "bols": [], "message": "boom", "isFulfilled": False}
+    return [
+        ("initial-data (objects)", BolInitialDataResponse, serializers.INITIAL_DATA, build_initial_data(rows)),
+        ("initial-data (columnar)", BolInitialDataColumnarResponse, serializers.INITIAL_DATA_COLUMNAR,
+         build_initial_data_columnar(rows)),
+        ("existing-data", BolExistingDataResponse, serializers.EXISTING_DATA, existing_data(8)),
+        ("existing-data (error)", BolExistingDataResponse, serializers.EXISTING_DATA, failure),
+        ("by-tracking", BolTrackingLookupResponse, serializers.TRACKING_LOOKUP, tracking_lookup(20)),
+        ("history", BolHistoryResponse, serializers.HISTORY, history(50)),
+        ("existing (batch)", BolExistingBatchResponse, serializers.EXISTING_BATCH, existing_batch(50)),
+        ("orders", OrderList, serializers.ORDER_LIST, orders(100)),
+    ]
+
+
+async def fastapi_render(field, data) -> bytes:
+    content = await serialize_response(field=field, response_content=data)
+    return JSONResponse(content).body
+
+
+def check_renders(adapter, data):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        adapter.dump_json(data)
+
+
+def per_call_ms(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    n_orders = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(f"\n🧾 Response serialization benchmark ({n_orders:,} orders in initial-data)")
+    print("-" * 80)
+    loop = asyncio.new_event_loop()
+    for name, model, adapter, data in cases(n_orders):
+        field = create_response_field(name=f"Response_{model.__name__}", type_=model, mode="serialization")
+        check_renders(adapter, data)
+        repeat = 5 if name.startswith("initial-data") else 2000
+        slow = per_call_ms(lambda: loop.run_until_complete(fastapi_render(field, data)), repeat)
+        fast = per_call_ms(lambda: adapter.dump_json(data), repeat)
+        print(f"   {name:<26} response_model={slow:9.3f} ms  adapter={fast:9.3f} ms  ({slow / fast:5.1f}x)")
+    loop.close()
+    print("-" * 80)
+
+
+if __name__ == "__main__":
+    main()
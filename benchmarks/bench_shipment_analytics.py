@@ -0,0 +1,100 @@
+"""
+bench_shipment_analytics.py
+===========================
+Benchmark: GET /api/analytics/shipments aggregations over a multi-year
+synthetic `shipments` table (app/services/analytics_service.py).
+Compares pulling every row and aggregating in Python (what clients do today),
+the live SQL aggregation (jsonb_to_recordset over a shipped_at range) and the
+daily rollup, checks that live and rollup agree, and times full and
+incremental rollup refreshes.
+Run from project root: BENCH_DATABASE_URL=postgresql://... python benchmarks/bench_shipment_analytics.py [years] [shipments_per_day]
+"""
+
+import asyncio
+import sys
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks.pg_scratch import scratch_schema, timed
+from app.services.analytics_service import AnalyticsService
+
+GROUPINGS = [["day"], ["week", "sku"], ["month", "carrier"], ["carrier"], ["month", "status"]]
+
+
+async def seed(conn, years, per_day):
+    await conn.execute(f"""
+        INSERT INTO orders (order_number, source, status)
+        SELECT 'PO' || g || '|SKU-' || (g % 50), 'DEALER',
+               (CASE WHEN g % 4 = 0 THEN 'CONFIRMED' ELSE 'SHIPPED' END)::order_status_enum
+        FROM generate_series(1, {years * 365 * per_day // 3}) g
+    """)
+    await conn.execute(f"""
+        WITH o AS (SELECT array_agg(id) AS ids, COUNT(*) AS n FROM orders)
+        INSERT INTO shipments (order_id, tracking_number, carrier, shipped_at, items)
+        SELECT o.ids[1 + (g / 3) % o.n], 'BOL' || g,
+               (ARRAY['UPS', 'FedEx', 'XPO', 'Estes', NULL])[1 + g % 5],
+               now() - (g::float / {per_day}) * interval '1 day',
+               jsonb_build_array(jsonb_build_object('qty', 1 + g % 20))
+        FROM generate_series(1, {years * 365 * per_day}) g, o
+    """)
+    await conn.execute("ANALYZE")
+
+
+async def python_aggregation(conn, start, end):
+    """Baseline: every row to the client, grouped by (week, sku) in Python."""
+    rows = await conn.fetch("""
+        SELECT s.shipped_at, o.order_number, s.items FROM shipments s JOIN orders o ON o.id = s.order_id
+        WHERE s.shipped_at >= $1 AND s.shipped_at < $2
+    """, start, end)
+    groups = defaultdict(int)
+    for row in rows:
+        day = row["shipped_at"].date()
+        groups[(day - timedelta(days=day.weekday()), row["order_number"].split("|")[1])] += 1
+    return groups
+
+
+async def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    per_day = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    today = date.today()
+    date_from = today - timedelta(days=365 * years)
+
+    async with scratch_schema() as (conn, Session):
+        print(f"\n📊 Shipment analytics ({years} years × {per_day}/day = {years * 365 * per_day:,} shipments)")
+        print("-" * 80)
+        await seed(conn, years, per_day)
+
+        async with Session() as db:
+            await timed("rollup full refresh", lambda: AnalyticsService.refresh_shipment_rollup(db), repeat=1)
+
+            start = datetime.combine(today - timedelta(days=365), time.min, tzinfo=timezone.utc)
+            end = datetime.combine(today + timedelta(days=1), time.min, tzinfo=timezone.utc)
+            await timed("1 year week x sku, Python aggregation", lambda: python_aggregation(conn, start, end), repeat=3)
+
+            for dims in GROUPINGS:
+                label = ",".join(dims)
+                live = await timed(f"{years}y {label} (live SQL)", lambda: AnalyticsService.get_shipment_analytics(
+                    db, dims, date_from, today, live=True, limit=50000))
+                rollup = await timed(f"{years}y {label} (rollup)", lambda: AnalyticsService.get_shipment_analytics(
+                    db, dims, date_from, today, live=False, limit=50000))
+                assert live["success"] and rollup["success"], (live, rollup)
+                assert live["rows"] == rollup["rows"] and live["total"] == rollup["total"], f"mismatch for {label}"
+
+            # A save touching one order: dirty days -> incremental refresh
+            await conn.execute("""
+                WITH s AS (SELECT order_id FROM shipments ORDER BY shipped_at DESC LIMIT 1)
+                UPDATE orders SET status = 'COMPLETED' WHERE id = (SELECT order_id FROM s)
+            """)
+            result = await timed("rollup incremental refresh (1 order)",
+                                 lambda: AnalyticsService.refresh_shipment_rollup(db), repeat=1)
+            print(f"   {result['message']}: {result['updated']} day(s) recomputed")
+        print("-" * 80)
+        print("✅ live and rollup results match")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,178 @@
+"""
+bench_shipment_items.py
+=======================
+Benchmark: shipment quantities read out of shipments.items JSONB (before)
+vs the normalized shipment_items table (db/migrations/012_shipment_items.sql).
+
+Seeds shipments the old way (JSONB only, both item shapes), times the
+012 backfill, then compares per-order reads, a monthly SUM, a per-SKU
+range and the live analytics query on both layouts and checks they agree.
+Run from project root: BENCH_DATABASE_URL=postgresql://... python benchmarks/bench_shipment_items.py [shipments]
+"""
+
+import asyncio
+import json
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from sqlalchemy import text
+
+from benchmarks.pg_scratch import MIGRATIONS_DIR, migration_files, scratch_schema, timed
+from app.services.analytics_service import LIVE_BASE_SQL, _aggregate_sql
+
+ITEMS_MIGRATION = "012_shipment_items.sql"
+ORDERS = 20000
+SKUS = 200
+
+# --- Before: quantities from shipments.items ---
+
+JSONB_QTY = """
+    (SELECT COALESCE(SUM((x->>'qty')::int), 0)
+     FROM jsonb_array_elements(CASE jsonb_typeof(s.items) WHEN 'array' THEN s.items
+                                    ELSE jsonb_build_array(s.items) END) x)
+"""
+
+JSONB_ORDER_SQL = "SELECT tracking_number, shipped_at, items FROM shipments WHERE order_id = $1"
+
+JSONB_MONTH_SQL = f"SELECT SUM({JSONB_QTY}) FROM shipments s WHERE s.shipped_at >= $1 AND s.shipped_at < $2"
+
+JSONB_SKU_SQL = f"""
+    SELECT SUM({JSONB_QTY}) FROM shipments s JOIN orders o ON o.id = s.order_id
+    WHERE split_part(o.order_number, '|', 2) = $1 AND s.shipped_at >= $2 AND s.shipped_at < $3
+"""
+
+# LIVE_BASE_SQL as of 011_shipment_rollup.sql
+JSONB_LIVE_BASE_SQL = """
+    SELECT (s.shipped_at AT TIME ZONE 'UTC')::date AS day,
+           COALESCE(NULLIF(i.sku, ''), NULLIF(split_part(o.order_number, '|', 2), ''), 'UNKNOWN') AS sku,
+           COALESCE(NULLIF(s.carrier, ''), 'UNKNOWN') AS carrier,
+           o.status::text AS status,
+           1 AS shipments,
+           COALESCE(i.qty, 0) AS units
+    FROM shipments s
+    JOIN orders o ON o.id = s.order_id
+    LEFT JOIN LATERAL (
+        SELECT x.sku, SUM(x.qty) AS qty
+        FROM jsonb_to_recordset(
+            CASE jsonb_typeof(s.items) WHEN 'array' THEN s.items ELSE jsonb_build_array(s.items) END
+        ) AS x(qty numeric, sku text)
+        GROUP BY x.sku
+    ) i ON TRUE
+    WHERE s.shipped_at >= :start AND s.shipped_at < :end
+"""
+
+# --- After: shipment_items ---
+
+ITEMS_ORDER_SQL = """
+    SELECT s.tracking_number, s.shipped_at, COALESCE(li.qty, 0) AS qty
+    FROM shipments s
+    LEFT JOIN LATERAL (
+        SELECT SUM(i.qty) AS qty FROM shipment_items i
+        WHERE i.shipment_id = s.id AND i.shipped_at = s.shipped_at
+    ) li ON TRUE
+    WHERE s.order_id = $1
+"""
+
+ITEMS_MONTH_SQL = "SELECT SUM(qty) FROM shipment_items WHERE shipped_at >= $1 AND shipped_at < $2"
+
+ITEMS_SKU_SQL = "SELECT SUM(qty) FROM shipment_items WHERE sku = $1 AND shipped_at >= $2 AND shipped_at < $3"
+
+
+async def seed(conn, n_shipments):
+    await conn.execute(f"""
+        INSERT INTO orders (order_number, source, status)
+        SELECT 'PO' || g || '|SKU-' || (g % {SKUS}), 'DEALER', 'SHIPPED'::order_status_enum
+        FROM generate_series(1, {ORDERS}) g
+    """)
+    # Two years back from today; every 7th row uses the legacy single-object shape
+    await conn.execute(f"""
+        WITH o AS (SELECT array_agg(id) AS ids FROM orders)
+        INSERT INTO shipments (order_id, tracking_number, carrier, shipped_at, items)
+        SELECT o.ids[1 + g % {ORDERS}], 'BOL' || g,
+               (ARRAY['UPS', 'FedEx', 'XPO', NULL])[1 + g % 4],
+               now() - (g::float / {n_shipments}) * interval '730 days',
+               CASE WHEN g % 7 = 0 THEN jsonb_build_object('qty', 1 + g % 20)
+                    ELSE jsonb_build_array(jsonb_build_object('qty', 1 + g % 20)) END
+        FROM generate_series(1, {n_shipments}) g, o
+    """)
+    await conn.execute("ANALYZE")
+
+
+async def order_reads(conn, sql, order_ids, jsonb):
+    total = 0
+    for order_id in order_ids:
+        for row in await conn.fetch(sql, order_id):
+            if jsonb:
+                items = row["items"]
+                items = items if isinstance(items, list) else [items]
+                total += sum(int(i.get("qty", 0)) for i in items)
+            else:
+                total += row["qty"]
+    return total
+
+
+async def live_query(Session, base_sql, start, end):
+    async with Session() as db:
+        rows = (await db.execute(text(_aggregate_sql(base_sql, ["month", "sku"], 50000)),
+                                 {"start": start, "end": end})).fetchall()
+    return sorted((r.month, r.sku, int(r.shipments), float(r.units)) for r in rows if not r.is_total)
+
+
+async def main():
+    n_shipments = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    before = [m for m in migration_files() if m != ITEMS_MIGRATION]
+
+    async with scratch_schema(before) as (conn, Session):
+        await conn.set_type_codec("jsonb", encoder=str, decoder=json.loads, schema="pg_catalog")
+        print(f"\n📦 shipments.items JSONB vs shipment_items ({n_shipments:,} shipments, {ORDERS:,} orders)")
+        print("-" * 80)
+        await seed(conn, n_shipments)
+
+        today = date.today()
+        # Previous calendar month
+        month_end = datetime(today.year, today.month, 1, tzinfo=timezone.utc)
+        month_start = (month_end - timedelta(days=1)).replace(day=1)
+        year_start = datetime.now(timezone.utc) - timedelta(days=365)
+        year_end = datetime.now(timezone.utc) + timedelta(days=1)
+        order_ids = [r["id"] for r in await conn.fetch("SELECT id FROM orders ORDER BY random() LIMIT 200")]
+
+        jsonb = {
+            "order": await timed("200 per-order reads (JSONB)",
+                                 lambda: order_reads(conn, JSONB_ORDER_SQL, order_ids, True), repeat=3),
+            "month": await timed("monthly SUM (JSONB)", lambda: conn.fetchval(JSONB_MONTH_SQL, month_start, month_end)),
+            "sku": await timed("1 SKU, 1 year (JSONB)",
+                               lambda: conn.fetchval(JSONB_SKU_SQL, "SKU-7", year_start, year_end)),
+            "live": await timed("analytics month x sku, 1 year (JSONB)",
+                                lambda: live_query(Session, JSONB_LIVE_BASE_SQL, year_start, year_end), repeat=3),
+        }
+
+        start = time.perf_counter()
+        await conn.execute((MIGRATIONS_DIR / ITEMS_MIGRATION).read_text(encoding="utf-8"))
+        lines = await conn.fetchval("SELECT COUNT(*) FROM shipment_items")
+        print(f"   {ITEMS_MIGRATION} backfill: {lines:,} lines in {time.perf_counter() - start:.2f} s")
+
+        items = {
+            "order": await timed("200 per-order reads (shipment_items)",
+                                 lambda: order_reads(conn, ITEMS_ORDER_SQL, order_ids, False), repeat=3),
+            "month": await timed("monthly SUM (shipment_items)",
+                                 lambda: conn.fetchval(ITEMS_MONTH_SQL, month_start, month_end)),
+            "sku": await timed("1 SKU, 1 year (shipment_items)",
+                               lambda: conn.fetchval(ITEMS_SKU_SQL, "SKU-7", year_start, year_end)),
+            "live": await timed("analytics month x sku, 1 year (shipment_items)",
+                                lambda: live_query(Session, LIVE_BASE_SQL, year_start, year_end), repeat=3),
+        }
+        print("-" * 80)
+        mismatched = [name for name in jsonb if jsonb[name] != items[name]]
+        if mismatched:
+            print(f"❌ results differ: {', '.join(mismatched)}")
+            sys.exit(1)
+        print("✅ JSONB and shipment_items results match")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+"""
+bench_shipment_partitions.py
+============================
+Benchmark: shipped_at range scans on a multi-year synthetic `shipments` table,
+before and after 008_partition_shipments.sql (monthly range partitions).
+Run from project root: BENCH_DATABASE_URL=postgresql://... python benchmarks/bench_shipment_partitions.py [years] [shipments_per_day]
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks.pg_scratch import MIGRATIONS_DIR, migration_files, scratch_schema, timed
+
+PARTITION_MIGRATION = "008_partition_shipments.sql"
+
+QUERIES = {
+    "one month (SUM qty)": """
+        SELECT SUM((items->>'qty')::int) FROM shipments
+        WHERE shipped_at >= date_trunc('month', now()) - interval '2 months'
+          AND shipped_at < date_trunc('month', now()) - interval '1 month'
+    """,
+    "last quarter (COUNT per day)": """
+        SELECT date_trunc('day', shipped_at) AS d, COUNT(*) FROM shipments
+        WHERE shipped_at >= now() - interval '90 days'
+        GROUP BY 1
+    """,
+    "recent order lookup (order_id)": """
+        SELECT tracking_number, shipped_at, items FROM shipments
+        WHERE order_id = (SELECT order_id FROM shipments ORDER BY shipped_at DESC LIMIT 1)
+    """,
+}
+
+
+async def seed(conn, years, per_day):
+    await conn.execute(f"""
+        INSERT INTO orders (order_number, source, status)
+        SELECT 'BENCH-' || g, 'DEALER', 'SHIPPED' FROM generate_series(1, {years * 365 * per_day // 3}) g
+    """)
+    await conn.execute(f"""
+        WITH o AS (SELECT array_agg(id) AS ids, COUNT(*) AS n FROM orders)
+        INSERT INTO shipments (order_id, tracking_number, shipped_at, items)
+        SELECT o.ids[1 + (g / 3) % o.n], 'BOL' || g,
+               now() - (g::float / {per_day}) * interval '1 day',
+               jsonb_build_object('qty', 1 + g % 20)
+        FROM generate_series(1, {years * 365 * per_day}) g, o
+    """)
+    await conn.execute("ANALYZE")
+
+
+async def run_queries(conn, label):
+    print(f"\n   [{label}]")
+    for name, sql in QUERIES.items():
+        await timed(name, lambda: conn.fetch(sql))
+
+
+async def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    per_day = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    before = [m for m in migration_files() if m < PARTITION_MIGRATION]
+
+    async with scratch_schema(before) as (conn, _):
+        print(f"\n🗂️  Shipments partitioning benchmark ({years} years × {per_day}/day = {years * 365 * per_day:,} rows)")
+        print("-" * 80)
+        await seed(conn, years, per_day)
+        await run_queries(conn, "single heap")
+
+        await conn.execute((MIGRATIONS_DIR / PARTITION_MIGRATION).read_text(encoding="utf-8"))
+        parts = await conn.fetchval("SELECT COUNT(*) FROM pg_inherits WHERE inhparent = to_regclass('shipments')")
+        await run_queries(conn, f"partitioned ({parts} partitions)")
+        print("-" * 80)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""
+bench_single_flight.py
+======================
+Benchmark: a burst of identical concurrent reads (shift start) with and without
+request coalescing (app/services/single_flight.py).
+Part 1 (no DB): a simulated query holding a pool slot for QUERY_SECONDS; shows
+executions, coalescing ratio and burst latency.
+Part 2 (BENCH_DATABASE_URL set): BolService.get_initial_bol_data on a scratch
+schema, each caller with its own session, as the routes do.
+Run from project root: [BENCH_DATABASE_URL=postgresql://...] python benchmarks/bench_single_flight.py [clients]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from app.services.single_flight import SingleFlight
+
+QUERY_SECONDS = 0.08
+POOL_SIZE = 10
+
+
+class NoCoalescing(SingleFlight):
+    """Baseline: every caller runs its own call."""
+
+    async def do(self, key, fn):
+        return await fn()
+
+
+async def burst(clients: int, coalesce: bool):
+    pool = asyncio.Semaphore(POOL_SIZE)
+    flight = SingleFlight()
+    executions = 0
+
+    async def query():
+        nonlocal executions
+        async with pool:
+            executions += 1
+            await asyncio.sleep(QUERY_SECONDS)
+            return {"success": True}
+
+    async def client():
+        if coalesce:
+            return await flight.do(("initial-data", False), query)
+        return await query()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return executions, time.perf_counter() - start, flight.snapshot()["coalescingRatio"]
+
+
+async def bench_db(clients: int):
+    from benchmarks.pg_scratch import scratch_schema
+    from app.services import bol_service
+    from app.services.bol_service import BolService
+
+    async with scratch_schema() as (conn, Session):
+        await conn.execute("""
+            INSERT INTO orders (order_number, source, status)
+            SELECT 'BENCH-' || g, 'DEALER', CASE WHEN g % 3 = 0 THEN 'SHIPPED' ELSE 'CONFIRMED' END
+            FROM generate_series(1, 20000) g
+        """)
+
+        async def one():
+            async with Session() as db:
+                return await BolService.get_initial_bol_data(db)
+
+        print(f"\n🗄️  get_initial_bol_data, {clients} concurrent callers (20k orders)")
+        print("-" * 80)
+        for label, flight in (("own query per caller", None), ("coalesced", SingleFlight())):
+            original = bol_service.bol_reads
+            bol_service.bol_reads = flight or NoCoalescing()
+            try:
+                start = time.perf_counter()
+                await asyncio.gather(*(one() for _ in range(clients)))
+                elapsed = time.perf_counter() - start
+            finally:
+                bol_service.bol_reads = original
+            ratio = flight.snapshot()["coalescingRatio"] if flight else 0.0
+            print(f"   {label:<28} {elapsed * 1000:9.1f} ms   coalescing ratio {ratio:.2f}")
+        print("-" * 80)
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    print(f"\n🔀 Single-flight: burst of {clients} identical reads, {QUERY_SECONDS * 1000:.0f} ms query, "
+          f"pool of {POOL_SIZE}")
+    print("-" * 80)
+    for label, coalesce in (("own query per caller", False), ("coalesced", True)):
+        executions, elapsed, ratio = asyncio.run(burst(clients, coalesce))
+        print(f"   {label:<28} {executions:>4} queries {elapsed * 1000:9.1f} ms   coalescing ratio {ratio:.2f}")
+    print("-" * 80)
+    if os.getenv("BENCH_DATABASE_URL"):
+        asyncio.run(bench_db(clients))
+    else:
+        print("\n   (set BENCH_DATABASE_URL to also run against BolService)")
+
+
+if __name__ == "__main__":
+    main()
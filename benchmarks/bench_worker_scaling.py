@@ -0,0 +1,170 @@
+"""
+bench_worker_scaling.py
+=======================
+Benchmark: throughput of the production entrypoint (python -m app.server) with
+1..N uvicorn workers, and the DB connections that worker count would hold.
+
+For each worker count the server is started on a local port and driven by a
+multi-process keep-alive HTTP/1.1 load generator for a fixed duration.
+  - Without BENCH_DATABASE_URL: GET /health (server + event loop overhead only).
+  - With BENCH_DATABASE_URL (a migrated database): GET /api/bol/initial-data,
+    and the peak number of backend connections from pg_stat_activity.
+The budget columns come from app/db_budget.py for DB_MAX_CONNECTIONS (default 60).
+
+Run from project root: [BENCH_DATABASE_URL=postgresql://...] python benchmarks/bench_worker_scaling.py [max_workers] [seconds]
+"""
+
+import asyncio
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from app.db_budget import connection_budget, cpu_count
+
+HOST = "127.0.0.1"
+PORT = int(os.getenv("BENCH_PORT", "8099"))
+CONNECTIONS_PER_CLIENT = 32
+MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "60"))
+
+
+def _request(path: str) -> bytes:
+    return f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\nConnection: keep-alive\r\n\r\n".encode()
+
+
+async def _connection(request: bytes, deadline: float) -> int:
+    """One keep-alive connection issuing requests back-to-back until the deadline."""
+    reader, writer = await asyncio.open_connection(HOST, PORT)
+    done = 0
+    try:
+        while time.perf_counter() < deadline:
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            if head.startswith(b"HTTP/1.1 200"):
+                done += 1
+    finally:
+        writer.close()
+    return done
+
+
+def _client(path: str, seconds: float, results):
+    async def run():
+        deadline = time.perf_counter() + seconds
+        counts = await asyncio.gather(
+            *(_connection(_request(path), deadline) for _ in range(CONNECTIONS_PER_CLIENT)),
+            return_exceptions=True
+        )
+        return sum(c for c in counts if isinstance(c, int))
+
+    results.put(asyncio.run(run()))
+
+
+def _wait_ready(timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((HOST, PORT), timeout=0.5) as sock:
+                sock.sendall(_request("/health"))
+                if sock.recv(64).startswith(b"HTTP/1.1 200"):
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+async def _peak_db_connections(stop: asyncio.Event) -> int:
+    import asyncpg
+
+    conn = await asyncpg.connect(os.environ["BENCH_DATABASE_URL"])
+    peak = 0
+    try:
+        while not stop.is_set():
+            n = await conn.fetchval(
+                "SELECT COUNT(*) FROM pg_stat_activity WHERE datname = current_database() AND pid <> pg_backend_pid()"
+            )
+            peak = max(peak, n)
+            await asyncio.sleep(0.2)
+    finally:
+        await conn.close()
+    return peak
+
+
+def run_load(path: str, seconds: float, clients: int) -> float:
+    results = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=_client, args=(path, seconds, results)) for _ in range(clients)]
+    for p in procs:
+        p.start()
+    total = sum(results.get() for _ in procs)
+    for p in procs:
+        p.join()
+    return total / seconds
+
+
+async def measure(path: str, seconds: float, clients: int, with_db: bool):
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(_peak_db_connections(stop)) if with_db else None
+    rps = await asyncio.get_running_loop().run_in_executor(None, run_load, path, seconds, clients)
+    stop.set()
+    peak = await watcher if watcher else None
+    return rps, peak
+
+
+def main():
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else cpu_count()
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    db_url = os.getenv("BENCH_DATABASE_URL")
+    path = "/api/bol/initial-data" if db_url else "/health"
+    # Leave CPUs for the load generator when the machine is small
+    clients = max(1, min(4, cpu_count() // 2))
+
+    print(f"\n📈 Worker scaling: {path}, {seconds:.0f}s per run, {clients} load client(s) x "
+          f"{CONNECTIONS_PER_CLIENT} connections, {cpu_count()} CPU(s)")
+    print(f"   DB budget for DB_MAX_CONNECTIONS={MAX_CONNECTIONS} (1 instance, 5 reserved)")
+    print("-" * 88)
+    print(f"   {'workers':>7} {'req/s':>10} {'speedup':>8} {'pool':>6} {'overflow':>9} "
+          f"{'budget total':>13} {'peak DB conns':>14}")
+
+    worker_counts = sorted({1, 2, 4, max_workers} & set(range(1, max_workers + 1)))
+    baseline = None
+    for workers in worker_counts:
+        env = {
+            **os.environ,
+            "PORT": str(PORT),
+            "HOST": HOST,
+            "WEB_CONCURRENCY": str(workers),
+            "DB_MAX_CONNECTIONS": str(MAX_CONNECTIONS),
+        }
+        if db_url:
+            env["DATABASE_URL"] = db_url
+        server = subprocess.Popen(
+            [sys.executable, "-m", "app.server"], cwd=ROOT_DIR, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            _wait_ready()
+            rps, peak = asyncio.run(measure(path, seconds, clients, bool(db_url)))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+        baseline = baseline or rps
+        budget = connection_budget(MAX_CONNECTIONS, 1, workers, reserved=5)
+        flag = "" if budget["fits"] else " ❌"
+        print(f"   {workers:>7} {rps:>10,.0f} {rps / baseline:>7.2f}x {budget['poolSize']:>6} "
+              f"{budget['maxOverflow']:>9} {budget['total']:>13}{flag} {peak if peak is not None else '-':>14}")
+    print("-" * 88)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+pg_scratch.py
+=============
+Shared helper for DB benchmarks: a throw-away schema on BENCH_DATABASE_URL
+with the project migrations applied, dropped again on exit.
+Never point BENCH_DATABASE_URL at production.
+"""
+
+import os
+import ssl
+import sys
+import time
+import uuid
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+MIGRATIONS_DIR = ROOT_DIR / "db" / "migrations"
+
+# bol_entry.sql is the idempotent base schema; numbered files after 001 are incremental
+BASE_MIGRATIONS = ["bol_entry.sql"]
+
+
+def _bench_url() -> str:
+    url = os.getenv("BENCH_DATABASE_URL", "")
+    if not url:
+        print("❌ BENCH_DATABASE_URL is not set (use a disposable local Postgres).")
+        sys.exit(1)
+    return url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def _ssl_arg():
+    if os.getenv("BENCH_DATABASE_SSL", "").lower() not in ("1", "true"):
+        return None
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+
+def migration_files():
+    numbered = sorted(p.name for p in MIGRATIONS_DIR.glob("[0-9][0-9][0-9]_*.sql") if not p.name.startswith("001_"))
+    return BASE_MIGRATIONS + numbered
+
+
+@asynccontextmanager
+async def scratch_schema(migrations=None):
+    """
+    Yield (raw asyncpg connection, AsyncSession factory), both bound to a fresh schema.
+    """
+    url = _bench_url()
+    schema = f"bench_{uuid.uuid4().hex[:8]}"
+    search_path = f"{schema}, public, extensions"
+    conn = await asyncpg.connect(url, ssl=_ssl_arg(), server_settings={"search_path": search_path})
+    engine = None
+    try:
+        await conn.execute(f"CREATE SCHEMA {schema}")
+        for name in migrations if migrations is not None else migration_files():
+            await conn.execute((MIGRATIONS_DIR / name).read_text(encoding="utf-8"))
+
+        engine = create_async_engine(
+            url.replace("postgresql://", "postgresql+asyncpg://", 1),
+            connect_args={"ssl": _ssl_arg(), "server_settings": {"search_path": search_path}},
+        )
+        yield conn, sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    finally:
+        if engine is not None:
+            await engine.dispose()
+        await conn.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        await conn.close()
+
+
+async def timed(label, coro_factory, repeat=5):
+    """Run coro_factory() `repeat` times and print the median wall time; returns the last result."""
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = await coro_factory()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    print(f"   {label:<40} median={samples[len(samples) // 2]:9.2f} ms  min={samples[0]:9.2f} ms")
+    return result
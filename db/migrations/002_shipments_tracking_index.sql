@@ -0,0 +1,3 @@
+-- Reverse lookup: BOL / tracking number -> PO|SKU
+-- 同一張 BOL 可能對應多個 PO|SKU (例如 31305239)，因此不可建立 UNIQUE 索引
+CREATE INDEX IF NOT EXISTS idx_shipments_tracking_number ON shipments(tracking_number);
@@ -0,0 +1,22 @@
+-- Change feed for GET /api/bol/stream (BOL_EVENTS_SOURCE=postgres)
+-- 訂單狀態變更時透過 NOTIFY 推送 {key, status, timestamp}
+-- save_bol_data 每次都會更新 orders.status / updated_at，因此 shipments 的變更也會經由此 trigger 送出
+CREATE OR REPLACE FUNCTION notify_order_status() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify(
+        'order_status',
+        json_build_object(
+            'key', NEW.order_number,
+            'status', NEW.status,
+            'timestamp', to_char(NEW.created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"+00:00"')
+        )::text
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_orders_notify_status ON orders;
+CREATE TRIGGER trg_orders_notify_status
+    AFTER INSERT OR UPDATE OF status, updated_at ON orders
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_order_status();
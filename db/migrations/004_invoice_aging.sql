@@ -0,0 +1,28 @@
+-- Invoice aging / balance reporting (app/services/invoice_service.py)
+
+-- 未結清發票查詢: WHERE status IN ('OPEN', 'OVERDUE') AND due_date < ...
+CREATE INDEX IF NOT EXISTS idx_invoices_status_due_date ON invoices(status, due_date);
+CREATE INDEX IF NOT EXISTS idx_invoices_estimate_id ON invoices(estimate_id);
+-- Incremental summary refresh: invoices changed since the last refresh
+CREATE INDEX IF NOT EXISTS idx_invoices_changed_at ON invoices((COALESCE(last_synced_at, created_at)));
+
+-- Per-customer aging summary (one row per customer with open balance)
+CREATE TABLE IF NOT EXISTS invoice_aging_summary (
+  customer TEXT PRIMARY KEY,
+  invoice_count INTEGER NOT NULL DEFAULT 0,
+  balance NUMERIC(14, 2) NOT NULL DEFAULT 0,
+  current_balance NUMERIC(14, 2) NOT NULL DEFAULT 0,
+  days_1_30 NUMERIC(14, 2) NOT NULL DEFAULT 0,
+  days_31_60 NUMERIC(14, 2) NOT NULL DEFAULT 0,
+  days_61_90 NUMERIC(14, 2) NOT NULL DEFAULT 0,
+  days_90_plus NUMERIC(14, 2) NOT NULL DEFAULT 0,
+  overdue_count INTEGER NOT NULL DEFAULT 0
+);
+
+-- Refresh bookkeeping (single row). Buckets shift daily, so a new as_of_date forces a full rebuild.
+CREATE TABLE IF NOT EXISTS invoice_aging_refresh (
+  id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+  refreshed_at TIMESTAMPTZ,
+  as_of_date DATE
+);
+INSERT INTO invoice_aging_refresh (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
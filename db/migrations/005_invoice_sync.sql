@@ -0,0 +1,6 @@
+-- Bulk invoice sync (app/services/invoice_sync_service.py)
+-- content_hash: 內容未變的發票在 upsert 時直接跳過，不重寫資料列
+ALTER TABLE invoices ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+-- QBO Estimate Id -> orders.external_id
+CREATE INDEX IF NOT EXISTS idx_orders_external_id ON orders(external_id);
@@ -0,0 +1,25 @@
+-- Order lifecycle history (app/services/order_status_service.py)
+-- Append-only: 每次狀態轉換寫入一筆，不允許 UPDATE / DELETE
+-- order_id 不設 FK，訂單刪除後歷史紀錄仍保留
+CREATE TABLE IF NOT EXISTS order_status_history (
+  id BIGSERIAL PRIMARY KEY,
+  order_id UUID NOT NULL,
+  from_status order_status_enum,
+  to_status order_status_enum NOT NULL,
+  source TEXT,
+  changed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_order_status_history_order ON order_status_history(order_id, changed_at);
+
+CREATE OR REPLACE FUNCTION forbid_history_mutation() RETURNS trigger AS $$
+BEGIN
+    RAISE EXCEPTION '% is append-only', TG_TABLE_NAME;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_order_status_history_append_only ON order_status_history;
+CREATE TRIGGER trg_order_status_history_append_only
+    BEFORE UPDATE OR DELETE ON order_status_history
+    FOR EACH ROW
+    EXECUTE FUNCTION forbid_history_mutation();
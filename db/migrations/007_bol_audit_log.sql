@@ -0,0 +1,22 @@
+-- BOL edit audit trail (app/services/audit_service.py)
+-- save_bol_data 會刪除並重建 shipments，此表保留每次修改前後的內容
+CREATE TABLE IF NOT EXISTS bol_audit_log (
+  id BIGSERIAL PRIMARY KEY,
+  order_id UUID,
+  po_sku_key TEXT NOT NULL,
+  action TEXT NOT NULL,
+  actor TEXT,
+  before JSONB,
+  after JSONB,
+  created_at TIMESTAMPTZ NOT NULL
+);
+
+-- GET /api/bol/{key}/history
+CREATE INDEX IF NOT EXISTS idx_bol_audit_log_key ON bol_audit_log(po_sku_key, created_at DESC);
+
+-- forbid_history_mutation() is defined in 006_order_status_history.sql
+DROP TRIGGER IF EXISTS trg_bol_audit_log_append_only ON bol_audit_log;
+CREATE TRIGGER trg_bol_audit_log_append_only
+    BEFORE UPDATE OR DELETE ON bol_audit_log
+    FOR EACH ROW
+    EXECUTE FUNCTION forbid_history_mutation();
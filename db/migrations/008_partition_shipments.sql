@@ -0,0 +1,69 @@
+-- Monthly range partitioning of shipments on shipped_at
+-- 報表依 shipped_at 掃描；BOL API 只碰近期訂單。舊月份可 detach / 封存 (scripts/maintain_shipment_partitions.py)
+-- 注意: 分割表的 PRIMARY KEY 必須包含分割鍵，因此改為 (id, shipped_at)
+
+-- Create the partition for the month containing p_month (no-op if it exists)
+CREATE OR REPLACE FUNCTION ensure_shipment_partition(p_month DATE) RETURNS TEXT AS $$
+DECLARE
+    start_ts TIMESTAMPTZ := date_trunc('month', p_month::timestamp) AT TIME ZONE 'UTC';
+    end_ts TIMESTAMPTZ := (date_trunc('month', p_month::timestamp) + INTERVAL '1 month') AT TIME ZONE 'UTC';
+    part_name TEXT := 'shipments_p' || to_char(p_month, 'YYYY_MM');
+BEGIN
+    IF to_regclass(part_name) IS NULL THEN
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF shipments FOR VALUES FROM (%L) TO (%L)',
+            part_name, start_ts, end_ts
+        );
+    END IF;
+    RETURN part_name;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    m DATE;
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('shipments')) THEN
+        RETURN; -- already partitioned
+    END IF;
+
+    ALTER TABLE shipments RENAME TO shipments_legacy;
+
+    CREATE TABLE shipments (
+      id UUID NOT NULL DEFAULT uuid_generate_v4(),
+      order_id UUID NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
+      tracking_number TEXT,
+      carrier TEXT,
+      shipped_at TIMESTAMPTZ NOT NULL,
+      items JSONB NOT NULL,
+      created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+      PRIMARY KEY (id, shipped_at)
+    ) PARTITION BY RANGE (shipped_at);
+
+    -- Safety net for rows outside the pre-created months (should stay empty)
+    CREATE TABLE shipments_default PARTITION OF shipments DEFAULT;
+
+    -- Partitions from the oldest shipment up to 3 months ahead
+    FOR m IN
+        SELECT generate_series(
+            date_trunc('month', COALESCE((SELECT MIN(shipped_at) FROM shipments_legacy), NOW()) AT TIME ZONE 'UTC'),
+            date_trunc('month', NOW() AT TIME ZONE 'UTC') + INTERVAL '3 months',
+            INTERVAL '1 month'
+        )::date
+    LOOP
+        PERFORM ensure_shipment_partition(m);
+    END LOOP;
+
+    INSERT INTO shipments (id, order_id, tracking_number, carrier, shipped_at, items, created_at)
+    SELECT id, order_id, tracking_number, carrier, shipped_at, items, created_at
+    FROM shipments_legacy;
+
+    DROP TABLE shipments_legacy;
+END $$;
+
+-- Indexes on the parent cascade to every partition (existing and future)
+CREATE INDEX IF NOT EXISTS idx_shipments_order_id ON shipments(order_id);
+CREATE INDEX IF NOT EXISTS idx_shipments_tracking_number ON shipments(tracking_number);
+CREATE INDEX IF NOT EXISTS idx_shipments_shipped_at ON shipments(shipped_at);
+
+ANALYZE shipments;
@@ -0,0 +1,20 @@
+-- Background jobs (app/services/job_service.py)
+-- POST /api/jobs/import 建立的匯入工作，進度與結果存於此表，多個 instance 共用
+CREATE TABLE IF NOT EXISTS jobs (
+  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+  kind TEXT NOT NULL,
+  status TEXT NOT NULL DEFAULT 'QUEUED'
+    CHECK (status IN ('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED', 'CANCELLED')),
+  params JSONB NOT NULL DEFAULT '{}',
+  progress JSONB NOT NULL DEFAULT '{}',
+  result JSONB,
+  error TEXT,
+  cancel_requested BOOLEAN NOT NULL DEFAULT FALSE,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  started_at TIMESTAMPTZ,
+  finished_at TIMESTAMPTZ,
+  heartbeat_at TIMESTAMPTZ
+);
+
+-- Active-job counts and stale-job recovery at startup
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created_at ON jobs(status, created_at);
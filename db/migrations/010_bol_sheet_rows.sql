@@ -0,0 +1,9 @@
+-- Content hashes of imported BOL_DB sheet rows (app/services/bol_import_service.py)
+-- 每列以 (PO_SKU_Key, BOL #) 識別；重新匯入時只處理新增、內容變更或已刪除的列
+CREATE TABLE IF NOT EXISTS bol_sheet_rows (
+  po_sku_key TEXT NOT NULL,
+  bol_number TEXT NOT NULL,
+  row_hash TEXT NOT NULL,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (po_sku_key, bol_number)
+);
@@ -0,0 +1,94 @@
+-- Shipment analytics rollup (app/services/analytics_service.py, GET /api/analytics/shipments)
+-- 每日 x SKU x 承運商 x 訂單狀態 的出貨彙總；週/月彙總由日粒度加總而得
+-- 增量更新: trigger 記錄受影響的日期 (dirty days)，refresh 只重算這些日期
+
+CREATE TABLE IF NOT EXISTS shipment_daily_rollup (
+  day DATE NOT NULL,
+  sku TEXT NOT NULL,
+  carrier TEXT NOT NULL,
+  status TEXT NOT NULL,
+  shipments INTEGER NOT NULL DEFAULT 0,
+  units NUMERIC(14, 2) NOT NULL DEFAULT 0,
+  PRIMARY KEY (day, sku, carrier, status)
+);
+
+-- Days whose rollup rows must be recomputed (UTC shipped_at date)
+CREATE TABLE IF NOT EXISTS shipment_rollup_dirty (
+  day DATE PRIMARY KEY
+);
+
+-- Refresh bookkeeping (single row). NULL refreshed_at forces a full rebuild.
+CREATE TABLE IF NOT EXISTS shipment_rollup_refresh (
+  id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+  refreshed_at TIMESTAMPTZ
+);
+INSERT INTO shipment_rollup_refresh (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
+
+-- Statement-level: one INSERT per statement, not per row (imports write many rows at once).
+-- Transition tables allow a single event per trigger, hence one function per event.
+CREATE OR REPLACE FUNCTION mark_shipment_days_inserted() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO shipment_rollup_dirty (day)
+    SELECT DISTINCT (shipped_at AT TIME ZONE 'UTC')::date FROM new_rows
+    ON CONFLICT (day) DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION mark_shipment_days_deleted() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO shipment_rollup_dirty (day)
+    SELECT DISTINCT (shipped_at AT TIME ZONE 'UTC')::date FROM old_rows
+    ON CONFLICT (day) DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION mark_shipment_days_updated() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO shipment_rollup_dirty (day)
+    SELECT (shipped_at AT TIME ZONE 'UTC')::date FROM old_rows
+    UNION
+    SELECT (shipped_at AT TIME ZONE 'UTC')::date FROM new_rows
+    ON CONFLICT (day) DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_shipments_rollup_insert ON shipments;
+CREATE TRIGGER trg_shipments_rollup_insert
+    AFTER INSERT ON shipments
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION mark_shipment_days_inserted();
+
+DROP TRIGGER IF EXISTS trg_shipments_rollup_delete ON shipments;
+CREATE TRIGGER trg_shipments_rollup_delete
+    AFTER DELETE ON shipments
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION mark_shipment_days_deleted();
+
+DROP TRIGGER IF EXISTS trg_shipments_rollup_update ON shipments;
+CREATE TRIGGER trg_shipments_rollup_update
+    AFTER UPDATE ON shipments
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION mark_shipment_days_updated();
+
+-- Rollup rows are keyed by order status: a status change dirties the days of that order's shipments
+CREATE OR REPLACE FUNCTION mark_order_shipment_days() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO shipment_rollup_dirty (day)
+    SELECT DISTINCT (s.shipped_at AT TIME ZONE 'UTC')::date FROM shipments s WHERE s.order_id = NEW.id
+    ON CONFLICT (day) DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_orders_rollup_status ON orders;
+CREATE TRIGGER trg_orders_rollup_status
+    AFTER UPDATE OF status ON orders
+    FOR EACH ROW
+    WHEN (OLD.status IS DISTINCT FROM NEW.status)
+    EXECUTE FUNCTION mark_order_shipment_days();
@@ -0,0 +1,148 @@
+-- Normalized shipment line items (replaces reading quantities out of shipments.items JSONB)
+-- shipments.items 有兩種格式: {"qty": n} (migration) 與 [{"qty": n}] (save)，無法建索引或直接彙總
+-- 每個 shipment 一至多筆 line: (shipment_id, shipped_at, line_no) -> sku, qty, fee
+--
+-- shipment_items 與 shipments 使用相同的月分割 (shipped_at)，舊月份一起 detach / 封存。
+-- 不使用 FOREIGN KEY: 參照分割表的 FK 會讓 DETACH PARTITION 失敗；改以 trigger 串聯刪除。
+-- shipments.items 仍會寫入 (舊版 TS / backend_python 讀取)，由 app 同時寫入 shipment_items。
+
+CREATE TABLE IF NOT EXISTS shipment_items (
+  shipment_id UUID NOT NULL,
+  shipped_at TIMESTAMPTZ NOT NULL, -- copy of shipments.shipped_at (partition key)
+  line_no SMALLINT NOT NULL DEFAULT 1,
+  sku TEXT, -- SKU part of the PO|SKU order key
+  qty INTEGER NOT NULL DEFAULT 0,
+  fee NUMERIC(12, 2),
+  PRIMARY KEY (shipment_id, shipped_at, line_no)
+) PARTITION BY RANGE (shipped_at);
+
+CREATE TABLE IF NOT EXISTS shipment_items_default PARTITION OF shipment_items DEFAULT;
+
+-- Range aggregates (analytics, rollup refresh) and per-SKU history
+CREATE INDEX IF NOT EXISTS idx_shipment_items_shipped_at ON shipment_items(shipped_at);
+CREATE INDEX IF NOT EXISTS idx_shipment_items_sku_shipped_at ON shipment_items(sku, shipped_at);
+
+-- Monthly partitions are now created for both tables (same bounds, same month suffix)
+CREATE OR REPLACE FUNCTION ensure_shipment_partition(p_month DATE) RETURNS TEXT AS $$
+DECLARE
+    start_ts TIMESTAMPTZ := date_trunc('month', p_month::timestamp) AT TIME ZONE 'UTC';
+    end_ts TIMESTAMPTZ := (date_trunc('month', p_month::timestamp) + INTERVAL '1 month') AT TIME ZONE 'UTC';
+    part_name TEXT := 'shipments_p' || to_char(p_month, 'YYYY_MM');
+    items_name TEXT := 'shipment_items_p' || to_char(p_month, 'YYYY_MM');
+BEGIN
+    IF to_regclass(part_name) IS NULL THEN
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF shipments FOR VALUES FROM (%L) TO (%L)',
+            part_name, start_ts, end_ts
+        );
+    END IF;
+    IF to_regclass('shipment_items') IS NOT NULL AND to_regclass(items_name) IS NULL THEN
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF shipment_items FOR VALUES FROM (%L) TO (%L)',
+            items_name, start_ts, end_ts
+        );
+    END IF;
+    RETURN part_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Item partitions for every existing shipments month
+DO $$
+DECLARE
+    m DATE;
+BEGIN
+    FOR m IN
+        SELECT to_date(substring(c.relname FROM 'shipments_p(\d{4}_\d{2})$'), 'YYYY_MM')
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass('shipments')
+          AND c.relname ~ '^shipments_p\d{4}_\d{2}$'
+    LOOP
+        PERFORM ensure_shipment_partition(m);
+    END LOOP;
+END $$;
+
+-- Lines from a shipments.items value, either shape; non-numeric qty counts as 0
+CREATE OR REPLACE FUNCTION shipment_item_lines(p_items JSONB)
+RETURNS TABLE (line_no SMALLINT, qty INTEGER) AS $$
+    SELECT e.n::smallint,
+           CASE WHEN e.item->>'qty' ~ '^\s*-?\d+(\.\d+)?\s*$' THEN round((e.item->>'qty')::numeric)::int ELSE 0 END
+    FROM jsonb_array_elements(
+        CASE jsonb_typeof(p_items) WHEN 'array' THEN p_items WHEN 'object' THEN jsonb_build_array(p_items) ELSE '[]'::jsonb END
+    ) WITH ORDINALITY AS e(item, n)
+    WHERE jsonb_typeof(e.item) = 'object'
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Backfill (idempotent)
+INSERT INTO shipment_items (shipment_id, shipped_at, line_no, sku, qty)
+SELECT s.id, s.shipped_at, l.line_no, NULLIF(split_part(o.order_number, '|', 2), ''), l.qty
+FROM shipments s
+JOIN orders o ON o.id = s.order_id
+CROSS JOIN LATERAL shipment_item_lines(s.items) l
+ON CONFLICT DO NOTHING;
+
+-- Deleting shipments deletes their lines (save_bol_data, import re-sync / prune, scripts)
+CREATE OR REPLACE FUNCTION delete_shipment_items() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM shipment_items i
+    USING old_rows o
+    WHERE i.shipment_id = o.id AND i.shipped_at = o.shipped_at;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_shipments_delete_items ON shipments;
+CREATE TRIGGER trg_shipments_delete_items
+    AFTER DELETE ON shipments
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION delete_shipment_items();
+
+-- Compatibility for writers that only fill shipments.items (legacy TS service, backend_python ORM):
+-- derive the lines when the inserting statement did not write any. The app writes its lines in
+-- the same statement, so they already exist when this runs.
+CREATE OR REPLACE FUNCTION derive_shipment_items() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO shipment_items (shipment_id, shipped_at, line_no, sku, qty)
+    SELECT n.id, n.shipped_at, l.line_no, NULLIF(split_part(o.order_number, '|', 2), ''), l.qty
+    FROM new_rows n
+    JOIN orders o ON o.id = n.order_id
+    CROSS JOIN LATERAL shipment_item_lines(n.items) l
+    WHERE NOT EXISTS (
+        SELECT 1 FROM shipment_items i WHERE i.shipment_id = n.id AND i.shipped_at = n.shipped_at
+    )
+    ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_shipments_derive_items ON shipments;
+CREATE TRIGGER trg_shipments_derive_items
+    AFTER INSERT ON shipments
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION derive_shipment_items();
+
+-- Line changes also dirty the analytics rollup days (011_shipment_rollup.sql)
+DROP TRIGGER IF EXISTS trg_shipment_items_rollup_insert ON shipment_items;
+CREATE TRIGGER trg_shipment_items_rollup_insert
+    AFTER INSERT ON shipment_items
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION mark_shipment_days_inserted();
+
+DROP TRIGGER IF EXISTS trg_shipment_items_rollup_delete ON shipment_items;
+CREATE TRIGGER trg_shipment_items_rollup_delete
+    AFTER DELETE ON shipment_items
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION mark_shipment_days_deleted();
+
+DROP TRIGGER IF EXISTS trg_shipment_items_rollup_update ON shipment_items;
+CREATE TRIGGER trg_shipment_items_rollup_update
+    AFTER UPDATE ON shipment_items
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION mark_shipment_days_updated();
+
+ANALYZE shipment_items;
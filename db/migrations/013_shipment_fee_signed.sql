@@ -0,0 +1,47 @@
+-- Typed shipping fee and signed-BOL flag (Shipping Fee / Signed BOL columns of the BOL sheet)
+-- 運費: shipment_items.fee (NUMERIC, 012_shipment_items.sql)，記在每個 shipment 的第 1 筆 line
+-- 簽收: shipments.signed (BOOLEAN)
+-- 原本只存在 bol_db 的 TEXT 欄位 (如 "$1,428.00" / "TRUE")，財務需自行匯出試算表計算
+
+-- Constant default: no table rewrite
+ALTER TABLE shipments ADD COLUMN IF NOT EXISTS signed BOOLEAN NOT NULL DEFAULT FALSE;
+
+-- '$1,428.00' -> 1428.00; NULL when blank, not a number or out of NUMERIC(12, 2) range
+CREATE OR REPLACE FUNCTION parse_fee(p_value TEXT) RETURNS NUMERIC AS $$
+    SELECT CASE WHEN v ~ '^-?\d{1,10}(\.\d+)?$' THEN round(v::numeric, 2) END
+    FROM (SELECT regexp_replace(COALESCE(p_value, ''), '[$,\s]', '', 'g') AS v) x
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Backfill from the raw sheet copy when it was kept (bol_import_service keep_raw / init_bol_db.py).
+-- First row per (PO_SKU_Key, BOL #) wins, as in the importer.
+-- 沒有 bol_db 時: 以 full=True 重新匯入一次 (內容 hash 未變的列不會被增量匯入重寫)。
+DO $$
+BEGIN
+    IF to_regclass('bol_db') IS NULL THEN
+        RETURN;
+    END IF;
+
+    CREATE TEMP TABLE bol_db_fee_signed ON COMMIT DROP AS
+    SELECT DISTINCT ON (b.po_sku_key, b.bol_number)
+           b.po_sku_key, b.bol_number,
+           parse_fee(b.shipping_fee) AS fee,
+           lower(trim(COALESCE(b.signed_bol, ''))) IN ('true', 'yes', 'y', '1', 'x') AS signed
+    FROM bol_db b
+    WHERE b.po_sku_key <> '' AND b.bol_number <> ''
+    ORDER BY b.po_sku_key, b.bol_number, b.id;
+
+    UPDATE shipment_items i
+    SET fee = r.fee
+    FROM bol_db_fee_signed r
+    JOIN orders o ON o.order_number = r.po_sku_key
+    JOIN shipments s ON s.order_id = o.id AND s.tracking_number = r.bol_number
+    WHERE i.shipment_id = s.id AND i.shipped_at = s.shipped_at AND i.line_no = 1
+      AND r.fee IS NOT NULL AND i.fee IS NULL;
+
+    UPDATE shipments s
+    SET signed = TRUE
+    FROM bol_db_fee_signed r
+    JOIN orders o ON o.order_number = r.po_sku_key
+    WHERE s.order_id = o.id AND s.tracking_number = r.bol_number
+      AND r.signed AND NOT s.signed;
+END $$;
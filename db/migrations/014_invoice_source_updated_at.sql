@@ -0,0 +1,7 @@
+-- Invoice sync watermark on the accounting system's clock (app/services/invoice_sync_service.py)
+-- source_updated_at: 匯出檔中的 MetaData.LastUpdatedTime (會計系統時間)
+-- 增量同步只跳過 LastUpdatedTime <= MAX(source_updated_at) 的紀錄；
+-- last_synced_at 是本系統 NOW()，不能與會計系統時間比較
+ALTER TABLE invoices ADD COLUMN IF NOT EXISTS source_updated_at TIMESTAMPTZ;
+
+CREATE INDEX IF NOT EXISTS idx_invoices_source_updated_at ON invoices(source_updated_at);
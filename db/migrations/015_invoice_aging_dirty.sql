@@ -0,0 +1,87 @@
+-- Incremental aging summary refresh (app/services/invoice_service.py refresh_aging_summary)
+-- 與 011_shipment_rollup.sql 相同做法: trigger 記錄受影響的客戶 (dirty customers)，refresh 只重算這些客戶
+-- 取代以 last_synced_at > refreshed_at 找變更的方式 (發票改掛其他 estimate、訂單客戶名稱變更時，
+-- 舊客戶的彙總列不會被重算；時間戳比較也會漏掉 refresh 之後才 commit 的同步交易)
+-- 客戶鍵須與 invoice_service.CUSTOMER_EXPR 一致
+
+CREATE TABLE IF NOT EXISTS invoice_aging_dirty (
+  customer TEXT PRIMARY KEY,
+  marked_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- DO UPDATE (not DO NOTHING) so a writer locks an already-dirty row until it commits:
+-- a concurrent refresh taking that row waits, then recomputes with the writer's changes visible.
+CREATE OR REPLACE FUNCTION mark_invoice_customers_inserted() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO invoice_aging_dirty (customer)
+    SELECT DISTINCT COALESCE(o.customer_info->>'name', 'UNASSIGNED')
+    FROM new_rows r LEFT JOIN orders o ON o.id = r.estimate_id
+    ON CONFLICT (customer) DO UPDATE SET marked_at = NOW();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION mark_invoice_customers_deleted() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO invoice_aging_dirty (customer)
+    SELECT DISTINCT COALESCE(o.customer_info->>'name', 'UNASSIGNED')
+    FROM old_rows r LEFT JOIN orders o ON o.id = r.estimate_id
+    ON CONFLICT (customer) DO UPDATE SET marked_at = NOW();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Old and new estimate: an invoice moved to another customer dirties both
+CREATE OR REPLACE FUNCTION mark_invoice_customers_updated() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO invoice_aging_dirty (customer)
+    SELECT COALESCE(o.customer_info->>'name', 'UNASSIGNED')
+    FROM old_rows r LEFT JOIN orders o ON o.id = r.estimate_id
+    UNION
+    SELECT COALESCE(o.customer_info->>'name', 'UNASSIGNED')
+    FROM new_rows r LEFT JOIN orders o ON o.id = r.estimate_id
+    ON CONFLICT (customer) DO UPDATE SET marked_at = NOW();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_invoices_aging_insert ON invoices;
+CREATE TRIGGER trg_invoices_aging_insert
+    AFTER INSERT ON invoices
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION mark_invoice_customers_inserted();
+
+DROP TRIGGER IF EXISTS trg_invoices_aging_delete ON invoices;
+CREATE TRIGGER trg_invoices_aging_delete
+    AFTER DELETE ON invoices
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION mark_invoice_customers_deleted();
+
+DROP TRIGGER IF EXISTS trg_invoices_aging_update ON invoices;
+CREATE TRIGGER trg_invoices_aging_update
+    AFTER UPDATE ON invoices
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION mark_invoice_customers_updated();
+
+-- A renamed customer on an order with invoices: both the old and the new name change
+CREATE OR REPLACE FUNCTION mark_order_invoice_customers() RETURNS trigger AS $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM invoices i WHERE i.estimate_id = NEW.id) THEN
+        INSERT INTO invoice_aging_dirty (customer)
+        SELECT DISTINCT c FROM (VALUES (COALESCE(OLD.customer_info->>'name', 'UNASSIGNED')),
+                                      (COALESCE(NEW.customer_info->>'name', 'UNASSIGNED'))) v(c)
+        ON CONFLICT (customer) DO UPDATE SET marked_at = NOW();
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_orders_aging_customer ON orders;
+CREATE TRIGGER trg_orders_aging_customer
+    AFTER UPDATE OF customer_info ON orders
+    FOR EACH ROW
+    WHEN (OLD.customer_info->>'name' IS DISTINCT FROM NEW.customer_info->>'name')
+    EXECUTE FUNCTION mark_order_invoice_customers();
@@ -0,0 +1,8 @@
+"""
+Python client for the HSUS Order API (BOL endpoints), for internal tools.
+Needs httpx (hsus_client/requirements.txt); the server does not depend on it.
+"""
+
+from hsus_client.client import BolClient
+
+__all__ = ["BolClient"]
@@ -0,0 +1,216 @@
+"""
+client.py
+=========
+Async client for the BOL API (app/routers/bol.py) for internal consumers
+(GAS bridge, reporting scripts).
+
+One pooled httpx.AsyncClient per BolClient, so requests reuse keep-alive
+connections instead of opening one per call. get_many / save_many run with
+bounded concurrency (at most `concurrency` requests in flight, which is also
+the pool size); get_many uses POST /api/bol/existing in chunks when the server
+has it and falls back to one GET per key otherwise.
+
+503 responses (admission control sheds load with a Retry-After header) are
+retried with jittered exponential backoff, honoring Retry-After. A 503 from
+admission control means the request was never run, so saves are retried too;
+connection failures are retried only when the request cannot have been sent.
+
+Every method returns the API's JSON, or {"success": False, "message", "status"}
+when the call failed, mirroring the service responses.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+from urllib.parse import quote
+import asyncio
+import random
+
+try:
+    import httpx
+except ImportError as e:  # pragma: no cover - optional dependency
+    raise ImportError("hsus_client needs httpx: pip install -r hsus_client/requirements.txt") from e
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TIMEOUT = 30.0
+# Keys per POST /api/bol/existing (server limit: 500)
+BATCH_SIZE = 200
+# BOL numbers per GET /api/bol/by-tracking/{a,b,...} (keeps the URL short)
+TRACKING_BATCH_SIZE = 50
+
+RETRY_STATUSES = {502, 503, 504}
+
+
+def _chunks(items: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _retry_after(response: "httpx.Response") -> Optional[float]:
+    """Retry-After in seconds (only the delta-seconds form is sent by the API)."""
+    value = response.headers.get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+class BolClient:
+    """
+    Usage:
+        async with BolClient("https://hsus-order.example.com") as client:
+            details = await client.get_many(["4573|F101600", "4574|F101601"])
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_retries: int = 4,
+        backoff_base: float = 0.25,
+        backoff_cap: float = 8.0,
+        timeout: float = DEFAULT_TIMEOUT,
+        user: Optional[str] = None,
+        transport: Optional["httpx.AsyncBaseTransport"] = None
+    ):
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._limit = asyncio.Semaphore(self.concurrency)
+        # None until the first get_many finds out whether POST /api/bol/existing exists
+        self._batch_supported: Optional[bool] = None
+        self._rng = random.Random()
+        self.stats = {"requests": 0, "retries": 0, "failed": 0}
+        self._http = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+            headers={"X-User": user} if user else None,
+            transport=transport
+        )
+
+    async def __aenter__(self) -> "BolClient":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._http.aclose()
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Full jitter: uniform(0, min(cap, base * 2^attempt)); never earlier than Retry-After."""
+        delay = self._rng.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            # Spread the clients told to come back at the same moment
+            delay = min(retry_after, self.backoff_cap * 4) + delay / 2
+        return delay
+
+    async def _request(self, method: str, path: str, **kwargs) -> dict:
+        """One API call with retries, at most `concurrency` in flight."""
+        async with self._limit:
+            for attempt in range(self.max_retries + 1):
+                self.stats["requests"] += 1
+                last = attempt == self.max_retries
+                try:
+                    response = await self._http.request(method, path, **kwargs)
+                except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                    # Never reached the server: safe to resend any request
+                    if last:
+                        self.stats["failed"] += 1
+                        return {"success": False, "message": f"{type(e).__name__}: {e}", "status": None}
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(self._backoff(attempt, None))
+                    continue
+                except httpx.HTTPError as e:
+                    self.stats["failed"] += 1
+                    return {"success": False, "message": f"{type(e).__name__}: {e}", "status": None}
+
+                if response.status_code in RETRY_STATUSES and not last:
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(self._backoff(attempt, _retry_after(response)))
+                    continue
+                return self._result(response)
+
+    def _result(self, response: "httpx.Response") -> dict:
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        if response.is_success and isinstance(body, dict):
+            return body
+        self.stats["failed"] += 1
+        message = body.get("detail") or body.get("message") if isinstance(body, dict) else None
+        return {"success": False, "message": str(message or response.reason_phrase), "status": response.status_code}
+
+    # --- Reads ---
+
+    async def initial_data(self, columnar: bool = False) -> dict:
+        return await self._request("GET", "/api/bol/initial-data", params={"format": "columnar"} if columnar else None)
+
+    async def get(self, po_sku_key: str) -> dict:
+        return await self._request("GET", f"/api/bol/{quote(po_sku_key, safe='')}")
+
+    async def get_many(self, po_sku_keys: Iterable[str]) -> Dict[str, dict]:
+        """key -> GET /api/bol/{key} result for every (distinct) key."""
+        keys = list(dict.fromkeys(po_sku_keys))
+        if not keys:
+            return {}
+        if self._batch_supported is not False:
+            chunks = list(_chunks(keys, BATCH_SIZE))
+            # The first chunk finds out whether the server has the batch route
+            first = await self._get_batch(chunks[0])
+            if first is not None:
+                rest = await asyncio.gather(*(self._get_batch(chunk) for chunk in chunks[1:]))
+                results = {}
+                for batch in [first, *rest]:
+                    results.update(batch)
+                return results
+
+        found = await asyncio.gather(*(self.get(key) for key in keys))
+        return dict(zip(keys, found))
+
+    async def _get_batch(self, keys: Sequence[str]) -> Optional[Dict[str, dict]]:
+        """POST /api/bol/existing; None when the server does not have it."""
+        result = await self._request("POST", "/api/bol/existing", json={"keys": list(keys)})
+        if result.get("status") in (404, 405):
+            self._batch_supported = False
+            return None
+        self._batch_supported = True
+        if "results" not in result:
+            return {key: result for key in keys}
+        by_key = {}
+        for item in result["results"]:
+            key = item.pop("key")
+            by_key[key] = item
+        return {key: by_key.get(key, {"success": False, "message": "Missing from batch response", "status": None})
+                for key in keys}
+
+    async def by_tracking(self, bol_numbers: Iterable[str]) -> dict:
+        """Reverse lookup of many BOL numbers, batched into comma-separated requests."""
+        bols = list(dict.fromkeys(b.strip() for b in bol_numbers if b and b.strip()))
+        if not bols:
+            return {"success": True, "results": [], "notFound": []}
+        parts = await asyncio.gather(*(
+            self._request("GET", f"/api/bol/by-tracking/{quote(','.join(chunk), safe=',')}")
+            for chunk in _chunks(bols, TRACKING_BATCH_SIZE)
+        ))
+        merged = {"success": all(p.get("success") for p in parts), "results": [], "notFound": []}
+        for part in parts:
+            merged["results"].extend(part.get("results", []))
+            merged["notFound"].extend(part.get("notFound", []))
+            if not part.get("success"):
+                merged["message"] = part.get("message")
+        return merged
+
+    # --- Writes ---
+
+    async def save(self, payload: dict) -> dict:
+        """POST /api/bol/save with a BolSaveRequest-shaped dict."""
+        return await self._request("POST", "/api/bol/save", json=payload)
+
+    async def save_many(self, payloads: Iterable[dict]) -> List[dict]:
+        """
+        Save many orders with bounded concurrency; results in payload order.
+        Each order is its own transaction on the server (no batch save endpoint).
+        """
+        return list(await asyncio.gather(*(self.save(p) for p in payloads)))
@@ -0,0 +1,90 @@
+"""
+import_bol_csv.py
+=================
+Single-pass import of the BOL_DB sheet export into `orders` + `shipments`
+(replaces running init_bol_db.py followed by migrate_to_normalized.py).
+Only rows changed since the last import are applied; rows removed from the sheet
+have their shipments deleted (unless --no-prune).
+Run from project root: python scripts/import_bol_csv.py <csv_file> [--full] [--no-prune] [--keep-raw] [--chunk-size N]
+    [--report report.json|report.html]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+ROOT_DIR = SCRIPT_DIR.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from app.database import get_sessionmaker, dispose_engine
+from app.services.bol_import_service import BolImportService, CHUNK_SIZE
+from app.services.import_validation import render_report_html
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Import the BOL_DB CSV export")
+    parser.add_argument("csv_file")
+    parser.add_argument("--full", action="store_true", help="re-apply every row, ignoring stored hashes")
+    parser.add_argument("--no-prune", action="store_true", help="keep shipments of rows missing from the file")
+    parser.add_argument("--keep-raw", action="store_true", help="also replace the raw bol_db copy")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--report", help="write the data-quality report (.json or .html)")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print(f"📦 BOL Import: {args.csv_file}")
+    print("=" * 60)
+
+    async def on_progress(metrics: dict):
+        print(f"   ... {metrics['rowsRead']} rows read", end="\r")
+
+    try:
+        async with get_sessionmaker()() as db:
+            result = await BolImportService.import_csv(
+                db, Path(args.csv_file), keep_raw=args.keep_raw,
+                full=args.full, prune=not args.no_prune, chunk_size=args.chunk_size, on_progress=on_progress
+            )
+    finally:
+        await dispose_engine()
+
+    metrics = result["metrics"]
+    print("-" * 40)
+    print(f"   📥 Rows Read:         {metrics['rowsRead']}")
+    print(f"   ⏭️  Skipped (no key):  {metrics['rowsSkipped']}")
+    print(f"   ⏭️  Unchanged:         {metrics['rowsUnchanged']}")
+    print(f"   ➕ New Rows:          {metrics['rowsInserted']}")
+    print(f"   🔄 Changed Rows:      {metrics['rowsChanged']}")
+    print(f"   🗑️  Deleted Rows:      {metrics['rowsDeleted']}")
+    print(f"   📋 Orders Created:    {metrics['ordersCreated']}")
+    print(f"   🚚 Shipments +/-:     +{metrics['shipmentsCreated']} / -{metrics['shipmentsDeleted']}")
+    if args.keep_raw:
+        print(f"   🗂️  Raw Rows Copied:   {metrics['rawRowsCopied']}")
+    if "rowsPerSec" in metrics:
+        print(f"   ⏱️  {metrics['seconds']}s ({metrics['rowsPerSec']} rows/sec)")
+    print("-" * 40)
+
+    report = result["report"]
+    print(f"   🔍 Data quality: {report['rowsWithIssues']} issues in {report['rowsChecked']} rows")
+    for rule, info in report["rules"].items():
+        if info["count"]:
+            print(f"      - {rule}: {info['count']}")
+    if args.report:
+        report_path = Path(args.report)
+        if report_path.suffix.lower() == ".html":
+            report_path.write_text(render_report_html(report), encoding="utf-8")
+        else:
+            report_path.write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
+        print(f"   📝 Report written to {report_path}")
+    print("-" * 40)
+
+    if not result["success"]:
+        print(f"❌ Import failed: {result.get('message')}")
+        sys.exit(1)
+    print("✅ Import complete.\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,64 @@
+"""
+maintain_shipment_partitions.py
+===============================
+Maintenance: Creates upcoming monthly `shipments` partitions and detaches/archives old ones.
+Run daily (e.g. Cloud Scheduler job) from project root:
+    python scripts/maintain_shipment_partitions.py [--ahead 3] [--retain-months 36] [--drop | --keep-detached] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+ROOT_DIR = SCRIPT_DIR.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from app.database import get_sessionmaker, dispose_engine
+from app.services.partition_service import PartitionService, ARCHIVE_SCHEMA
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Maintain monthly shipments partitions")
+    parser.add_argument("--ahead", type=int, default=3, help="months of future partitions to keep ready")
+    parser.add_argument("--retain-months", type=int, default=36, help="detach partitions older than this")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--drop", action="store_true", help="drop detached partitions instead of archiving")
+    group.add_argument("--keep-detached", action="store_true", help="leave detached partitions in place")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("🗂️  Shipments Partition Maintenance" + (" (dry run)" if args.dry_run else ""))
+    print("=" * 60)
+
+    try:
+        async with get_sessionmaker()() as db:
+            result = await PartitionService.maintain(
+                db,
+                months_ahead=args.ahead,
+                retain_months=args.retain_months,
+                archive=not args.keep_detached,
+                drop=args.drop,
+                dry_run=args.dry_run
+            )
+    finally:
+        await dispose_engine()
+
+    if not result["success"]:
+        print(f"❌ Maintenance failed: {result.get('message')}")
+        sys.exit(1)
+
+    print(f"   ➕ Created:  {', '.join(result['created']) or '-'}")
+    target = "dropped" if args.drop else ("kept" if args.keep_detached else f"moved to '{ARCHIVE_SCHEMA}'")
+    print(f"   📦 Detached: {', '.join(result['detached']) or '-'} ({target})")
+    if result["rollupRowsDeleted"]:
+        print(f"   🧹 Rollup rows of detached months deleted: {result['rollupRowsDeleted']}")
+    if result["defaultRows"]:
+        print(f"   ⚠️  shipments_default holds {result['defaultRows']} rows")
+    print("✅ Done.\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
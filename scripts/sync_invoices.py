@@ -0,0 +1,61 @@
+"""
+sync_invoices.py
+================
+Sync job: Upserts invoices from an accounting export (JSON/CSV) into `invoices`.
+Run from project root: python scripts/sync_invoices.py [export_file] [--full] [--batch-size N]
+Defaults to the local fixture db/fixtures/invoice_export.json.
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+ROOT_DIR = SCRIPT_DIR.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from app.database import get_sessionmaker, dispose_engine
+from app.services.invoice_sync_service import InvoiceSyncService, BATCH_SIZE
+
+DEFAULT_EXPORT = ROOT_DIR / "db" / "fixtures" / "invoice_export.json"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Sync invoices from an accounting export")
+    parser.add_argument("export_file", nargs="?", default=str(DEFAULT_EXPORT))
+    parser.add_argument("--full", action="store_true", help="ignore the source_updated_at watermark")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print(f"🧾 Invoice Sync: {args.export_file}")
+    print("=" * 60)
+
+    try:
+        async with get_sessionmaker()() as db:
+            result = await InvoiceSyncService.sync_file(db, Path(args.export_file), args.batch_size, args.full)
+    finally:
+        await dispose_engine()
+
+    metrics = result["metrics"]
+    print("-" * 40)
+    print(f"   📥 Rows Read:           {metrics['rowsRead']}")
+    print(f"   ➕ Inserted:            {metrics['inserted']}")
+    print(f"   🔄 Updated:             {metrics['updated']}")
+    print(f"   ⏭️  Skipped (unchanged): {metrics['skippedUnchanged']}")
+    print(f"   ⏭️  Skipped (watermark): {metrics['skippedNotModified']}")
+    print(f"   🔁 Duplicate ids:       {metrics['duplicates']}")
+    print(f"   ⚠️  Invalid:             {metrics['invalid']}")
+    if "rowsPerSec" in metrics:
+        print(f"   ⏱️  {metrics['seconds']}s ({metrics['rowsPerSec']} rows/sec)")
+    print("-" * 40)
+
+    if not result["success"]:
+        print(f"❌ Sync failed: {result.get('message')}")
+        sys.exit(1)
+    print("✅ Sync complete.\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())